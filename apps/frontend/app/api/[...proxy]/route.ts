@@ -53,6 +53,11 @@ export async function POST(
     headers['Authorization'] = authHeader;
   }
   
+  const ifNoneMatch = request.headers.get('if-none-match');
+  if (ifNoneMatch) {
+    headers['If-None-Match'] = ifNoneMatch;
+  }
+  
   try {
     const body = await request.json();
     const response = await fetch(url, {
@@ -61,8 +66,14 @@ export async function POST(
       body: JSON.stringify(body),
     });
     
+    const etag = response.headers.get('etag');
+    const responseHeaders: Record<string, string> = etag ? { ETag: etag } : {};
+    if (response.status === 304) {
+      return new NextResponse(null, { status: 304, headers: responseHeaders });
+    }
+    
     const data = await response.json();
-    return NextResponse.json(data, { status: response.status });
+    return NextResponse.json(data, { status: response.status, headers: responseHeaders });
   } catch (error) {
     console.error('Proxy error:', error);
     return NextResponse.json(
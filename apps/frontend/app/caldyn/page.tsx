@@ -48,6 +48,12 @@ interface CropLifecycle {
     frequency: string;
     recommendation: string;
     is_critical: boolean;
+    next_irrigation: string | null;
+    irrigation_count: number;
+    net_irrigation_mm: number;
+    projected_deficit_mm: number;
+    deficit_threshold_mm: number;
+    projection: "normals" | "forecast" | "none";
   }>;
   fertilizer_schedule: Array<{
     date: string;
@@ -57,6 +63,9 @@ interface CropLifecycle {
   }>;
   general_care_tips: string[];
   harvest_readiness_indicators: string[];
+  weather_fetched_at: string | null;
+  weather_cache_age_seconds: number | null;
+  weather_is_stale: boolean;
 }
 
 const CROPS = [
@@ -68,6 +77,39 @@ const CROPS = [
   { id: "sugarcane", name: "Sugarcane", duration: "270-365 days" }
 ];
 
+interface CachedLifecycle {
+  etag: string;
+  lifecycle: CropLifecycle;
+}
+
+function readCachedLifecycle(key: string): CachedLifecycle | null {
+  try {
+    const stored = sessionStorage.getItem(key);
+    return stored ? (JSON.parse(stored) as CachedLifecycle) : null;
+  } catch {
+    return null;
+  }
+}
+
+function writeCachedLifecycle(key: string, entry: CachedLifecycle) {
+  try {
+    sessionStorage.setItem(key, JSON.stringify(entry));
+  } catch {
+    // Storage full or unavailable; the next request simply refetches.
+  }
+}
+
+function forecastAgeMinutes(lifecycle: CropLifecycle): number | null {
+  // The cached body's age is as of rendering; derive it from the fetch time.
+  if (lifecycle.weather_fetched_at) {
+    return Math.max(0, Math.round((Date.now() - Date.parse(lifecycle.weather_fetched_at)) / 60000));
+  }
+  if (lifecycle.weather_cache_age_seconds !== null) {
+    return Math.round(lifecycle.weather_cache_age_seconds / 60);
+  }
+  return null;
+}
+
 function CalDynContent() {
   const { isAuthenticated } = useAuth();
   const [formData, setFormData] = useState({
@@ -113,26 +155,44 @@ function CalDynContent() {
     setLoading(true);
 
     try {
+      const payload = JSON.stringify({
+        crop_type: formData.cropType,
+        planting_date: formData.plantingDate,
+        latitude: formData.latitude,
+        longitude: formData.longitude,
+        location_name: formData.locationName,
+        acreage: parseFloat(formData.acreage)
+      });
+      // Browsers never revalidate POST responses, so keep the last calendar per
+      // request and let the API answer 304 while it is still current.
+      const cacheKey = `caldyn:${payload}`;
+      const cached = readCachedLifecycle(cacheKey);
+      const headers: Record<string, string> = {
+        "Content-Type": "application/json"
+      };
+      if (cached) {
+        headers["If-None-Match"] = cached.etag;
+      }
+
       const response = await fetch("/api/crop-lifecycle/generate", {
         method: "POST",
-        headers: {
-          "Content-Type": "application/json"
-        },
-        body: JSON.stringify({
-          crop_type: formData.cropType,
-          planting_date: formData.plantingDate,
-          latitude: formData.latitude,
-          longitude: formData.longitude,
-          location_name: formData.locationName,
-          acreage: parseFloat(formData.acreage)
-        })
+        headers,
+        body: payload
       });
 
+      if (response.status === 304 && cached) {
+        setLifecycle(cached.lifecycle);
+        return;
+      }
       if (!response.ok) {
         throw new Error("Failed to generate crop lifecycle calendar");
       }
 
       const data = await response.json();
+      const etag = response.headers.get("ETag");
+      if (etag) {
+        writeCachedLifecycle(cacheKey, { etag, lifecycle: data });
+      }
       setLifecycle(data);
     } catch (err: any) {
       setError(err.message || "An error occurred");
@@ -321,6 +381,12 @@ function CalDynContent() {
                   <div>
                     <dt className="text-gray-500">Weather Alerts</dt>
                     <dd className="mt-1 text-lg font-semibold text-gray-900">{lifecycle.weather_alerts.length} active</dd>
+                    {forecastAgeMinutes(lifecycle) !== null && (
+                      <dd className="mt-1 text-xs text-gray-500">
+                        Forecast {forecastAgeMinutes(lifecycle)} min old
+                        {lifecycle.weather_is_stale ? " (refreshing)" : ""}
+                      </dd>
+                    )}
                   </div>
                 </dl>
               </div>
@@ -463,7 +529,7 @@ function CalDynContent() {
                   {lifecycle.irrigation_schedule.map((item, idx) => {
                     const hasWeatherAlert = item.recommendation !== item.frequency;
                     const skipIrrigation = item.recommendation.includes('Skip');
-                    const delayIrrigation = item.recommendation.includes('Delay');
+                    const planIrrigation = item.irrigation_count > 0;
                     
                     return (
                       <div
@@ -471,7 +537,7 @@ function CalDynContent() {
                         className={`rounded-lg border p-3 ${
                           skipIrrigation 
                             ? "border-blue-300 bg-blue-50" 
-                            : delayIrrigation
+                            : planIrrigation
                             ? "border-yellow-300 bg-yellow-50"
                             : item.is_critical 
                             ? "border-red-300 bg-red-50" 
@@ -493,6 +559,11 @@ function CalDynContent() {
                           <p className="text-sm text-gray-700">
                             <span className="font-medium">Schedule:</span> {item.frequency}
                           </p>
+                          {item.projection !== "normals" && (
+                            <p className="text-xs text-gray-500">
+                              No seasonal rainfall normals for this location; the soil-water projection covers the forecast window only.
+                            </p>
+                          )}
                           {hasWeatherAlert && (
                             <div className={`rounded-md p-2 text-sm ${
                               skipIrrigation 
@@ -500,9 +571,12 @@ function CalDynContent() {
                                 : "bg-yellow-100 text-yellow-900"
                             }`}>
                               <p className="font-semibold">
-                                {skipIrrigation ? '🌧️ Weather Alert' : '⚠️ Weather Update'}
+                                {skipIrrigation ? '🌧️ Weather Alert' : planIrrigation ? '💧 Irrigation Planned' : '⚠️ Weather Update'}
                               </p>
                               <p className="mt-1">{item.recommendation}</p>
+                              <p className="mt-1 text-xs">
+                                Peak soil-water deficit {item.projected_deficit_mm} mm of {item.deficit_threshold_mm} mm allowed
+                              </p>
                             </div>
                           )}
                         </div>
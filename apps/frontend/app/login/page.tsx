@@ -52,7 +52,7 @@ export default function LoginPage() {
       }
 
       // Store token and update auth context
-      await login(data.access_token);
+      await login(data.access_token, data.refresh_token);
       
       // Redirect to intended page or predict yield
       const redirectPath = localStorage.getItem("redirectAfterLogin") || "/predict-yield";
@@ -14,55 +14,111 @@ interface AuthContextType {
   user: User | null;
   isAuthenticated: boolean;
   isLoading: boolean;
-  login: (token: string) => Promise<void>;
+  login: (token: string, refreshToken?: string) => Promise<void>;
   logout: () => void;
   checkAuth: () => Promise<void>;
 }
 
 const AuthContext = createContext<AuthContextType | undefined>(undefined);
 
+let pendingRefresh: Promise<boolean> | null = null;
+
+// Swap the stored refresh token for a new access/refresh pair; false when it
+// is missing, expired or revoked. Concurrent callers share one request, since
+// presenting the same token twice would look like reuse to the server.
+function refreshTokens(): Promise<boolean> {
+  if (!pendingRefresh) {
+    pendingRefresh = requestRefresh().finally(() => {
+      pendingRefresh = null;
+    });
+  }
+  return pendingRefresh;
+}
+
+async function requestRefresh(): Promise<boolean> {
+  const refreshToken = localStorage.getItem("refreshToken");
+  if (!refreshToken) {
+    return false;
+  }
+
+  const response = await fetch("/api/auth/refresh", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ refresh_token: refreshToken }),
+  });
+  if (!response.ok) {
+    localStorage.removeItem("refreshToken");
+    return false;
+  }
+
+  const data = await response.json();
+  localStorage.setItem("token", data.access_token);
+  localStorage.setItem("refreshToken", data.refresh_token);
+  return true;
+}
+
+function clearTokens() {
+  localStorage.removeItem("token");
+  localStorage.removeItem("refreshToken");
+}
+
 export function AuthProvider({ children }: { children: ReactNode }) {
   const [user, setUser] = useState<User | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   const router = useRouter();
 
   const checkAuth = async () => {
-    const token = localStorage.getItem("token");
-    if (!token) {
-      setUser(null);
-      setIsLoading(false);
-      return;
-    }
-
     try {
-      const response = await fetch("/api/auth/me", {
-        headers: {
-          Authorization: `Bearer ${token}`,
-        },
-      });
+      if (!localStorage.getItem("token") && !(await refreshTokens())) {
+        setUser(null);
+        return;
+      }
+
+      const fetchProfile = () =>
+        fetch("/api/auth/me", {
+          headers: {
+            Authorization: `Bearer ${localStorage.getItem("token")}`,
+          },
+        });
+
+      let response = await fetchProfile();
+      if (response.status === 401 && (await refreshTokens())) {
+        response = await fetchProfile();
+      }
 
       if (response.ok) {
         const data = await response.json();
         setUser(data);
       } else {
-        localStorage.removeItem("token");
+        clearTokens();
         setUser(null);
       }
     } catch (error) {
-      localStorage.removeItem("token");
+      clearTokens();
       setUser(null);
     } finally {
       setIsLoading(false);
     }
   };
 
-  const login = async (token: string) => {
+  const login = async (token: string, refreshToken?: string) => {
     localStorage.setItem("token", token);
+    if (refreshToken) {
+      localStorage.setItem("refreshToken", refreshToken);
+    }
     await checkAuth();
   };
 
   const logout = () => {
-    localStorage.removeItem("token");
+    const refreshToken = localStorage.getItem("refreshToken");
+    if (refreshToken) {
+      fetch("/api/auth/logout", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      }).catch(() => undefined);
+    }
+    clearTokens();
     setUser(null);
     router.push("/");
   };
@@ -0,0 +1,148 @@
+"""Measure /api/yield/predict latency while logins hit the same worker.
+
+Predictions are sent at a fixed concurrency for a fixed time in three
+phases: with no other traffic, alongside logins through /api/auth/login
+(async session), and alongside logins through a copy of the previous
+handler that queries with a synchronous Session on the event loop. Everything
+runs in-process on one event loop, as a single uvicorn worker would. The
+benchmark user's password is hashed with a low bcrypt cost so the phases
+compare database access rather than hashing. Run from the repository root
+against a scratch database (its tables are created if missing):
+
+    DATABASE_URL=sqlite:///./data/cache/auth-benchmark.db python -m benchmarks.auth_concurrency
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import date
+
+import bcrypt
+import httpx
+import numpy as np
+from fastapi import Depends, HTTPException
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from services.api.app.db import Base, engine
+from services.api.app.db.database import SessionLocal
+from services.api.app.db.models import User
+from services.api.app.main import app
+from services.api.app.models.auth import UserLogin
+
+EMAIL = "benchmark@smartyield.local"
+PASSWORD = "benchmark-password"
+PREDICTION = {
+    "latitude": 18.52,
+    "longitude": 73.86,
+    "location_name": "Pune",
+    "crop_type": "wheat",
+    "soil_type": "loamy",
+    "irrigation_type": "drip",
+    "acreage": 2.5,
+    "rainfall": 650,
+    "fertilizer_usage": 120,
+    "sowing_date": "2025-11-01",
+}
+
+
+def get_sync_db():
+  db = SessionLocal()
+  try:
+    yield db
+  finally:
+    db.close()
+
+
+@app.post("/benchmark/sync-login", include_in_schema=False)
+async def sync_login(user_credentials: UserLogin, db: Session = Depends(get_sync_db)):
+  user = db.query(User).filter(
+      (User.email == user_credentials.email_or_phone) |
+      (User.phone == user_credentials.email_or_phone)
+  ).first()
+  if not user or not bcrypt.checkpw(PASSWORD.encode(), user.hashed_password.encode()):
+    raise HTTPException(status_code=401)
+  return {"ok": True}
+
+
+def create_user(rounds: int) -> None:
+  Base.metadata.create_all(engine)
+  with SessionLocal() as db:
+    db.execute(delete(User).where(User.email == EMAIL))
+    db.add(User(
+        email=EMAIL,
+        hashed_password=bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds)).decode(),
+        name="Benchmark",
+        country="India",
+        state="Maharashtra",
+        district="Pune",
+        gender="other",
+        date_of_birth=date(1990, 1, 1),
+    ))
+    db.commit()
+
+
+async def phase(
+    client: httpx.AsyncClient, login_path: str | None, args: argparse.Namespace
+) -> tuple[np.ndarray, int]:
+  deadline = time.perf_counter() + args.seconds
+  latencies: list[float] = []
+  logins = 0
+
+  async def predict() -> None:
+    while time.perf_counter() < deadline:
+      began = time.perf_counter()
+      response = await client.post("/api/yield/predict", json=PREDICTION)
+      response.raise_for_status()
+      latencies.append(time.perf_counter() - began)
+
+  async def login() -> None:
+    nonlocal logins
+    while time.perf_counter() < deadline:
+      response = await client.post(
+          login_path, json={"email_or_phone": EMAIL, "password": PASSWORD}
+      )
+      response.raise_for_status()
+      logins += 1
+
+  workers = [predict() for _ in range(args.predict_concurrency)]
+  if login_path is not None:
+    workers += [login() for _ in range(args.login_concurrency)]
+  await asyncio.gather(*workers)
+  return np.array(latencies) * 1e3, logins
+
+
+async def run(args: argparse.Namespace) -> None:
+  create_user(args.bcrypt_rounds)
+  async with httpx.AsyncClient(
+      transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+  ) as client:
+    await client.post("/api/yield/predict", json=PREDICTION)
+    print(f"{'phase':<16}{'predictions':>12}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'logins/s':>10}")
+    for name, path in (
+        ("no logins", None),
+        ("async logins", "/api/auth/login"),
+        ("sync logins", "/benchmark/sync-login"),
+    ):
+      ms, logins = await phase(client, path, args)
+      print(
+          f"{name:<16}{len(ms):>12}{np.percentile(ms, 50):>9.2f}{np.percentile(ms, 99):>9.2f}"
+          f"{ms.max():>9.2f}{logins / args.seconds:>10.1f}"
+      )
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--seconds", type=float, default=10.0, help="Duration of each phase")
+  parser.add_argument("--predict-concurrency", type=int, default=8)
+  # Keep below the sync pool size (15): the sync handler waits for a pooled
+  # connection on the event loop, which also has to run the cleanup that
+  # returns connections, so beyond the pool size it deadlocks until timeout.
+  parser.add_argument("--login-concurrency", type=int, default=8)
+  parser.add_argument("--bcrypt-rounds", type=int, default=4)
+  asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+  main()
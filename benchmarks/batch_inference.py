@@ -0,0 +1,90 @@
+"""Compare `HeuristicYieldModel.predict` in a loop against `predict_batch`.
+
+Run from the repository root:
+
+    python -m benchmarks.batch_inference --rows 50000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from services.model_inference.app.heuristic_model import (
+    FarmerContext,
+    HeuristicYieldModel,
+)
+
+
+def synthetic_columns(rows: int, seed: int = 7) -> dict[str, np.ndarray]:
+  rng = np.random.default_rng(seed)
+  model = HeuristicYieldModel
+  today = np.datetime64(date.today(), "D")
+  return {
+      "latitude": rng.uniform(-60, 60, rows).round(4),
+      "longitude": rng.uniform(-170, 170, rows).round(4),
+      "crop_type": rng.choice(list(model.crop_base), rows).astype(object),
+      "soil_type": rng.choice(list(model.soil_multiplier), rows).astype(object),
+      "irrigation_type": rng.choice(
+          list(model.irrigation_multiplier), rows
+      ).astype(object),
+      "rainfall": rng.uniform(0, 320, rows).round(1),
+      "fertilizer_usage": rng.uniform(0, 360, rows).round(1),
+      "sowing_date": today - rng.integers(-30, 200, rows).astype("timedelta64[D]"),
+  }
+
+
+def contexts(columns: dict[str, np.ndarray]) -> list[FarmerContext]:
+  return [
+      FarmerContext(
+          latitude=float(columns["latitude"][i]),
+          longitude=float(columns["longitude"][i]),
+          location_name="Benchmark",
+          crop_type=columns["crop_type"][i],
+          soil_type=columns["soil_type"][i],
+          irrigation_type=columns["irrigation_type"][i],
+          acreage=1.0,
+          rainfall=float(columns["rainfall"][i]),
+          fertilizer_usage=float(columns["fertilizer_usage"][i]),
+          sowing_date=columns["sowing_date"][i].astype(object)
+      )
+      for i in range(len(columns["latitude"]))
+  ]
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--rows", type=int, default=20000)
+  args = parser.parse_args()
+
+  model = HeuristicYieldModel()
+  columns = synthetic_columns(args.rows)
+  farmers = contexts(columns)
+
+  start = time.perf_counter()
+  scalar = [model.predict(farmer) for farmer in farmers]
+  scalar_elapsed = time.perf_counter() - start
+
+  start = time.perf_counter()
+  batch = model.predict_batch(columns)
+  batch_elapsed = time.perf_counter() - start
+
+  start = time.perf_counter()
+  materialised = list(batch.estimates())
+  materialise_elapsed = time.perf_counter() - start
+
+  mismatches = sum(a != b for a, b in zip(scalar, materialised))
+  print(f"rows:                  {args.rows}")
+  print(f"scalar loop:           {args.rows / scalar_elapsed:>12,.0f} rows/sec")
+  print(f"predict_batch:         {args.rows / batch_elapsed:>12,.0f} rows/sec")
+  print(
+      "batch + estimates():   "
+      f"{args.rows / (batch_elapsed + materialise_elapsed):>12,.0f} rows/sec"
+  )
+  print(f"mismatched estimates:  {mismatches}")
+
+
+if __name__ == "__main__":
+  main()
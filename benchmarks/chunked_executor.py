@@ -0,0 +1,77 @@
+"""Time chunked cube reductions and maps in-process against the process pool.
+
+Run from the repository root:
+
+    python -m benchmarks.chunked_executor --samples 200000 --workers 0
+
+Besides the whole memmapped cube, a sliced view (``cube[offset:]``) is run
+through both paths, since workers reopen views from the file by offset.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from services.model_inference.app.executor import ChunkedExecutor, Moments, RollingMean
+
+
+def _run(executor: ChunkedExecutor, cube: np.ndarray) -> tuple[dict, np.ndarray, float]:
+  started = time.perf_counter()
+  moments = executor.reduce(cube, Moments())
+  rolling = executor.map(cube, RollingMean(window=3, axis=1))
+  return moments, rolling, time.perf_counter() - started
+
+
+def _same(left: tuple[dict, np.ndarray, float], right: tuple[dict, np.ndarray, float]) -> bool:
+  return all(
+      np.allclose(left[0][key], right[0][key], equal_nan=True) for key in left[0]
+  ) and np.array_equal(left[1], right[1], equal_nan=True)
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--samples", type=int, default=100_000)
+  parser.add_argument("--timesteps", type=int, default=24)
+  parser.add_argument("--bands", type=int, default=10)
+  parser.add_argument("--workers", type=int, default=0, help="0 uses every CPU")
+  parser.add_argument("--chunk-rows", type=int, default=4096)
+  parser.add_argument("--offset", type=int, default=1000, help="rows dropped for the sliced view")
+  args = parser.parse_args()
+
+  rng = np.random.default_rng(5)
+  with tempfile.TemporaryDirectory() as tmp:
+    path = Path(tmp) / "cube.npy"
+    cube = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.float32,
+        shape=(args.samples, args.timesteps, args.bands)
+    )
+    for start in range(0, args.samples, 10_000):
+      stop = min(start + 10_000, args.samples)
+      cube[start:stop] = rng.random((stop - start, args.timesteps, args.bands))
+    cube.flush()
+    cubes = np.load(path, mmap_mode="r")
+
+    serial = ChunkedExecutor(workers=1, chunk_rows=args.chunk_rows)
+    parallel = ChunkedExecutor(workers=args.workers, chunk_rows=args.chunk_rows)
+    mismatched = []
+    for label, view in (("whole cube", cubes), (f"cube[{args.offset}:]", cubes[args.offset:])):
+      one = _run(serial, view)
+      many = _run(parallel, view)
+      identical = _same(one, many)
+      print(
+          f"{label:>16}: in-process {one[2]:.2f}s, "
+          f"{parallel.workers} workers {many[2]:.2f}s "
+          f"({one[2] / many[2]:.2f}x), identical output: {identical}"
+      )
+      if not identical:
+        mismatched.append(label)
+    if mismatched:
+      raise SystemExit(f"process pool disagrees with in-process run on: {', '.join(mismatched)}")
+
+
+if __name__ == "__main__":
+  main()
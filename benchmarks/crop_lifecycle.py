@@ -0,0 +1,93 @@
+"""Load-test /api/crop-lifecycle/generate against the local Open-Meteo stand-in.
+
+Requests go through the full ASGI stack in-process; forecasts come from
+`services.weather_stub` instead of api.open-meteo.com, with configurable
+upstream latency, error rate and rate limit. Run from the repository root
+(importing the API package needs any reachable DATABASE_URL):
+
+    DATABASE_URL=sqlite:// python -m benchmarks.crop_lifecycle --requests 2000 --latency 0.3
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+
+import httpx
+import numpy as np
+
+from services.api.app.main import app
+from services.api.app.services.weather_provider import get_weather_provider
+from services.weather_stub import OpenMeteoStub
+
+
+async def run(args: argparse.Namespace) -> None:
+  stub = OpenMeteoStub(
+      latency=args.latency,
+      jitter=args.latency / 4,
+      error_rate=args.error_rate,
+      rate_limit=args.rate_limit
+  )
+  provider = get_weather_provider()
+  provider.transport = stub.transport()
+  provider.store = None
+
+  rng = random.Random(5)
+  cells = [(rng.uniform(8, 30), rng.uniform(70, 88)) for _ in range(args.cells)]
+  crops = ["wheat", "rice", "maize", "cotton", "soybean", "sugarcane"]
+  semaphore = asyncio.Semaphore(args.concurrency)
+  latencies: list[float] = []
+  statuses: dict[int, int] = {}
+
+  async with httpx.AsyncClient(
+      transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+  ) as client:
+
+    async def one(i: int) -> None:
+      latitude, longitude = cells[i % len(cells)]
+      body = {
+          "crop_type": crops[i % len(crops)],
+          "planting_date": (date.today() - timedelta(days=i % 120)).isoformat(),
+          "latitude": latitude,
+          "longitude": longitude,
+          "location_name": "Benchmark farm",
+          "acreage": 2.0,
+      }
+      async with semaphore:
+        began = time.perf_counter()
+        response = await client.post("/api/crop-lifecycle/generate", json=body)
+        latencies.append(time.perf_counter() - began)
+      statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    began = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - began
+
+  ms = np.array(latencies) * 1e3
+  print(f"requests:       {args.requests} at concurrency {args.concurrency} over {args.cells} cells")
+  print(f"throughput:     {args.requests / elapsed:8.1f} req/s")
+  print(f"latency ms:     p50 {np.percentile(ms, 50):.1f}  p95 {np.percentile(ms, 95):.1f}  "
+        f"p99 {np.percentile(ms, 99):.1f}  max {ms.max():.1f}")
+  print(f"status codes:   {statuses}")
+  print(f"upstream:       {stub.stats()}")
+  stats = provider.stats()
+  breaker = stats.pop("breaker")
+  print(f"provider:       {stats}")
+  print(f"breaker:        {breaker}")
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--requests", type=int, default=1000)
+  parser.add_argument("--concurrency", type=int, default=50)
+  parser.add_argument("--cells", type=int, default=100)
+  parser.add_argument("--latency", type=float, default=0.2, help="Upstream seconds per call")
+  parser.add_argument("--error-rate", type=float, default=0.0)
+  parser.add_argument("--rate-limit", type=float, default=None, help="Upstream requests/s")
+  asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,99 @@
+"""Measure per-request engine overhead: fresh YieldEngine vs the shared one.
+
+The construction comparison uses the shared model without the prediction
+cache, so it measures only what reuse saves; cache hits are timed on their
+own line, as is the nearest-sample lookup when a site index is available.
+Cached answers are checked not to depend on request order. Run from the
+repository root. Importing the API package builds the database engine, so
+any reachable DATABASE_URL works:
+
+    DATABASE_URL=sqlite:// python -m benchmarks.engine_overhead --requests 20000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+
+from services.api.app.models import FarmerInput
+from services.api.app.services.prediction_cache import PredictionCache
+from services.api.app.services.yield_engine import YieldEngine, get_yield_engine
+
+
+def sample_input() -> FarmerInput:
+  return FarmerInput(
+      latitude=18.52,
+      longitude=73.85,
+      location_name="Pune",
+      crop_type="soybean",
+      soil_type="black",
+      irrigation_type="sprinkler",
+      acreage=3.5,
+      rainfall=110.0,
+      fertilizer_usage=85.0,
+      sowing_date=date.today() - timedelta(days=45)
+  )
+
+
+def timed(label: str, requests: int, call) -> float:
+  start = time.perf_counter()
+  for _ in range(requests):
+    call()
+  per_call = (time.perf_counter() - start) / requests * 1e6
+  print(f"{label:<34}{per_call:>10.2f} us/request")
+  return per_call
+
+
+def check_request_order(model) -> None:
+  """Payloads sharing a cache key get one answer whichever arrives first."""
+  dry, wet = (
+      sample_input().model_copy(update={"rainfall": rainfall})
+      for rainfall in (49.6, 50.4)
+  )
+  answers = []
+  for order in ((dry, wet), (wet, dry)):
+    engine = YieldEngine(model=model, cache=PredictionCache())
+    answers.append({payload.rainfall: engine.predict(payload) for payload in order})
+    assert engine.predict_batch([dry, wet]) == [answers[-1][49.6], answers[-1][50.4]]
+  assert answers[0] == answers[1], "cached prediction depends on request order"
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--requests", type=int, default=20000)
+  args = parser.parse_args()
+
+  payload = sample_input()
+  cached = get_yield_engine()
+  shared = YieldEngine(model=cached.model)
+
+  construct = timed("construct YieldEngine()", args.requests, YieldEngine)
+  fresh = timed(
+      "fresh engine + predict", args.requests,
+      lambda: YieldEngine().predict(payload)
+  )
+  reused = timed(
+      "shared engine + predict", args.requests,
+      lambda: shared.predict(payload)
+  )
+  print(f"{'saved per request':<34}{fresh - reused:>10.2f} us "
+        f"({construct:.2f} us construction)")
+  if cached.cache is not None:
+    cached.predict(payload)
+    timed("shared engine + cache hit", args.requests, lambda: cached.predict(payload))
+  if cached.sites is not None:
+    located = YieldEngine(
+        model=cached.model, sites=cached.sites, sample_radius_km=cached.sample_radius_km
+    )
+    timed("shared engine + site lookup", args.requests, lambda: located.predict(payload))
+    at_site = payload.model_copy(update={
+        "latitude": float(cached.sites.latitude[0]),
+        "longitude": float(cached.sites.longitude[0]),
+    })
+    assert located.predict(at_site).nearest_sample.location_id == cached.sites.ids[0]
+  assert shared.predict(payload) == YieldEngine().predict(payload)
+  check_request_order(shared.model)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,66 @@
+"""Time cube featurization in-process against the shared-memory process pool.
+
+Run from the repository root:
+
+    python -m benchmarks.featurization --samples 200000 --workers 0
+
+The pool is also run on a sliced view (``cubes[offset:]``), which workers
+reopen from the file at the view's own offset.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from services.model_inference.app.featurize import SharedMemoryFeaturizer
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--samples", type=int, default=100_000)
+  parser.add_argument("--timesteps", type=int, default=24)
+  parser.add_argument("--bands", type=int, default=10)
+  parser.add_argument("--workers", type=int, default=0, help="0 uses every CPU")
+  parser.add_argument("--chunk-samples", type=int, default=2048)
+  parser.add_argument("--offset", type=int, default=1000, help="rows dropped for the sliced view")
+  args = parser.parse_args()
+
+  rng = np.random.default_rng(3)
+  with tempfile.TemporaryDirectory() as tmp:
+    path = Path(tmp) / "cube.npy"
+    cube = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.float32,
+        shape=(args.samples, args.timesteps, args.bands)
+    )
+    for start in range(0, args.samples, 10_000):
+      stop = min(start + 10_000, args.samples)
+      cube[start:stop] = rng.random((stop - start, args.timesteps, args.bands))
+    cube.flush()
+    cubes = np.load(path, mmap_mode="r")
+
+    serial = SharedMemoryFeaturizer(1, args.chunk_samples).run(cubes)
+    print("in-process")
+    print(serial.report())
+    parallel = SharedMemoryFeaturizer(args.workers, args.chunk_samples).run(cubes)
+    print("process pool (memmapped source)")
+    print(parallel.report())
+    print(f"speedup: {serial.wall_seconds / parallel.wall_seconds:.2f}x")
+    identical = np.array_equal(serial.features, parallel.features, equal_nan=True)
+    print(f"identical output: {identical}")
+
+    sliced = cubes[args.offset:]
+    serial_slice = SharedMemoryFeaturizer(1, args.chunk_samples).run(sliced)
+    parallel_slice = SharedMemoryFeaturizer(args.workers, args.chunk_samples).run(sliced)
+    identical_slice = np.array_equal(
+        serial_slice.features, parallel_slice.features, equal_nan=True
+    )
+    print(f"identical output on cubes[{args.offset}:]: {identical_slice}")
+    if not (identical and identical_slice):
+      raise SystemExit("process pool disagrees with the in-process featurizer")
+
+
+if __name__ == "__main__":
+  main()
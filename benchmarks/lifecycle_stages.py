@@ -0,0 +1,98 @@
+"""Compare per-request lifecycle stage construction: rebuilt vs templated.
+
+"rebuilt" is the previous approach: walk CROP_DATA and validate a new
+CropStage for every stage on every request. "templates" builds stages from
+the precompiled templates on a memo miss, and "memo" is the cached
+(crop, planting date) path most requests now take. Run from the repository root
+(importing the API package needs any reachable DATABASE_URL):
+
+    DATABASE_URL=sqlite:// python -m benchmarks.lifecycle_stages --iterations 20000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from services.api.app.models.crop_lifecycle import CropStage
+from services.api.app.services.crop_lifecycle_service import (
+    CropLifecycleService,
+    dated_stages,
+)
+
+CROPS = tuple(CropLifecycleService.CROP_DATA)
+
+
+def rebuilt(crop_type: str, planting_date: date) -> list[CropStage]:
+  stages = []
+  current_date = planting_date
+  for stage_data in CropLifecycleService.CROP_DATA[crop_type]["stages"]:
+    end_date = current_date + timedelta(days=stage_data["duration"] - 1)
+    stages.append(CropStage(
+        stage_name=stage_data["name"],
+        start_date=current_date,
+        end_date=end_date,
+        duration_days=stage_data["duration"],
+        description=stage_data["description"],
+        care_activities=stage_data["activities"],
+        irrigation_frequency=stage_data["irrigation_frequency"],
+        fertilizer_recommendations=stage_data["fertilizers"],
+        weather_considerations=stage_data["weather"],
+        risk_factors=stage_data["risks"]
+    ))
+    current_date = end_date + timedelta(days=1)
+  return stages
+
+
+def templates(crop_type: str, planting_date: date) -> list[CropStage]:
+  return list(dated_stages.__wrapped__(crop_type, planting_date))
+
+
+def memo(crop_type: str, planting_date: date) -> list[CropStage]:
+  return list(dated_stages(crop_type, planting_date))
+
+
+def measure(build, inputs) -> tuple[float, float, int]:
+  start = time.perf_counter()
+  for crop_type, planting_date in inputs:
+    build(crop_type, planting_date)
+  per_call = (time.perf_counter() - start) / len(inputs) * 1e6
+
+  sample = inputs[:1000]
+  tracemalloc.start()
+  before = tracemalloc.take_snapshot()
+  kept = [build(crop_type, planting_date) for crop_type, planting_date in sample]
+  after = tracemalloc.take_snapshot()
+  tracemalloc.stop()
+  stats = after.compare_to(before, "filename")
+  allocated = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+  blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+  del kept
+  return per_call, allocated / len(sample), blocks // len(sample)
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--iterations", type=int, default=20000)
+  parser.add_argument(
+      "--planting-dates", type=int, default=60,
+      help="Distinct planting dates in the request mix"
+  )
+  args = parser.parse_args()
+
+  today = date.today()
+  inputs = [
+      (CROPS[i % len(CROPS)], today - timedelta(days=(i * 7) % args.planting_dates))
+      for i in range(args.iterations)
+  ]
+  dated_stages.cache_clear()
+  print(f"{'path':<10}{'us/call':>10}{'bytes/call':>12}{'blocks/call':>13}")
+  for name, build in (("rebuilt", rebuilt), ("templates", templates), ("memo", memo)):
+    per_call, allocated, blocks = measure(build, inputs)
+    print(f"{name:<10}{per_call:>10.1f}{allocated:>12.0f}{blocks:>13}")
+  print(f"memo: {dated_stages.cache_info()}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,52 @@
+"""Time k-nearest and radius queries on a synthetic archive of sites.
+
+Run from the repository root:
+
+    python -m benchmarks.spatial_index --sites 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from services.model_inference.app.spatial_index import SpatialIndex, haversine_km
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--sites", type=int, default=1_000_000)
+  parser.add_argument("--queries", type=int, default=2000)
+  parser.add_argument("--cell-degrees", type=float, default=0.5)
+  args = parser.parse_args()
+
+  rng = np.random.default_rng(11)
+  latitude = np.rad2deg(np.arcsin(rng.uniform(-1, 1, args.sites)))
+  longitude = rng.uniform(-180, 180, args.sites)
+
+  start = time.perf_counter()
+  index = SpatialIndex.build(latitude, longitude, cell_degrees=args.cell_degrees)
+  print(f"build:        {time.perf_counter() - start:8.3f} s for {args.sites:,} sites")
+
+  query_lat = rng.uniform(-60, 60, args.queries)
+  query_lon = rng.uniform(-180, 180, args.queries)
+
+  for label, call in (
+      ("k=1", lambda i: index.query(query_lat[i], query_lon[i], k=1)),
+      ("k=8", lambda i: index.query(query_lat[i], query_lon[i], k=8)),
+      ("r=25km", lambda i: index.query_radius(query_lat[i], query_lon[i], 25.0)),
+  ):
+    start = time.perf_counter()
+    for i in range(args.queries):
+      call(i)
+    per_query = (time.perf_counter() - start) / args.queries * 1e3
+    print(f"{label:<14}{per_query:8.3f} ms/query")
+
+  ids, distances = index.query(query_lat[0], query_lon[0], k=8)
+  brute = np.sort(haversine_km(query_lat[0], query_lon[0], latitude, longitude))[:8]
+  print(f"matches brute force: {np.allclose(distances, brute)}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,78 @@
+"""Time the soil water balance for a cooperative: one field at a time vs one pass.
+
+Fields get a mix of crops, planting dates and synthetic forecasts from a
+handful of grid cells. "per field" runs a separate simulation for every
+field, as single /generate requests do; "batched" simulates all of them in
+one call, as the batch endpoint does per grid cell. Run from the repository
+root (importing the API package needs any reachable DATABASE_URL):
+
+    DATABASE_URL=sqlite:// python -m benchmarks.water_balance --fields 5000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from services.api.app.services.crop_lifecycle_service import (
+    CropLifecycleService,
+    crop_coefficients,
+)
+from services.api.app.services.water_balance import FieldSeason, SoilWaterBalance
+from services.weather_stub import synthetic_forecast
+
+CROPS = tuple(CropLifecycleService.CROP_DATA)
+
+
+def make_fields(count: int, cells: int) -> list[FieldSeason]:
+  today = date.today()
+  forecasts = [synthetic_forecast(18.0 + cell * 0.5, 76.0)["daily"] for cell in range(cells)]
+  fields = []
+  for i in range(count):
+    crop_type = CROPS[i % len(CROPS)]
+    fields.append(FieldSeason(
+        planting_date=today - timedelta(days=(i * 11) % 120),
+        crop_coefficients=crop_coefficients(crop_type),
+        max_root_depth=CropLifecycleService.CROP_DATA[crop_type]["root_depth"],
+        daily=forecasts[i % cells]
+    ))
+  return fields
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--fields", type=int, default=5000)
+  parser.add_argument("--cells", type=int, default=20, help="Distinct forecasts in the mix")
+  parser.add_argument(
+      "--per-field-sample", type=int, default=500,
+      help="Fields simulated one at a time (extrapolated to --fields)"
+  )
+  args = parser.parse_args()
+
+  fields = make_fields(args.fields, args.cells)
+  model = SoilWaterBalance()
+
+  sample = fields[:args.per_field_sample]
+  start = time.perf_counter()
+  singles = [model.simulate([field]) for field in sample]
+  per_field = (time.perf_counter() - start) / len(sample)
+
+  start = time.perf_counter()
+  batched = model.simulate(fields)
+  elapsed = time.perf_counter() - start
+
+  for index, single in enumerate(singles):
+    days = single.irrigation.shape[1]
+    if not np.allclose(single.irrigation[0], batched.irrigation[index, :days]):
+      raise SystemExit(f"field {index}: batched schedule differs from the per-field run")
+
+  print(f"fields: {args.fields}, season days: {batched.irrigation.shape[1]}")
+  print(f"per field: {per_field * 1e3:8.3f} ms/field  ({per_field * args.fields:.2f} s for all)")
+  print(f"batched:   {elapsed / args.fields * 1e3:8.3f} ms/field  ({elapsed:.2f} s for all)")
+  print(f"irrigations projected: {int((batched.irrigation > 0).sum())}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,28 @@
+"""Index password_resets for OTP lookups and purging
+
+Revision ID: b3c8f1e6a207
+Revises: 7d2e9a4c1b58
+Create Date: 2026-10-18 11:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c8f1e6a207'
+down_revision: Union[str, None] = '7d2e9a4c1b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_password_resets_lookup', 'password_resets', ['email_or_phone', 'otp', 'is_used', 'created_at'], unique=False)
+    op.create_index(op.f('ix_password_resets_expires_at'), 'password_resets', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_password_resets_expires_at'), table_name='password_resets')
+    op.drop_index('ix_password_resets_lookup', table_name='password_resets')
@@ -1,12 +1,32 @@
-from .password import get_password_hash, verify_password
-from .jwt import create_access_token, verify_token
-from .dependencies import get_current_user, get_current_active_user
+from .password import (
+    PasswordHasher,
+    PasswordHashingBusy,
+    get_password_hash,
+    get_password_hasher,
+    verify_password,
+)
+from .jwt import create_access_token, create_refresh_token, hash_refresh_token, verify_token
+from .dependencies import get_current_user, get_current_active_user, load_authenticated_user
+from .user_cache import AuthenticatedUser, UserCache, get_user_cache
+from .purger import RowPurger, get_password_reset_purger, get_refresh_token_purger
 
 __all__ = [
+    "AuthenticatedUser",
+    "PasswordHasher",
+    "PasswordHashingBusy",
+    "RowPurger",
+    "UserCache",
     "get_password_hash",
+    "get_password_hasher",
     "verify_password",
     "create_access_token",
+    "create_refresh_token",
+    "hash_refresh_token",
     "verify_token",
     "get_current_user",
     "get_current_active_user",
+    "load_authenticated_user",
+    "get_user_cache",
+    "get_password_reset_purger",
+    "get_refresh_token_purger",
 ]
@@ -1,17 +1,34 @@
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..db.database import get_db
 from ..db.models import User
 from .jwt import verify_token
+from .user_cache import AuthenticatedUser, get_user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
+async def load_authenticated_user(db: AsyncSession, user_id: int) -> Optional[AuthenticatedUser]:
+    # The session only opens a connection once queried, so hits cost no DB work.
+    cache = get_user_cache()
+    user = cache.get(user_id)
+    if user is None:
+        version = cache.version()
+        row = await db.get(User, user_id)
+        if row is None:
+            return None
+        user = AuthenticatedUser.from_user(row)
+        cache.put(user, version)
+    return user
+
+
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> User:
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+) -> AuthenticatedUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -31,7 +48,7 @@ async def get_current_user(
     except (ValueError, TypeError):
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await load_authenticated_user(db, user_id)
     if user is None:
         raise credentials_exception
     
@@ -39,8 +56,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: AuthenticatedUser = Depends(get_current_user),
+) -> AuthenticatedUser:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
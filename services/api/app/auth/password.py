@@ -1,14 +1,128 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Deque, Dict, Optional
+
 import bcrypt
 
+from ..core import settings
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the password hashing queue is full; answered with 503."""
+
+
+def _summary(samples: Deque[float]) -> Dict[str, float]:
+    if not samples:
+        return {"mean": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    return {
+        "mean": round(sum(ordered) / len(ordered) * 1e3, 2),
+        "p95": round(ordered[int(0.95 * (len(ordered) - 1))] * 1e3, 2),
+        "max": round(ordered[-1] * 1e3, 2),
+    }
+
+
+class PasswordHasher:
+    """
+    bcrypt hashing and verification on a dedicated, bounded thread pool.
+
+    bcrypt releases the GIL while it works, so ``workers`` threads hash in
+    parallel without stalling the event loop. At most ``max_queue`` calls wait
+    for a thread; beyond that `PasswordHashingBusy` is raised straight away
+    rather than letting a login burst queue up behind seconds of CPU work.
+    ``rounds`` is the bcrypt cost of new hashes; verification always uses the
+    cost stored in the hash. Queue wait and hash time are kept separately for
+    the last ``window`` calls.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 32, rounds: int = 12, window: int = 1000):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.rounds = rounds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._queue_wait: Deque[float] = deque(maxlen=window)
+        self._hash_time: Deque[float] = deque(maxlen=window)
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run(bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt(self.rounds))
+        return hashed.decode("utf-8")
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            bcrypt.checkpw, plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+        )
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(
-        plain_password.encode('utf-8'),
-        hashed_password.encode('utf-8')
+    async def _run(self, function: Callable, *args):
+        if self.pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordHashingBusy()
+        self.pending += 1
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            return function(*args), started, time.perf_counter()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(timed)
+        # Released when the hash itself finishes or is cancelled while still
+        # queued, not when the awaiting request goes away: a disconnected
+        # client's hash keeps its thread busy until bcrypt returns.
+        future.add_done_callback(lambda _: self._release(loop))
+        result, started, finished = await asyncio.wrap_future(future)
+        self.completed += 1
+        self._queue_wait.append(started - submitted)
+        self._hash_time.append(finished - started)
+        return result
+
+    def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Called from the worker thread; the counter belongs to the loop.
+        try:
+            loop.call_soon_threadsafe(self._decrement)
+        except RuntimeError:
+            pass  # The loop has already closed
+
+    def _decrement(self) -> None:
+        self.pending -= 1
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "rounds": self.rounds,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_wait_ms": _summary(self._queue_wait),
+            "hash_ms": _summary(self._hash_time),
+        }
+
+
+@lru_cache()
+def get_password_hasher() -> PasswordHasher:
+    return PasswordHasher(
+        workers=settings.password_hash_workers,
+        max_queue=settings.password_hash_queue_size,
+        rounds=settings.bcrypt_rounds
     )
 
 
-def get_password_hash(password: str) -> str:
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await get_password_hasher().verify(plain_password, hashed_password)
+
+
+async def get_password_hash(password: str) -> str:
+    return await get_password_hasher().hash(password)
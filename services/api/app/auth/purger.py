@@ -0,0 +1,143 @@
+import asyncio
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Sequence
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core import settings
+from ..db import AsyncSessionLocal
+from ..db.models import PasswordReset, RefreshToken
+
+
+class RowPurger:
+    """
+    Background deletion of dead rows from one table, in bounded batches.
+
+    ``dead`` maps the time a round starts to the criteria a row must match to
+    be deleted. Every ``interval`` seconds rows are deleted ``batch_size`` at
+    a time, one short transaction per batch with ``pause`` seconds between
+    batches, so a large backlog never holds locks for long or stalls the
+    requests writing to the table.
+    """
+
+    def __init__(
+        self,
+        model,
+        dead: Callable[[datetime], Sequence],
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        batch_size: int = 1000,
+        interval: float = 600.0,
+        pause: float = 0.05
+    ):
+        self.model = model
+        self.dead = dead
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.interval = interval
+        self.pause = pause
+        self._task: Optional[asyncio.Task] = None
+        self.rounds = 0
+        self.batches = 0
+        self.deleted = 0
+        self.failed = 0
+
+    async def purge_batch(self, now: datetime) -> int:
+        """Delete up to ``batch_size`` rows that were dead at ``now``."""
+        batch = (
+            select(self.model.id)
+            .where(*self.dead(now))
+            .limit(self.batch_size)
+            .scalar_subquery()
+        )
+        async with self.session_factory() as db:
+            result = await db.execute(
+                delete(self.model)
+                .where(self.model.id.in_(batch))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        self.batches += 1
+        self.deleted += result.rowcount
+        return result.rowcount
+
+    async def run_once(self) -> int:
+        """Delete every row dead at the start of the round; returns the count."""
+        self.rounds += 1
+        now = datetime.utcnow()
+        deleted = 0
+        while True:
+            count = await self.purge_batch(now)
+            deleted += count
+            if count < self.batch_size:
+                return deleted
+            await asyncio.sleep(self.pause)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except SQLAlchemyError:
+                # Try again next round; the rows are still there.
+                self.failed += 1
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "table": self.model.__tablename__,
+            "running": self._task is not None and not self._task.done(),
+            "batch_size": self.batch_size,
+            "interval_seconds": self.interval,
+            "rounds": self.rounds,
+            "batches": self.batches,
+            "deleted": self.deleted,
+            "failed": self.failed,
+        }
+
+
+def dead_password_resets(now: datetime) -> Sequence:
+    # Used and superseded OTPs have expires_at set to the time of use, so the
+    # expires_at index finds every dead row.
+    return [PasswordReset.expires_at < now]
+
+
+def dead_refresh_tokens(now: datetime) -> Sequence:
+    # Rotated tokens are kept for a while so presenting one again is still
+    # recognised as reuse and ends its family.
+    retention = timedelta(seconds=settings.refresh_token_revoked_retention_seconds)
+    return [or_(RefreshToken.expires_at < now, RefreshToken.revoked_at < now - retention)]
+
+
+@lru_cache()
+def get_password_reset_purger() -> RowPurger:
+    return RowPurger(
+        PasswordReset,
+        dead_password_resets,
+        batch_size=settings.auth_purge_batch_size,
+        interval=settings.auth_purge_interval_seconds
+    )
+
+
+@lru_cache()
+def get_refresh_token_purger() -> RowPurger:
+    return RowPurger(
+        RefreshToken,
+        dead_refresh_tokens,
+        batch_size=settings.auth_purge_batch_size,
+        interval=settings.auth_purge_interval_seconds
+    )
@@ -0,0 +1,127 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+from ..core import settings
+from ..db.models import User
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Read-only snapshot of the user row behind an access token."""
+    id: int
+    email: str
+    phone: Optional[str]
+    name: str
+    country: str
+    state: str
+    district: str
+    gender: str
+    date_of_birth: date
+    is_active: bool
+    is_verified: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthenticatedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            phone=user.phone,
+            name=user.name,
+            country=user.country,
+            state=user.state,
+            district=user.district,
+            gender=user.gender,
+            date_of_birth=user.date_of_birth,
+            is_active=bool(user.is_active),
+            is_verified=bool(user.is_verified),
+        )
+
+
+class UserCache:
+    """
+    Bounded TTL cache of authenticated user snapshots keyed by user id.
+
+    Handlers that change a user row call `invalidate` after committing, which
+    drops the entry in this process at once. Other workers keep serving their
+    copy for at most ``ttl`` seconds, which bounds how long a change (or a
+    deactivation made elsewhere) can go unnoticed.
+
+    Every invalidation bumps a version counter. A caller takes `version()`
+    before reading the row and passes it to `put`, which is skipped if an
+    invalidation happened in between, so a read that raced an update cannot
+    put the old row back.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[int, Tuple[float, AuthenticatedUser]]" = OrderedDict()
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    def get(self, user_id: int) -> Optional[AuthenticatedUser]:
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            if self._clock() < entry[0]:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            del self._entries[user_id]
+            self.expired += 1
+        self.misses += 1
+        return None
+
+    def version(self) -> int:
+        return self._version
+
+    def put(self, user: AuthenticatedUser, version: int) -> None:
+        if self.maxsize <= 0:
+            return
+        if version != self._version:
+            self.stale_puts += 1
+            return
+        self._entries[user.id] = (self._clock() + self.ttl, user)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._version += 1
+        self.invalidations += 1
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._version += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "db_queries_saved": self.hits,
+            "expired": self.expired,
+            "invalidations": self.invalidations,
+            "stale_puts": self.stale_puts,
+        }
+
+
+@lru_cache()
+def get_user_cache() -> UserCache:
+    return UserCache(
+        maxsize=settings.auth_user_cache_size,
+        ttl=settings.auth_user_cache_ttl_seconds
+    )
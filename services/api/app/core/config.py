@@ -22,6 +22,51 @@ class Settings(BaseSettings):
       default=r"https://.*\.replit\.dev"
   )
   model_data_path: str = Field(default="data/processed")
+  spatial_index_cell_degrees: float = Field(default=0.5, gt=0)
+  remote_sensing_sample_radius_km: float = Field(default=50.0, gt=0)
+  prediction_batch_chunk_size: int = Field(default=256, gt=0)
+  prediction_batch_max_records: int = Field(default=10000, gt=0)
+  prediction_batch_max_bytes: int = Field(default=8 * 1024 * 1024, gt=0)
+  prediction_cache_size: int = Field(default=4096, ge=0)
+  prediction_cache_coordinate_decimals: int = Field(default=4, ge=0)
+  prediction_cache_rainfall_decimals: int = Field(default=0, ge=0)
+  prediction_cache_fertilizer_decimals: int = Field(default=0, ge=0)
+  lifecycle_stage_cache_size: int = Field(default=4096, ge=0)
+  lifecycle_response_cache_bytes: int = Field(default=16 * 1024 * 1024, ge=0)
+  lifecycle_batch_max_fields: int = Field(default=1000, gt=0)
+  lifecycle_batch_max_bytes: int = Field(default=1024 * 1024, gt=0)
+  lifecycle_batch_concurrency: int = Field(default=8, gt=0)
+  auth_user_cache_size: int = Field(default=10000, ge=0)
+  auth_user_cache_ttl_seconds: float = Field(default=30.0, gt=0)
+  auth_purge_enabled: bool = Field(default=True)
+  auth_purge_interval_seconds: float = Field(default=600.0, gt=0)
+  auth_purge_batch_size: int = Field(default=1000, gt=0)
+  refresh_token_revoked_retention_seconds: float = Field(default=7 * 86400.0, ge=0)
+  bcrypt_rounds: int = Field(default=12, ge=4, le=31)
+  password_hash_workers: int = Field(default=2, gt=0)
+  password_hash_queue_size: int = Field(default=32, ge=0)
+  soil_available_water_mm_per_m: float = Field(default=140.0, gt=0)
+  soil_depletion_fraction: float = Field(default=0.5, gt=0, lt=1)
+  irrigation_cutoff_days: int = Field(default=10, ge=0)
+  weather_base_url: str = Field(default="https://api.open-meteo.com")
+  weather_grid_degrees: float = Field(default=0.1, gt=0)
+  weather_update_interval_seconds: float = Field(default=3600.0, gt=0)
+  weather_cache_size: int = Field(default=10000, ge=0)
+  weather_timeout_seconds: float = Field(default=10.0, gt=0)
+  weather_max_connections: int = Field(default=20, gt=0)
+  weather_cache_dir: str | None = Field(default="data/cache/weather")
+  weather_max_stale_seconds: float = Field(default=6 * 3600.0, ge=0)
+  weather_store_purge_interval_seconds: float = Field(default=3600.0, gt=0)
+  weather_latency_budget_seconds: float | None = Field(default=2.0, gt=0)
+  weather_breaker_failure_threshold: int = Field(default=5, gt=0)
+  weather_breaker_reset_seconds: float = Field(default=30.0, gt=0)
+  weather_prefetch_enabled: bool = Field(default=True)
+  weather_prefetch_hot_cells: int = Field(default=5000, ge=0)
+  weather_prefetch_concurrency: int = Field(default=4, gt=0)
+  weather_prefetch_rate_per_second: float = Field(default=5.0, gt=0)
+  weather_prefetch_interval_seconds: float = Field(default=30.0, gt=0)
+  weather_prefetch_lead_seconds: float = Field(default=1200.0, ge=0)
+  weather_prefetch_max_idle_seconds: float = Field(default=2 * 86400.0, gt=0)
 
 
 @lru_cache()
@@ -1,3 +1,3 @@
-from .database import Base, engine, get_db
+from .database import AsyncSessionLocal, Base, async_engine, engine, get_db
 
-__all__ = ["Base", "engine", "get_db"]
+__all__ = ["AsyncSessionLocal", "Base", "async_engine", "engine", "get_db"]
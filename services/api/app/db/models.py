@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, Date, Enum
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Date, Enum
 from sqlalchemy.sql import func
 import enum
 
@@ -39,11 +39,31 @@ class User(Base):
 
 class PasswordReset(Base):
     __tablename__ = "password_resets"
+    __table_args__ = (
+        # OTP lookups filter on the first three columns and take the newest row.
+        Index("ix_password_resets_lookup", "email_or_phone", "otp", "is_used", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False)
     email_or_phone = Column(String, nullable=False)
     otp = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    # Set to the time of use when an OTP is used or superseded, so every dead
+    # row is found by expiry alone when purging.
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
     is_used = Column(Boolean, default=False)
+
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # HMAC-SHA256 of the token; the token itself is never stored.
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    # Every token rotated from the same login shares a family.
+    family_id = Column(String(32), index=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
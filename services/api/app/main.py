@@ -1,15 +1,50 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from .auth import (
+    PasswordHashingBusy,
+    get_password_hasher,
+    get_password_reset_purger,
+    get_refresh_token_purger,
+)
 from .core import settings
+from .db import async_engine
 from .routers import api_router
+from .services import get_forecast_prefetcher, get_weather_provider, get_yield_engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+  # Build the shared engine (its compiled coefficient tables and the sample
+  # site index) before the first request instead of on it.
+  app.state.yield_engine = get_yield_engine()
+  app.state.weather_provider = get_weather_provider()
+  prefetcher = get_forecast_prefetcher()
+  if settings.weather_prefetch_enabled:
+    prefetcher.start()
+  purgers = (get_password_reset_purger(), get_refresh_token_purger())
+  if settings.auth_purge_enabled:
+    for purger in purgers:
+      purger.start()
+  yield
+  for purger in purgers:
+    await purger.stop()
+  await prefetcher.stop()
+  await app.state.weather_provider.aclose()
+  await async_engine.dispose()
+  get_password_hasher().close()
 
 
 def create_app() -> FastAPI:
   app = FastAPI(
       title=settings.project_name,
       version="0.1.0",
-      openapi_url=f"{settings.api_prefix}/openapi.json"
+      openapi_url=f"{settings.api_prefix}/openapi.json",
+      lifespan=lifespan
   )
 
   app.add_middleware(
@@ -21,6 +56,14 @@ def create_app() -> FastAPI:
       allow_headers=["*"]
   )
 
+  @app.exception_handler(PasswordHashingBusy)
+  async def password_hashing_busy(request: Request, exc: PasswordHashingBusy) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many sign-ins in progress, please retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
   @app.get("/health", tags=["health"])
   async def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
@@ -4,6 +4,7 @@ from .prediction import (
     AdviceResponse,
     FarmerInput,
     ReferenceOptions,
+    RemoteSensingSample,
     YieldHistoryPoint,
     YieldPredictionResponse,
 )
@@ -12,6 +13,7 @@ __all__ = [
     "AdviceCard",
     "FarmerInput",
     "ReferenceOptions",
+    "RemoteSensingSample",
     "YieldHistoryPoint",
     "YieldPredictionResponse",
     "AdviceRequest",
@@ -50,3 +50,6 @@ class CropLifecycleResponse(BaseModel):
     fertilizer_schedule: List[dict]
     general_care_tips: List[str]
     harvest_readiness_indicators: List[str]
+    weather_fetched_at: Optional[datetime] = None
+    weather_cache_age_seconds: Optional[int] = None
+    weather_is_stale: bool = False
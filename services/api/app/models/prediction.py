@@ -31,6 +31,11 @@ class YieldHistoryPoint(BaseModel):
   yield_t_per_ha: float = Field(..., ge=0)
 
 
+class RemoteSensingSample(BaseModel):
+  location_id: int
+  distance_km: float = Field(..., ge=0)
+
+
 class YieldPredictionResponse(BaseModel):
   predicted_yield: float = Field(..., ge=0)
   unit: Literal["tons_per_hectare"] = "tons_per_hectare"
@@ -40,6 +45,7 @@ class YieldPredictionResponse(BaseModel):
   risk_alerts: Annotated[set[str], Field(min_length=0)] = set()
   recommended_practices: Annotated[list[str], Field(min_length=1)]
   weather_outlook: dict[str, str]
+  nearest_sample: RemoteSensingSample | None = None
 
 
 class AdviceRequest(BaseModel):
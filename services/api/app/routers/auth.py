@@ -1,23 +1,36 @@
 import random
+import secrets
 import string
 from datetime import datetime, timedelta
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..auth import (
     get_password_hash,
     verify_password,
     create_access_token,
+    create_refresh_token,
+    hash_refresh_token,
     get_current_active_user,
+    load_authenticated_user,
+    get_password_hasher,
+    get_password_reset_purger,
+    get_refresh_token_purger,
+    get_user_cache,
+    AuthenticatedUser,
 )
 from ..db.database import get_db
-from ..db.models import User, PasswordReset
+from ..auth.jwt import REFRESH_TOKEN_EXPIRE_DAYS, REFRESH_TOKEN_REUSE_GRACE_SECONDS
+from ..db.models import User, PasswordReset, RefreshToken
 from ..models.auth import (
     UserRegister,
     UserLogin,
     UserResponse,
     Token,
+    RefreshTokenRequest,
     ForgotPasswordRequest,
     VerifyOTPRequest,
     ResetPasswordRequest,
@@ -32,14 +45,59 @@ def generate_otp(length: int = 6) -> str:
     return "".join(random.choices(string.digits, k=length))
 
 
+async def issue_tokens(db: AsyncSession, user_id: int, family_id: Optional[str] = None) -> dict:
+    """Access token plus a new refresh token, continuing ``family_id`` when rotating"""
+    refresh_token = create_refresh_token()
+    db.add(RefreshToken(
+        user_id=user_id,
+        token_hash=hash_refresh_token(refresh_token),
+        family_id=family_id or secrets.token_hex(16),
+        expires_at=datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    await db.commit()
+    
+    return {
+        "access_token": create_access_token(data={"sub": str(user_id)}),
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
+
+
+async def revoke_refresh_tokens(db: AsyncSession, *criteria) -> None:
+    """Revoke every still-active refresh token matching ``criteria`` (not committed)"""
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.revoked_at.is_(None), *criteria)
+        .values(revoked_at=datetime.utcnow())
+    )
+
+
+async def recently_rotated(db: AsyncSession, token_id: int, family_id: str) -> bool:
+    """Whether a refresh token was revoked within the reuse grace period by a
+    rotation (its family still has a live token), rather than by logout or reuse"""
+    now = datetime.utcnow()
+    within_grace = await db.scalar(select(RefreshToken.id).where(
+        RefreshToken.id == token_id,
+        RefreshToken.revoked_at > now - timedelta(seconds=REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+    ))
+    if within_grace is None:
+        return False
+    live = await db.scalar(select(RefreshToken.id).where(
+        RefreshToken.family_id == family_id,
+        RefreshToken.revoked_at.is_(None),
+        RefreshToken.expires_at > now
+    ).limit(1))
+    return live is not None
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserRegister, db: Session = Depends(get_db)):
+async def register(user_data: UserRegister, db: AsyncSession = Depends(get_db)):
     """Register a new user"""
     # Check if user already exists
-    existing_user = db.query(User).filter(
+    existing_user = await db.scalar(select(User).where(
         (User.email == user_data.email) | 
         (User.phone == user_data.phone if user_data.phone else False)
-    ).first()
+    ).limit(1))
     
     if existing_user:
         if existing_user.email == user_data.email:
@@ -54,7 +112,7 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
             )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash(user_data.password)
     
     new_user = User(
         email=user_data.email,
@@ -69,22 +127,22 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     return new_user
 
 
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """Login with email/phone and password"""
     # Find user by email or phone
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         (User.email == user_credentials.email_or_phone) |
         (User.phone == user_credentials.email_or_phone)
-    ).first()
+    ).limit(1))
     
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    if not user or not await verify_password(user_credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email/phone or password",
@@ -97,42 +155,105 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
             detail="Account is inactive"
         )
     
-    # Create access token
-    access_token = create_access_token(data={"sub": str(user.id)})
-    
-    return {"access_token": access_token, "token_type": "bearer"}
+    return await issue_tokens(db, user.id)
 
 
 @router.post("/login/form", response_model=Token)
 async def login_form(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Login with form data (for OAuth2 compatibility)"""
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         (User.email == form_data.username) |
         (User.phone == form_data.username)
-    ).first()
+    ).limit(1))
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email/phone or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token = create_access_token(data={"sub": str(user.id)})
+    return await issue_tokens(db, user.id)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(request: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
+    """Exchange a refresh token for a new access token and a rotated refresh token"""
+    invalid_token = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    token = await db.scalar(select(RefreshToken).where(
+        RefreshToken.token_hash == hash_refresh_token(request.refresh_token)
+    ))
+    if not token:
+        raise invalid_token
+    
+    # Read up front: a rollback below expires the loaded row.
+    token_id, user_id, family_id = token.id, token.user_id, token.family_id
+    
+    async def continue_family() -> dict:
+        user = await load_authenticated_user(db, user_id)
+        if not user or not user.is_active:
+            await db.rollback()
+            raise invalid_token
+        return await issue_tokens(db, user.id, family_id)
+    
+    if token.revoked_at is None:
+        # Conditional update so two concurrent refreshes cannot both rotate it.
+        rotated = await db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.id == token_id,
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > datetime.utcnow()
+            )
+            .values(revoked_at=datetime.utcnow())
+        )
+        if rotated.rowcount == 1:
+            return await continue_family()
+        # Expired, or a concurrent refresh rotated it first.
+        await db.rollback()
+        if await recently_rotated(db, token_id, family_id):
+            return await continue_family()
+        raise invalid_token
+    
+    if await recently_rotated(db, token_id, family_id):
+        # Two tabs refreshing at once: the later one gets its own token in the
+        # family instead of ending the session.
+        return await continue_family()
     
-    return {"access_token": access_token, "token_type": "bearer"}
+    # A rotated token presented again means it leaked: end the whole chain.
+    await revoke_refresh_tokens(db, RefreshToken.family_id == family_id)
+    await db.commit()
+    raise invalid_token
+
+
+@router.post("/logout")
+async def logout(request: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
+    """Revoke a refresh token together with every token rotated from the same login"""
+    token = await db.scalar(select(RefreshToken).where(
+        RefreshToken.token_hash == hash_refresh_token(request.refresh_token)
+    ))
+    if token:
+        await revoke_refresh_tokens(db, RefreshToken.family_id == token.family_id)
+        await db.commit()
+    
+    return {"message": "Logged out successfully"}
 
 
 @router.post("/forgot-password")
-async def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(get_db)):
+async def forgot_password(request: ForgotPasswordRequest, db: AsyncSession = Depends(get_db)):
     """Request OTP for password reset"""
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         (User.email == request.email_or_phone) |
         (User.phone == request.email_or_phone)
-    ).first()
+    ).limit(1))
     
     if not user:
         # Don't reveal if user exists or not for security
@@ -141,8 +262,20 @@ async def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(
     # Generate OTP
     otp = generate_otp()
     
+    # Supersede earlier outstanding OTPs for this identifier so only the newest works
+    now = datetime.utcnow()
+    await db.execute(
+        update(PasswordReset)
+        .where(
+            PasswordReset.email_or_phone == request.email_or_phone,
+            PasswordReset.is_used == False,
+            PasswordReset.expires_at > now
+        )
+        .values(is_used=True, expires_at=now)
+    )
+    
     # Create password reset record
-    expires_at = datetime.utcnow() + timedelta(minutes=15)
+    expires_at = now + timedelta(minutes=15)
     
     password_reset = PasswordReset(
         user_id=user.id,
@@ -152,7 +285,7 @@ async def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(
     )
     
     db.add(password_reset)
-    db.commit()
+    await db.commit()
     
     # TODO: Production - Send OTP via email/SMS service (e.g., SendGrid, Twilio)
     # SECURITY WARNING: Returning OTP in response is for testing only!
@@ -165,14 +298,14 @@ async def forgot_password(request: ForgotPasswordRequest, db: Session = Depends(
 
 
 @router.post("/verify-otp")
-async def verify_otp(request: VerifyOTPRequest, db: Session = Depends(get_db)):
+async def verify_otp(request: VerifyOTPRequest, db: AsyncSession = Depends(get_db)):
     """Verify OTP for password reset"""
-    password_reset = db.query(PasswordReset).filter(
+    password_reset = await db.scalar(select(PasswordReset).where(
         PasswordReset.email_or_phone == request.email_or_phone,
         PasswordReset.otp == request.otp,
         PasswordReset.is_used == False,
         PasswordReset.expires_at > datetime.utcnow()
-    ).order_by(PasswordReset.created_at.desc()).first()
+    ).order_by(PasswordReset.created_at.desc()).limit(1))
     
     if not password_reset:
         raise HTTPException(
@@ -184,14 +317,14 @@ async def verify_otp(request: VerifyOTPRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/reset-password")
-async def reset_password(request: ResetPasswordRequest, db: Session = Depends(get_db)):
+async def reset_password(request: ResetPasswordRequest, db: AsyncSession = Depends(get_db)):
     """Reset password with OTP"""
-    password_reset = db.query(PasswordReset).filter(
+    password_reset = await db.scalar(select(PasswordReset).where(
         PasswordReset.email_or_phone == request.email_or_phone,
         PasswordReset.otp == request.otp,
         PasswordReset.is_used == False,
         PasswordReset.expires_at > datetime.utcnow()
-    ).order_by(PasswordReset.created_at.desc()).first()
+    ).order_by(PasswordReset.created_at.desc()).limit(1))
     
     if not password_reset:
         raise HTTPException(
@@ -200,7 +333,7 @@ async def reset_password(request: ResetPasswordRequest, db: Session = Depends(ge
         )
     
     # Get user
-    user = db.query(User).filter(User.id == password_reset.user_id).first()
+    user = await db.get(User, password_reset.user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -208,18 +341,47 @@ async def reset_password(request: ResetPasswordRequest, db: Session = Depends(ge
         )
     
     # Update password
-    user.hashed_password = get_password_hash(request.new_password)
+    user.hashed_password = await get_password_hash(request.new_password)
     
     # Mark OTP as used
     password_reset.is_used = True
+    password_reset.expires_at = datetime.utcnow()
     
-    db.commit()
+    # Sign out every session that used the old password
+    await revoke_refresh_tokens(db, RefreshToken.user_id == user.id)
+    
+    await db.commit()
+    get_user_cache().invalidate(user.id)
     
     return {"message": "Password reset successfully"}
 
 
+@router.get("/hashing/stats")
+async def password_hashing_stats():
+    """Password hashing pool: queue depth, rejections, queue wait vs hash time"""
+    return get_password_hasher().stats()
+
+
+@router.get("/password-resets/purge/stats")
+async def password_reset_purge_stats():
+    """Password reset purge job: rounds run and expired or used rows deleted"""
+    return get_password_reset_purger().stats()
+
+
+@router.get("/refresh-tokens/purge/stats")
+async def refresh_token_purge_stats():
+    """Refresh token purge job: rounds run and expired or long-revoked rows deleted"""
+    return get_refresh_token_purger().stats()
+
+
+@router.get("/user-cache/stats")
+async def user_cache_stats():
+    """Authenticated-user cache: hit rate and database lookups saved"""
+    return get_user_cache().stats()
+
+
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_profile(current_user: User = Depends(get_current_active_user)):
+async def get_current_user_profile(current_user: AuthenticatedUser = Depends(get_current_active_user)):
     """Get current user profile"""
     return current_user
 
@@ -227,37 +389,45 @@ async def get_current_user_profile(current_user: User = Depends(get_current_acti
 @router.put("/me", response_model=UserResponse)
 async def update_current_user_profile(
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """Update current user profile"""
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
     # Update fields if provided
     if user_update.name is not None:
-        current_user.name = user_update.name
+        user.name = user_update.name
     if user_update.phone is not None:
         # Check if phone is already taken
-        existing = db.query(User).filter(
+        existing = await db.scalar(select(User).where(
             User.phone == user_update.phone,
-            User.id != current_user.id
-        ).first()
+            User.id != user.id
+        ).limit(1))
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Phone number already in use"
             )
-        current_user.phone = user_update.phone
+        user.phone = user_update.phone
     if user_update.country is not None:
-        current_user.country = user_update.country
+        user.country = user_update.country
     if user_update.state is not None:
-        current_user.state = user_update.state
+        user.state = user_update.state
     if user_update.district is not None:
-        current_user.district = user_update.district
+        user.district = user_update.district
     if user_update.gender is not None:
-        current_user.gender = user_update.gender
+        user.gender = user_update.gender
     if user_update.date_of_birth is not None:
-        current_user.date_of_birth = user_update.date_of_birth
+        user.date_of_birth = user_update.date_of_birth
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    get_user_cache().invalidate(user.id)
+    await db.refresh(user)
     
-    return current_user
+    return user
@@ -1,13 +1,33 @@
-from fastapi import APIRouter, HTTPException
+import json
+from datetime import date
+from typing import AsyncIterator, Dict, List, Optional
 
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from ..core import settings
 from ..models.crop_lifecycle import CropLifecycleRequest, CropLifecycleResponse
-from ..services.crop_lifecycle_service import CropLifecycleService
+from ..services.crop_lifecycle_service import CropLifecycleService, LifecycleBatch
+from ..services.forecast_prefetcher import get_forecast_prefetcher
+from ..services.response_cache import etag_matches, get_lifecycle_response_cache
+from ..services.weather_provider import get_weather_provider
+from .predict import read_body
 
 router = APIRouter(prefix="/crop-lifecycle", tags=["crop-lifecycle"])
 
 
-@router.post("/generate", response_model=CropLifecycleResponse, summary="Generate crop lifecycle calendar")
-async def generate_crop_lifecycle(request: CropLifecycleRequest) -> CropLifecycleResponse:
+@router.post(
+    "/generate",
+    response_model=CropLifecycleResponse,
+    responses={304: {"description": "The calendar matching If-None-Match is still current"}},
+    summary="Generate crop lifecycle calendar"
+)
+async def generate_crop_lifecycle(
+    request: CropLifecycleRequest,
+    if_none_match: Optional[str] = Header(default=None)
+) -> Response:
     """
     Generate a complete crop lifecycle calendar with stage-wise care instructions,
     irrigation and fertilizer schedules, and weather-based alerts.
@@ -18,11 +38,92 @@ async def generate_crop_lifecycle(request: CropLifecycleRequest) -> CropLifecycl
     - Irrigation and fertilization schedules
     - Weather forecast and alerts
     - Harvest readiness indicators
+    
+    Responses carry a strong `ETag` derived from the request, the date and the
+    forecast version; send it back in `If-None-Match` to get a 304 while the
+    calendar is unchanged. Rendered bodies are kept in a bounded cache, so
+    `weather_cache_age_seconds` is as of rendering; `weather_fetched_at` is exact.
     """
     try:
-        lifecycle = await CropLifecycleService.generate_lifecycle(request)
-        return lifecycle
+        forecast = await get_weather_provider().lookup(request.latitude, request.longitude)
+        etag = CropLifecycleService.response_etag(request, forecast, date.today())
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        
+        cache = get_lifecycle_response_cache()
+        body = cache.get(etag)
+        if body is None:
+            # Building runs the soil water balance, which is CPU-bound.
+            lifecycle = await run_in_threadpool(CropLifecycleService._build_lifecycle, request, forecast)
+            body = lifecycle.model_dump_json().encode()
+            cache.put(etag, body)
+        return Response(content=body, media_type="application/json", headers=headers)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate lifecycle calendar: {str(e)}")
+
+
+@router.post(
+    "/generate/batch",
+    response_class=StreamingResponse,
+    summary="Generate crop lifecycle calendars for many fields"
+)
+async def generate_crop_lifecycle_batch(request: Request) -> StreamingResponse:
+    """
+    Generate calendars for a JSON array of `CropLifecycleRequest` records.
+
+    Fields in the same forecast grid cell share one weather lookup. Results
+    stream back as NDJSON as each cell's forecast arrives, so lines are not in
+    input order: `{"index": i, "lifecycle": {...}}` on success or
+    `{"index": i, "errors": [...]}` for a record that could not be processed.
+    The last line is `{"summary": {...}}` with the number of fields, grid
+    cells and upstream forecast calls the batch made. Bodies over
+    `lifecycle_batch_max_bytes` are rejected with 413 before they are parsed.
+    """
+    body = await read_body(request, settings.lifecycle_batch_max_bytes)
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body is not valid JSON")
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of CropLifecycleRequest records")
+    if len(payload) > settings.lifecycle_batch_max_fields:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch may contain at most {settings.lifecycle_batch_max_fields} fields"
+        )
+
+    requests: Dict[int, CropLifecycleRequest] = {}
+    invalid: List[str] = []
+    for index, record in enumerate(payload):
+        try:
+            requests[index] = CropLifecycleRequest.model_validate(record)
+        except ValidationError as e:
+            errors = json.loads(e.json(include_url=False))
+            invalid.append(json.dumps({"index": index, "errors": errors}) + "\n")
+
+    batch = LifecycleBatch(requests, settings.lifecycle_batch_concurrency)
+    return StreamingResponse(_stream_batch(batch, invalid), media_type="application/x-ndjson")
+
+
+async def _stream_batch(batch: LifecycleBatch, invalid: List[str]) -> AsyncIterator[str]:
+    for line in invalid:
+        yield line
+    async for index, result in batch.results():
+        if isinstance(result, str):
+            yield json.dumps({"index": index, "errors": [{"msg": result}]}) + "\n"
+        else:
+            yield f'{{"index": {index}, "lifecycle": {result.model_dump_json()}}}\n'
+    yield json.dumps({"summary": batch.summary()}) + "\n"
+
+
+@router.get("/weather/stats", summary="Weather cache and circuit breaker metrics")
+async def weather_stats() -> dict:
+    """Counters for the forecast cache, upstream calls, the Open-Meteo circuit breaker, prefetching and rendered responses."""
+    return {
+        **get_weather_provider().stats(),
+        "prefetch": get_forecast_prefetcher().stats(),
+        "response_cache": get_lifecycle_response_cache().stats()
+    }
@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends
+import io
+import json
+from typing import Any, AsyncIterator
 
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from ..core import settings
 from ..models import FarmerInput, YieldPredictionResponse
-from ..services import YieldEngine
+from ..services import YieldEngine, get_yield_engine
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 def get_engine() -> YieldEngine:
-  return YieldEngine()
+  return get_yield_engine()
 
 
 @router.post(
@@ -26,3 +36,153 @@ async def predict_yield(
   prediction = engine.predict(payload)
   return prediction
 
+
+@router.get("/predict/cache", summary="Prediction cache statistics")
+async def prediction_cache_stats(
+    engine: YieldEngine = Depends(get_engine)
+) -> dict[str, int | float | bool]:
+  """Report hit, miss, eviction and day-rollover expiry counters."""
+  if engine.cache is None:
+    return {"enabled": False}
+  return {"enabled": True, **engine.cache.stats()}
+
+
+@router.post(
+    "/predict/batch",
+    response_class=StreamingResponse,
+    summary="Predict crop yield for many fields"
+)
+async def predict_yield_batch(
+    request: Request, engine: YieldEngine = Depends(get_engine)
+) -> StreamingResponse:
+  """
+  Estimate crop yield for a list or NDJSON stream of `FarmerInput` records.
+
+  Send a JSON array, or `application/x-ndjson` with one record per line.
+  Results stream back as NDJSON in input order, one line per record:
+  `{"index": i, "prediction": {...}}` on success or
+  `{"index": i, "errors": [...]}` when that record could not be scored.
+  Records are validated and scored in fixed-size chunks, and NDJSON lines are
+  parsed lazily, so only one chunk of parsed records and responses is alive
+  at a time. Bodies over `prediction_batch_max_bytes` or with more than
+  `prediction_batch_max_records` records are rejected with 413.
+  """
+  # The body is read up front: once the streaming response starts, Starlette
+  # listens for client disconnects on the same receive channel.
+  body = await read_body(request, settings.prediction_batch_max_bytes)
+  max_records = settings.prediction_batch_max_records
+  if _is_ndjson(request):
+    if sum(1 for line in io.BytesIO(body) if line.strip()) > max_records:
+      raise _too_many_records(max_records)
+    records = _ndjson_records(body)
+  else:
+    try:
+      payload = json.loads(body)
+    except ValueError:
+      raise HTTPException(status_code=400, detail="Request body is not valid JSON")
+    if not isinstance(payload, list):
+      raise HTTPException(
+          status_code=400, detail="Expected a JSON array of FarmerInput records"
+      )
+    if len(payload) > max_records:
+      raise _too_many_records(max_records)
+    records = _list_records(payload)
+
+  return StreamingResponse(
+      _stream_predictions(records, engine, settings.prediction_batch_chunk_size),
+      media_type=NDJSON_MEDIA_TYPE
+  )
+
+
+async def read_body(request: Request, max_bytes: int) -> bytes:
+  """Read the request body, failing with 413 as soon as it passes ``max_bytes``."""
+  too_large = HTTPException(
+      status_code=413, detail=f"A batch body may be at most {max_bytes} bytes"
+  )
+  declared = request.headers.get("content-length", "")
+  if declared.isdigit() and int(declared) > max_bytes:
+    raise too_large
+  body = bytearray()
+  async for part in request.stream():
+    body += part
+    if len(body) > max_bytes:
+      raise too_large
+  return bytes(body)
+
+
+def _too_many_records(max_records: int) -> HTTPException:
+  return HTTPException(
+      status_code=413, detail=f"A batch may contain at most {max_records} records"
+  )
+
+
+def _is_ndjson(request: Request) -> bool:
+  content_type = request.headers.get("content-type", "")
+  return content_type.split(";")[0].strip() in {
+      NDJSON_MEDIA_TYPE, "application/ndjson", "application/jsonl"
+  }
+
+
+async def _list_records(payload: list[Any]) -> AsyncIterator[Any]:
+  for record in payload:
+    yield record
+
+
+async def _ndjson_records(body: bytes) -> AsyncIterator[Any]:
+  for line in io.BytesIO(body):
+    if line.strip():
+      yield _parse_line(line)
+
+
+class _LineError:
+  """Marker for an NDJSON line that is not valid JSON."""
+
+  def __init__(self, message: str):
+    self.message = message
+
+
+def _parse_line(line: bytes) -> Any:
+  try:
+    return json.loads(line)
+  except ValueError as exc:
+    return _LineError(str(exc))
+
+
+async def _stream_predictions(
+    records: AsyncIterator[Any], engine: YieldEngine, chunk_size: int
+) -> AsyncIterator[str]:
+  chunk: list[tuple[int, FarmerInput | list[dict[str, Any]]]] = []
+  index = 0
+  async for record in records:
+    chunk.append((index, _validate(record)))
+    index += 1
+    if len(chunk) >= chunk_size:
+      yield await _score_chunk(chunk, engine)
+      chunk = []
+  if chunk:
+    yield await _score_chunk(chunk, engine)
+
+
+def _validate(record: Any) -> FarmerInput | list[dict[str, Any]]:
+  if isinstance(record, _LineError):
+    return [{"type": "json_invalid", "msg": record.message}]
+  try:
+    return FarmerInput.model_validate(record)
+  except ValidationError as exc:
+    return json.loads(exc.json(include_url=False))
+
+
+async def _score_chunk(
+    chunk: list[tuple[int, FarmerInput | list[dict[str, Any]]]],
+    engine: YieldEngine
+) -> str:
+  farmers = [item for _, item in chunk if isinstance(item, FarmerInput)]
+  predictions = iter(await run_in_threadpool(engine.predict_batch, farmers))
+  lines = []
+  for index, item in chunk:
+    if isinstance(item, FarmerInput):
+      prediction = next(predictions).model_dump_json()
+      lines.append(f'{{"index": {index}, "prediction": {prediction}}}\n')
+    else:
+      lines.append(json.dumps({"index": index, "errors": item}) + "\n")
+  return "".join(lines)
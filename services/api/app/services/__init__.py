@@ -1,4 +1,28 @@
-from .yield_engine import YieldEngine
-
-__all__ = ["YieldEngine"]
+from .circuit_breaker import CircuitBreaker
+from .forecast_prefetcher import ForecastPrefetcher, get_forecast_prefetcher
+from .forecast_store import ForecastStore
+from .prediction_cache import PredictionCache
+from .response_cache import ResponseCache, get_lifecycle_response_cache
+from .water_balance import FieldSeason, SoilWaterBalance, WaterBalance, get_soil_water_balance
+from .weather_provider import Forecast, WeatherProvider, get_weather_provider
+from .yield_engine import YieldEngine, get_spatial_index, get_yield_engine
 
+__all__ = [
+    "CircuitBreaker",
+    "Forecast",
+    "ForecastPrefetcher",
+    "FieldSeason",
+    "ForecastStore",
+    "PredictionCache",
+    "ResponseCache",
+    "SoilWaterBalance",
+    "WaterBalance",
+    "WeatherProvider",
+    "YieldEngine",
+    "get_forecast_prefetcher",
+    "get_lifecycle_response_cache",
+    "get_soil_water_balance",
+    "get_spatial_index",
+    "get_weather_provider",
+    "get_yield_engine",
+]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+  """
+  Consecutive-failure circuit breaker with half-open probing.
+
+  Closed, every call is allowed. After ``failure_threshold`` consecutive
+  failures the breaker opens and rejects calls for ``reset_timeout`` seconds.
+  It then lets ``half_open_probes`` calls through; a success closes it again
+  and a failure reopens it for another ``reset_timeout``.
+
+  Callers ask `allow` before the call and report the outcome with
+  `record_success` or `record_failure`. Meant for a single event loop, so
+  there is no locking.
+  """
+
+  def __init__(
+      self,
+      failure_threshold: int = 5,
+      reset_timeout: float = 30.0,
+      half_open_probes: int = 1,
+      clock: Callable[[], float] = time.monotonic
+  ):
+    self.failure_threshold = failure_threshold
+    self.reset_timeout = reset_timeout
+    self.half_open_probes = half_open_probes
+    self._clock = clock
+    self.state = CLOSED
+    self.consecutive_failures = 0
+    self._opened_at = 0.0
+    self._probes = 0
+    self.successes = 0
+    self.failures = 0
+    self.rejected = 0
+    self.opened = 0
+    self.state_changed_at = clock()
+
+  def allow(self) -> bool:
+    if self.state == OPEN:
+      if self._clock() - self._opened_at < self.reset_timeout:
+        self.rejected += 1
+        return False
+      self._transition(HALF_OPEN)
+      self._probes = 0
+    if self.state == HALF_OPEN:
+      if self._probes >= self.half_open_probes:
+        self.rejected += 1
+        return False
+      self._probes += 1
+    return True
+
+  def blocking(self) -> bool:
+    """Whether `allow` would reject because the breaker is open and cooling down."""
+    return self.state == OPEN and self._clock() - self._opened_at < self.reset_timeout
+
+  def record_success(self) -> None:
+    self.successes += 1
+    self.consecutive_failures = 0
+    if self.state != CLOSED:
+      self._transition(CLOSED)
+
+  def record_failure(self) -> None:
+    self.failures += 1
+    self.consecutive_failures += 1
+    if self.state == HALF_OPEN or (
+        self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+    ):
+      self._opened_at = self._clock()
+      self.opened += 1
+      self._transition(OPEN)
+
+  def _transition(self, state: str) -> None:
+    self.state = state
+    self.state_changed_at = self._clock()
+
+  def stats(self) -> dict[str, int | float | str]:
+    return {
+        "state": self.state,
+        "consecutive_failures": self.consecutive_failures,
+        "successes": self.successes,
+        "failures": self.failures,
+        "rejected": self.rejected,
+        "opened": self.opened,
+        "seconds_in_state": round(self._clock() - self.state_changed_at, 3),
+    }
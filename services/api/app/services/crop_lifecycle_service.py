@@ -1,13 +1,101 @@
-from datetime import date, timedelta
-from typing import List, Dict
-import httpx
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import AsyncIterator, List, Dict, Optional, Sequence, Tuple, Union
 
+import numpy as np
+
+from ..core import settings
 from ..models.crop_lifecycle import (
     CropLifecycleRequest,
     CropLifecycleResponse,
     CropStage,
     WeatherAlert
 )
+from .water_balance import FieldSeason, WaterBalance, get_soil_water_balance, normals_cover
+from .weather_provider import Forecast, get_weather_provider
+
+
+@dataclass(frozen=True)
+class StageTemplate:
+    """Static content of one growth stage, positioned by day offset from planting"""
+    name: str
+    start_offset: int
+    duration: int
+    crop_coefficient: float
+    description: str
+    care_activities: Tuple[str, ...]
+    irrigation_frequency: str
+    fertilizer_recommendations: Tuple[str, ...]
+    weather_considerations: str
+    risk_factors: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """Raise an alert on forecast days where a daily variable exceeds a threshold"""
+    alert_type: str
+    severity: str
+    variable: str
+    threshold: float
+    description: str
+    recommendations: Tuple[str, ...]
+
+
+WEATHER_ALERT_RULES: Tuple[AlertRule, ...] = (
+    AlertRule(
+        alert_type="Heat Stress",
+        severity="High",
+        variable="temperature_2m_max",
+        threshold=35,
+        description="High temperature of {value:.1f}°C forecasted during {stage}",
+        recommendations=(
+            "Increase irrigation frequency",
+            "Consider providing shade if possible",
+            "Monitor plants closely for stress symptoms"
+        )
+    ),
+    AlertRule(
+        alert_type="Heavy Rainfall",
+        severity="Medium",
+        variable="precipitation_sum",
+        threshold=50,
+        description="Heavy rainfall ({value:.1f}mm) expected during {stage}",
+        recommendations=(
+            "Ensure proper drainage",
+            "Avoid fertilizer application before rain",
+            "Watch for waterlogging and disease"
+        )
+    ),
+    AlertRule(
+        alert_type="Strong Winds",
+        severity="Medium",
+        variable="windspeed_10m_max",
+        threshold=40,
+        description="Strong winds ({value:.1f} km/h) forecasted",
+        recommendations=(
+            "Provide support to tall plants if needed",
+            "Check for lodging after wind event",
+            "Delay spraying operations"
+        )
+    ),
+)
+MAX_WEATHER_ALERTS = 5
+# Bump whenever the calendar content changes for the same inputs, so strong
+# ETags issued by an older deployment stop matching.
+LIFECYCLE_ETAG_VERSION = 4
+
+
+def _daily_values(daily: dict, variable: str, days: int) -> np.ndarray:
+    """A daily series as floats, with missing values and days as NaN"""
+    values = np.full(days, np.nan)
+    series = daily.get(variable) or []
+    series = np.array(series[:days], dtype=float)
+    values[:len(series)] = series
+    return values
 
 
 class CropLifecycleService:
@@ -17,10 +105,12 @@ class CropLifecycleService:
         "wheat": {
             "name": "Wheat",
             "total_days": 135,
+            "root_depth": 1.2,
             "stages": [
                 {
                     "name": "Germination & Emergence",
                     "duration": 10,
+                    "crop_coefficient": 0.4,
                     "description": "Seed germination and seedling emergence phase",
                     "irrigation_frequency": "Light watering every 2-3 days",
                     "activities": [
@@ -35,6 +125,7 @@ class CropLifecycleService:
                 {
                     "name": "Tillering",
                     "duration": 30,
+                    "crop_coefficient": 0.7,
                     "description": "Plant produces multiple shoots from the base",
                     "irrigation_frequency": "Irrigate every 7-10 days depending on rainfall",
                     "activities": [
@@ -49,6 +140,7 @@ class CropLifecycleService:
                 {
                     "name": "Stem Elongation",
                     "duration": 25,
+                    "crop_coefficient": 1.0,
                     "description": "Rapid vertical growth of stems",
                     "irrigation_frequency": "Critical irrigation period - every 7 days",
                     "activities": [
@@ -63,6 +155,7 @@ class CropLifecycleService:
                 {
                     "name": "Booting & Heading",
                     "duration": 15,
+                    "crop_coefficient": 1.15,
                     "description": "Formation and emergence of grain head",
                     "irrigation_frequency": "Most critical - irrigate every 5-7 days",
                     "activities": [
@@ -77,6 +170,7 @@ class CropLifecycleService:
                 {
                     "name": "Flowering & Grain Filling",
                     "duration": 30,
+                    "crop_coefficient": 1.1,
                     "description": "Pollination and grain development phase",
                     "irrigation_frequency": "Irrigate every 7-10 days, reduce towards maturity",
                     "activities": [
@@ -91,6 +185,7 @@ class CropLifecycleService:
                 {
                     "name": "Maturation & Drying",
                     "duration": 25,
+                    "crop_coefficient": 0.4,
                     "description": "Grain reaches physiological maturity",
                     "irrigation_frequency": "Stop irrigation 10-15 days before harvest",
                     "activities": [
@@ -107,10 +202,12 @@ class CropLifecycleService:
         "rice": {
             "name": "Rice",
             "total_days": 120,
+            "root_depth": 0.5,
             "stages": [
                 {
                     "name": "Germination & Seedling",
                     "duration": 20,
+                    "crop_coefficient": 1.05,
                     "description": "Seed germination and early seedling development",
                     "irrigation_frequency": "Keep nursery bed continuously moist/flooded",
                     "activities": [
@@ -125,6 +222,7 @@ class CropLifecycleService:
                 {
                     "name": "Transplanting & Establishment",
                     "duration": 10,
+                    "crop_coefficient": 1.1,
                     "description": "Seedlings transplanted to main field",
                     "irrigation_frequency": "Maintain 2-5 cm standing water",
                     "activities": [
@@ -139,6 +237,7 @@ class CropLifecycleService:
                 {
                     "name": "Tillering",
                     "duration": 30,
+                    "crop_coefficient": 1.15,
                     "description": "Production of tillers from main plant",
                     "irrigation_frequency": "Maintain 3-5 cm water depth",
                     "activities": [
@@ -153,6 +252,7 @@ class CropLifecycleService:
                 {
                     "name": "Panicle Initiation",
                     "duration": 15,
+                    "crop_coefficient": 1.2,
                     "description": "Formation of panicle (grain head) inside stem",
                     "irrigation_frequency": "Critical stage - maintain 5 cm water depth",
                     "activities": [
@@ -167,6 +267,7 @@ class CropLifecycleService:
                 {
                     "name": "Flowering & Grain Filling",
                     "duration": 30,
+                    "crop_coefficient": 1.2,
                     "description": "Flowering and grain development",
                     "irrigation_frequency": "Maintain 3-5 cm water until dough stage",
                     "activities": [
@@ -181,6 +282,7 @@ class CropLifecycleService:
                 {
                     "name": "Ripening & Maturity",
                     "duration": 15,
+                    "crop_coefficient": 0.9,
                     "description": "Grains mature and field is drained",
                     "irrigation_frequency": "Drain field 10-15 days before harvest",
                     "activities": [
@@ -197,10 +299,12 @@ class CropLifecycleService:
         "maize": {
             "name": "Maize (Corn)",
             "total_days": 100,
+            "root_depth": 1.2,
             "stages": [
                 {
                     "name": "Germination & Emergence",
                     "duration": 8,
+                    "crop_coefficient": 0.4,
                     "description": "Seed germinates and seedling emerges",
                     "irrigation_frequency": "Light irrigation immediately after sowing, then as needed",
                     "activities": [
@@ -215,6 +319,7 @@ class CropLifecycleService:
                 {
                     "name": "Vegetative Growth",
                     "duration": 30,
+                    "crop_coefficient": 0.8,
                     "description": "Rapid leaf and root development",
                     "irrigation_frequency": "Irrigate every 7-10 days depending on rainfall",
                     "activities": [
@@ -229,6 +334,7 @@ class CropLifecycleService:
                 {
                     "name": "Tasseling",
                     "duration": 10,
+                    "crop_coefficient": 1.15,
                     "description": "Male flower (tassel) emerges",
                     "irrigation_frequency": "Critical period - irrigate every 5-7 days",
                     "activities": [
@@ -243,6 +349,7 @@ class CropLifecycleService:
                 {
                     "name": "Silking & Pollination",
                     "duration": 12,
+                    "crop_coefficient": 1.2,
                     "description": "Female flowers emerge and pollination occurs",
                     "irrigation_frequency": "Most critical - irrigate every 5 days if no rain",
                     "activities": [
@@ -257,6 +364,7 @@ class CropLifecycleService:
                 {
                     "name": "Grain Filling",
                     "duration": 25,
+                    "crop_coefficient": 1.05,
                     "description": "Kernel development and filling",
                     "irrigation_frequency": "Irrigate every 7 days, reduce towards maturity",
                     "activities": [
@@ -271,6 +379,7 @@ class CropLifecycleService:
                 {
                     "name": "Maturity & Harvest",
                     "duration": 15,
+                    "crop_coefficient": 0.6,
                     "description": "Grains reach physiological maturity",
                     "irrigation_frequency": "Stop irrigation 10 days before harvest",
                     "activities": [
@@ -287,10 +396,12 @@ class CropLifecycleService:
         "cotton": {
             "name": "Cotton",
             "total_days": 165,
+            "root_depth": 1.4,
             "stages": [
                 {
                     "name": "Germination & Emergence",
                     "duration": 10,
+                    "crop_coefficient": 0.35,
                     "description": "Seed germination and cotyledon emergence",
                     "irrigation_frequency": "Pre-sowing irrigation, then light irrigation after 7-10 days",
                     "activities": [
@@ -305,6 +416,7 @@ class CropLifecycleService:
                 {
                     "name": "Seedling Establishment",
                     "duration": 20,
+                    "crop_coefficient": 0.5,
                     "description": "True leaf development and root establishment",
                     "irrigation_frequency": "Light irrigation every 10-12 days",
                     "activities": [
@@ -319,6 +431,7 @@ class CropLifecycleService:
                 {
                     "name": "Squaring",
                     "duration": 30,
+                    "crop_coefficient": 0.85,
                     "description": "Formation of flower buds (squares)",
                     "irrigation_frequency": "Irrigate every 10-15 days",
                     "activities": [
@@ -333,6 +446,7 @@ class CropLifecycleService:
                 {
                     "name": "Flowering & Boll Formation",
                     "duration": 40,
+                    "crop_coefficient": 1.15,
                     "description": "Flowers open and bolls begin to develop",
                     "irrigation_frequency": "Critical period - irrigate every 7-10 days",
                     "activities": [
@@ -347,6 +461,7 @@ class CropLifecycleService:
                 {
                     "name": "Boll Development",
                     "duration": 40,
+                    "crop_coefficient": 1.0,
                     "description": "Bolls mature and fiber develops",
                     "irrigation_frequency": "Irrigate every 10-15 days, reduce late in stage",
                     "activities": [
@@ -361,6 +476,7 @@ class CropLifecycleService:
                 {
                     "name": "Boll Opening & Harvest",
                     "duration": 25,
+                    "crop_coefficient": 0.7,
                     "description": "Bolls open and cotton is ready for picking",
                     "irrigation_frequency": "Stop irrigation 2-3 weeks before harvest",
                     "activities": [
@@ -377,10 +493,12 @@ class CropLifecycleService:
         "soybean": {
             "name": "Soybean",
             "total_days": 95,
+            "root_depth": 1.0,
             "stages": [
                 {
                     "name": "Germination & Emergence",
                     "duration": 8,
+                    "crop_coefficient": 0.4,
                     "description": "Seed germinates and seedling emerges",
                     "irrigation_frequency": "Ensure adequate soil moisture at sowing",
                     "activities": [
@@ -395,6 +513,7 @@ class CropLifecycleService:
                 {
                     "name": "Vegetative Growth (V1-V5)",
                     "duration": 25,
+                    "crop_coefficient": 0.75,
                     "description": "Development of true leaves and nodes",
                     "irrigation_frequency": "Irrigate as needed to avoid stress (every 10-12 days)",
                     "activities": [
@@ -409,6 +528,7 @@ class CropLifecycleService:
                 {
                     "name": "Flowering (R1-R2)",
                     "duration": 15,
+                    "crop_coefficient": 1.1,
                     "description": "Flower initiation and open flowering",
                     "irrigation_frequency": "Critical period - irrigate every 7 days",
                     "activities": [
@@ -423,6 +543,7 @@ class CropLifecycleService:
                 {
                     "name": "Pod Formation (R3-R4)",
                     "duration": 15,
+                    "crop_coefficient": 1.15,
                     "description": "Pods form and seeds begin to develop",
                     "irrigation_frequency": "Most critical - irrigate every 5-7 days if no rain",
                     "activities": [
@@ -437,6 +558,7 @@ class CropLifecycleService:
                 {
                     "name": "Seed Filling (R5-R6)",
                     "duration": 20,
+                    "crop_coefficient": 1.05,
                     "description": "Seeds develop and fill within pods",
                     "irrigation_frequency": "Irrigate every 7-10 days, reduce towards maturity",
                     "activities": [
@@ -451,6 +573,7 @@ class CropLifecycleService:
                 {
                     "name": "Maturity & Harvest (R7-R8)",
                     "duration": 12,
+                    "crop_coefficient": 0.5,
                     "description": "Plants mature and pods ready for harvest",
                     "irrigation_frequency": "Stop irrigation 10-15 days before harvest",
                     "activities": [
@@ -467,10 +590,12 @@ class CropLifecycleService:
         "sugarcane": {
             "name": "Sugarcane",
             "total_days": 300,
+            "root_depth": 1.5,
             "stages": [
                 {
                     "name": "Germination & Establishment",
                     "duration": 30,
+                    "crop_coefficient": 0.4,
                     "description": "Bud sprouting and shoot emergence",
                     "irrigation_frequency": "Light irrigation every 3-5 days until establishment",
                     "activities": [
@@ -485,6 +610,7 @@ class CropLifecycleService:
                 {
                     "name": "Tillering",
                     "duration": 60,
+                    "crop_coefficient": 0.8,
                     "description": "Production of multiple shoots from each sett",
                     "irrigation_frequency": "Irrigate every 7-10 days",
                     "activities": [
@@ -499,6 +625,7 @@ class CropLifecycleService:
                 {
                     "name": "Grand Growth Phase",
                     "duration": 120,
+                    "crop_coefficient": 1.25,
                     "description": "Rapid vertical growth and biomass accumulation",
                     "irrigation_frequency": "Regular irrigation every 10-15 days",
                     "activities": [
@@ -517,6 +644,7 @@ class CropLifecycleService:
                 {
                     "name": "Maturation",
                     "duration": 60,
+                    "crop_coefficient": 0.75,
                     "description": "Sugar accumulation in stems",
                     "irrigation_frequency": "Reduce irrigation frequency, stop 2-3 weeks before harvest",
                     "activities": [
@@ -531,6 +659,7 @@ class CropLifecycleService:
                 {
                     "name": "Harvest",
                     "duration": 30,
+                    "crop_coefficient": 0.5,
                     "description": "Cutting and transportation to mill",
                     "irrigation_frequency": "No irrigation",
                     "activities": [
@@ -549,26 +678,50 @@ class CropLifecycleService:
     @staticmethod
     async def get_weather_forecast(latitude: float, longitude: float, days_ahead: int = 16) -> dict:
         """Fetch weather forecast from Open-Meteo API (free, no API key required)"""
-        try:
-            url = "https://api.open-meteo.com/v1/forecast"
-            params = {
-                "latitude": latitude,
-                "longitude": longitude,
-                "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum,precipitation_probability_max,windspeed_10m_max",
-                "forecast_days": days_ahead,
-                "timezone": "auto"
-            }
-            
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                return response.json()
-        except Exception:
-            return None
+        return await get_weather_provider().forecast(latitude, longitude, days_ahead)
 
     @classmethod
     async def generate_lifecycle(cls, request: CropLifecycleRequest) -> CropLifecycleResponse:
         """Generate complete crop lifecycle calendar"""
+        forecast = await get_weather_provider().lookup(request.latitude, request.longitude)
+        # The soil water balance is a few ms of CPU; keep it off the event loop.
+        return await asyncio.to_thread(cls._build_lifecycle, request, forecast)
+
+    @staticmethod
+    def response_etag(request: CropLifecycleRequest, forecast: Optional[Forecast], today: date) -> str:
+        """
+        Strong ETag for the calendar of a request.
+
+        Covers every input the response depends on: the request fields shown in
+        it, the forecast grid cell and version, and the date that decides the
+        current stage. Acreage does not change the calendar and is left out.
+        """
+        provider = get_weather_provider()
+        normalized = [
+            LIFECYCLE_ETAG_VERSION,
+            request.crop_type,
+            request.planting_date.isoformat(),
+            provider.snap(request.latitude, request.longitude),
+            request.location_name,
+            today.isoformat(),
+            [forecast.fetched_at, forecast.stale] if forecast else None,
+        ]
+        digest = hashlib.sha256(json.dumps(normalized).encode()).hexdigest()
+        return f'"{digest[:32]}"'
+
+    @classmethod
+    def _build_lifecycle(
+        cls,
+        request: CropLifecycleRequest,
+        forecast: Optional[Forecast],
+        irrigation_schedule: Optional[List[dict]] = None
+    ) -> CropLifecycleResponse:
+        """
+        Build the calendar for a request from an already fetched forecast.
+        
+        Pass ``irrigation_schedule`` when it was planned together with other
+        fields through `plan_irrigation`.
+        """
         crop_data = cls.CROP_DATA.get(request.crop_type)
         if not crop_data:
             raise ValueError(f"Unsupported crop type: {request.crop_type}")
@@ -578,38 +731,19 @@ class CropLifecycleService:
         today = date.today()
         current_day = (today - request.planting_date).days
         
-        stages = []
-        current_date = request.planting_date
+        stages = list(dated_stages(request.crop_type, request.planting_date))
         current_stage_name = "Not yet planted"
+        if current_day >= 0:
+            for template in stage_templates(request.crop_type):
+                if template.start_offset <= current_day < template.start_offset + template.duration:
+                    current_stage_name = template.name
+                    break
         
-        for stage_data in crop_data["stages"]:
-            start_date = current_date
-            end_date = current_date + timedelta(days=stage_data["duration"] - 1)
-            
-            if current_day >= 0 and start_date <= today <= end_date:
-                current_stage_name = stage_data["name"]
-            
-            stage = CropStage(
-                stage_name=stage_data["name"],
-                start_date=start_date,
-                end_date=end_date,
-                duration_days=stage_data["duration"],
-                description=stage_data["description"],
-                care_activities=stage_data["activities"],
-                irrigation_frequency=stage_data["irrigation_frequency"],
-                fertilizer_recommendations=stage_data["fertilizers"],
-                weather_considerations=stage_data["weather"],
-                risk_factors=stage_data["risks"]
-            )
-            stages.append(stage)
-            current_date = end_date + timedelta(days=1)
-        
-        weather_forecast = await cls.get_weather_forecast(request.latitude, request.longitude)
+        weather_forecast = forecast.data if forecast else None
         weather_alerts = cls._generate_weather_alerts(weather_forecast, request.planting_date, stages)
         
-        irrigation_schedule = await cls._generate_irrigation_schedule_with_weather(
-            stages, request.planting_date, request.latitude, request.longitude
-        )
+        if irrigation_schedule is None:
+            irrigation_schedule = cls.plan_irrigation([request], [forecast])[0]
         fertilizer_schedule = cls._generate_fertilizer_schedule(stages, request.planting_date)
         
         general_tips = cls._get_general_care_tips(request.crop_type)
@@ -629,153 +763,157 @@ class CropLifecycleService:
             irrigation_schedule=irrigation_schedule,
             fertilizer_schedule=fertilizer_schedule,
             general_care_tips=general_tips,
-            harvest_readiness_indicators=harvest_indicators
+            harvest_readiness_indicators=harvest_indicators,
+            weather_fetched_at=datetime.fromtimestamp(forecast.fetched_at, timezone.utc) if forecast else None,
+            weather_cache_age_seconds=forecast.age_seconds if forecast else None,
+            weather_is_stale=forecast.stale if forecast else False
         )
 
     @staticmethod
     def _generate_weather_alerts(weather_data: dict, planting_date: date, stages: List[CropStage]) -> List[WeatherAlert]:
         """Generate weather-based alerts for critical crop stages"""
-        alerts = []
-        
-        if not weather_data or "daily" not in weather_data:
-            return alerts
+        if not weather_data or "daily" not in weather_data or not stages:
+            return []
         
         daily = weather_data["daily"]
-        time_entries = daily.get("time", [])
+        dates = np.array(daily.get("time", []), dtype="datetime64[D]")
+        if not len(dates):
+            return []
         
-        for i, date_str in enumerate(time_entries):
-            forecast_date = date.fromisoformat(date_str)
-            
-            precip_list = daily.get("precipitation_sum", [])
-            precip = precip_list[i] if i < len(precip_list) and precip_list[i] is not None else 0
-            
-            precip_prob_list = daily.get("precipitation_probability_max", [])
-            precip_prob = precip_prob_list[i] if i < len(precip_prob_list) and precip_prob_list[i] is not None else 0
-            
-            temp_max_list = daily.get("temperature_2m_max", [])
-            temp_max = temp_max_list[i] if i < len(temp_max_list) and temp_max_list[i] is not None else None
-            
-            windspeed_list = daily.get("windspeed_10m_max", [])
-            windspeed = windspeed_list[i] if i < len(windspeed_list) and windspeed_list[i] is not None else 0
-            
-            current_stage = None
-            for stage in stages:
-                if stage.start_date <= forecast_date <= stage.end_date:
-                    current_stage = stage
-                    break
-            
-            if temp_max and temp_max > 35 and current_stage:
-                alerts.append(WeatherAlert(
-                    date=forecast_date,
-                    alert_type="Heat Stress",
-                    severity="High",
-                    description=f"High temperature of {temp_max:.1f}°C forecasted during {current_stage.stage_name}",
-                    recommendations=[
-                        "Increase irrigation frequency",
-                        "Consider providing shade if possible",
-                        "Monitor plants closely for stress symptoms"
-                    ]
-                ))
-            
-            if precip > 50 and current_stage:
-                alerts.append(WeatherAlert(
-                    date=forecast_date,
-                    alert_type="Heavy Rainfall",
-                    severity="Medium",
-                    description=f"Heavy rainfall ({precip:.1f}mm) expected during {current_stage.stage_name}",
-                    recommendations=[
-                        "Ensure proper drainage",
-                        "Avoid fertilizer application before rain",
-                        "Watch for waterlogging and disease"
-                    ]
-                ))
-            
-            if windspeed > 40 and current_stage:
-                alerts.append(WeatherAlert(
-                    date=forecast_date,
-                    alert_type="Strong Winds",
-                    severity="Medium",
-                    description=f"Strong winds ({windspeed:.1f} km/h) forecasted",
-                    recommendations=[
-                        "Provide support to tall plants if needed",
-                        "Check for lodging after wind event",
-                        "Delay spraying operations"
-                    ]
-                ))
+        # Stages are contiguous and ordered, so the stage holding each date is
+        # the last one starting on or before it, as long as it has not ended.
+        starts = np.array([stage.start_date for stage in stages], dtype="datetime64[D]")
+        ends = np.array([stage.end_date for stage in stages], dtype="datetime64[D]")
+        stage_index = np.searchsorted(starts, dates, side="right") - 1
+        in_stage = (stage_index >= 0) & (dates <= ends[np.maximum(stage_index, 0)])
         
-        return alerts[:5]
+        values = {
+            variable: _daily_values(daily, variable, len(dates))
+            for variable in {rule.variable for rule in WEATHER_ALERT_RULES}
+        }
+        with np.errstate(invalid="ignore"):
+            triggered = np.stack([
+                values[rule.variable] > rule.threshold for rule in WEATHER_ALERT_RULES
+            ], axis=1) & in_stage[:, None]
+        
+        alerts = []
+        # Row-major order: by date, then by rule order within a date.
+        for day, rule_index in zip(*np.nonzero(triggered)):
+            if len(alerts) == MAX_WEATHER_ALERTS:
+                break
+            rule = WEATHER_ALERT_RULES[rule_index]
+            alerts.append(WeatherAlert(
+                date=dates[day].item(),
+                alert_type=rule.alert_type,
+                severity=rule.severity,
+                description=rule.description.format(
+                    value=float(values[rule.variable][day]),
+                    stage=stages[stage_index[day]].stage_name
+                ),
+                recommendations=list(rule.recommendations)
+            ))
+        return alerts
 
-    @staticmethod
-    async def _generate_irrigation_schedule_with_weather(
-        stages: List[CropStage], 
-        planting_date: date,
-        latitude: float,
-        longitude: float
-    ) -> List[dict]:
-        """Generate irrigation schedule with weather-based recommendations"""
-        schedule = []
+    @classmethod
+    def plan_irrigation(
+        cls,
+        requests: List[CropLifecycleRequest],
+        forecasts: List[Optional[Forecast]]
+    ) -> List[List[dict]]:
+        """Irrigation schedules for many fields from a single soil water balance run"""
+        provider = get_weather_provider()
+        balance = get_soil_water_balance().simulate([
+            FieldSeason(
+                planting_date=request.planting_date,
+                crop_coefficients=crop_coefficients(request.crop_type),
+                max_root_depth=cls.CROP_DATA[request.crop_type]["root_depth"],
+                daily=forecast.data.get("daily") if forecast else None,
+                # Decided on the snapped cell, like the ETag and the forecast,
+                # so every field in one cell gets the same calendar.
+                normals=normals_cover(*provider.snap(request.latitude, request.longitude))
+            )
+            for request, forecast in zip(requests, forecasts)
+        ])
         today = date.today()
-        
-        weather_data = await CropLifecycleService.get_weather_forecast(latitude, longitude)
-        if not weather_data:
-            return CropLifecycleService._generate_irrigation_schedule(stages, planting_date)
-        
-        daily_forecasts = weather_data.get("daily", {})
-        forecast_dates = daily_forecasts.get("time", [])
-        forecast_precip = daily_forecasts.get("precipitation_sum", [])
-        
-        weather_by_date = {}
-        for i, date_str in enumerate(forecast_dates):
-            precip_value = forecast_precip[i] if i < len(forecast_precip) and forecast_precip[i] is not None else 0
-            weather_by_date[date_str] = {
-                "precipitation": precip_value
-            }
-        
-        for stage in stages:
-            if stage.end_date >= today:
-                upcoming_rain = 0
-                rain_days = []
-                
-                for days_ahead in range(0, 3):
-                    check_date = today + timedelta(days=days_ahead)
-                    date_str = check_date.isoformat()
-                    if date_str in weather_by_date:
-                        precip = weather_by_date[date_str]["precipitation"]
-                        if precip > 5:
-                            upcoming_rain += precip
-                            rain_days.append(f"{check_date.strftime('%b %d')} ({precip:.1f}mm)")
-                
-                recommendation = stage.irrigation_frequency
-                if upcoming_rain > 10:
-                    recommendation = f"⚠️ Skip irrigation - Rain forecasted: {', '.join(rain_days)}. Resume when soil dries."
-                elif upcoming_rain > 5:
-                    recommendation = f"⏸️ Delay irrigation - Light rain expected: {', '.join(rain_days)}. Monitor soil moisture."
-                
-                schedule.append({
-                    "stage": stage.stage_name,
-                    "period": f"{stage.start_date.strftime('%b %d')} - {stage.end_date.strftime('%b %d')}",
-                    "frequency": stage.irrigation_frequency,
-                    "recommendation": recommendation,
-                    "is_critical": "critical" in stage.irrigation_frequency.lower() or "most critical" in stage.irrigation_frequency.lower()
-                })
-        
-        return schedule
+        return [
+            cls._generate_irrigation_schedule(
+                dated_stages(request.crop_type, request.planting_date), balance, field, today
+            )
+            for field, request in enumerate(requests)
+        ]
 
     @staticmethod
-    def _generate_irrigation_schedule(stages: List[CropStage], planting_date: date) -> List[dict]:
-        """Generate basic irrigation schedule (fallback without weather)"""
+    def _generate_irrigation_schedule(
+        stages: Sequence[CropStage],
+        balance: WaterBalance,
+        field: int,
+        today: date
+    ) -> List[dict]:
+        """
+        Generate irrigation schedule for the remaining stages from the projected soil-water deficit.
+        
+        ``projection`` says what each entry rests on: ``"normals"`` (forecast,
+        then regional monthly normals), ``"forecast"`` (forecast days only, as
+        the normals do not cover the field) or ``"none"`` (no forecast day in
+        the stage, so only the stage's generic advice is given).
+        """
         schedule = []
-        today = date.today()
         
         for stage in stages:
-            if stage.end_date >= today:
-                schedule.append({
-                    "stage": stage.stage_name,
-                    "period": f"{stage.start_date.strftime('%b %d')} - {stage.end_date.strftime('%b %d')}",
-                    "frequency": stage.irrigation_frequency,
-                    "recommendation": stage.irrigation_frequency,
-                    "is_critical": "critical" in stage.irrigation_frequency.lower() or "most critical" in stage.irrigation_frequency.lower()
-                })
+            if stage.end_date < today:
+                continue
+            
+            first_date = max(stage.start_date, today)
+            first = balance.day_of(field, first_date)
+            window = slice(first, balance.day_of(field, stage.end_date) + 1)
+            irrigation = balance.irrigation[field, window]
+            deficit = balance.depletion[field, window]
+            threshold = float(balance.readily_available[field, window].max())
+            event_days = np.flatnonzero(irrigation)
+            forecast_rain = float(balance.precipitation[field, window][balance.forecast[field, window]].sum())
+            covered = balance.valid[field, window]
+            projection = "normals" if balance.normals[field] else "forecast" if covered.any() else "none"
+            
+            next_irrigation = None
+            if projection == "none":
+                recommendation = (
+                    f"{stage.irrigation_frequency} - No rainfall normals for this location beyond "
+                    "the forecast; check soil moisture before irrigating"
+                )
+            elif len(event_days):
+                next_irrigation = first_date + timedelta(days=int(event_days[0]))
+                recommendation = (
+                    f"💧 Irrigate ~{irrigation[event_days[0]]:.0f} mm on {next_irrigation.strftime('%b %d')}, "
+                    f"when the soil-water deficit passes {threshold:.0f} mm"
+                )
+                if len(event_days) > 1:
+                    recommendation += f" - {len(event_days)} irrigations (~{irrigation.sum():.0f} mm) projected this stage"
+            elif forecast_rain > 5:
+                recommendation = (
+                    f"⚠️ Skip irrigation - Forecast rain ({forecast_rain:.0f} mm) keeps the "
+                    f"soil-water deficit below {threshold:.0f} mm"
+                )
+            elif deficit.max() > threshold:
+                # Only in the dry-down before harvest, where the stage advice applies.
+                recommendation = stage.irrigation_frequency
+            else:
+                recommendation = f"No irrigation needed - Projected soil-water deficit stays below {threshold:.0f} mm"
+            if projection == "forecast" and not covered.all():
+                recommendation += " (projected over the forecast window only)"
+            
+            schedule.append({
+                "stage": stage.stage_name,
+                "period": f"{stage.start_date.strftime('%b %d')} - {stage.end_date.strftime('%b %d')}",
+                "frequency": stage.irrigation_frequency,
+                "recommendation": recommendation,
+                "is_critical": "critical" in stage.irrigation_frequency.lower() or "most critical" in stage.irrigation_frequency.lower(),
+                "next_irrigation": next_irrigation,
+                "irrigation_count": len(event_days),
+                "net_irrigation_mm": round(float(irrigation.sum()), 1),
+                "projected_deficit_mm": round(float(deficit.max()), 1),
+                "deficit_threshold_mm": round(threshold, 1),
+                "projection": projection
+            })
         
         return schedule
 
@@ -881,3 +1019,124 @@ class CropLifecycleService:
             ]
         }
         return indicators.get(crop_type, [])
+
+
+@lru_cache(maxsize=None)
+def stage_templates(crop_type: str) -> Tuple[StageTemplate, ...]:
+    """Compile the static stage content of a crop once"""
+    templates = []
+    offset = 0
+    for stage_data in CropLifecycleService.CROP_DATA[crop_type]["stages"]:
+        templates.append(StageTemplate(
+            name=stage_data["name"],
+            start_offset=offset,
+            duration=stage_data["duration"],
+            crop_coefficient=stage_data["crop_coefficient"],
+            description=stage_data["description"],
+            care_activities=tuple(stage_data["activities"]),
+            irrigation_frequency=stage_data["irrigation_frequency"],
+            fertilizer_recommendations=tuple(stage_data["fertilizers"]),
+            weather_considerations=stage_data["weather"],
+            risk_factors=tuple(stage_data["risks"])
+        ))
+        offset += stage_data["duration"]
+    return tuple(templates)
+
+
+@lru_cache(maxsize=settings.lifecycle_stage_cache_size)
+def dated_stages(crop_type: str, planting_date: date) -> Tuple[CropStage, ...]:
+    """
+    Stages of a crop planted on a given date.
+
+    The models are shared by every response for the same (crop, planting
+    date), so treat them as read-only.
+    """
+    return tuple(
+        CropStage(
+            stage_name=template.name,
+            start_date=planting_date + timedelta(days=template.start_offset),
+            end_date=planting_date + timedelta(days=template.start_offset + template.duration - 1),
+            duration_days=template.duration,
+            description=template.description,
+            care_activities=list(template.care_activities),
+            irrigation_frequency=template.irrigation_frequency,
+            fertilizer_recommendations=list(template.fertilizer_recommendations),
+            weather_considerations=template.weather_considerations,
+            risk_factors=list(template.risk_factors)
+        )
+        for template in stage_templates(crop_type)
+    )
+
+
+@lru_cache(maxsize=None)
+def crop_coefficients(crop_type: str) -> np.ndarray:
+    """Daily crop coefficient (Kc) of a crop from planting to harvest, read-only"""
+    templates = stage_templates(crop_type)
+    coefficients = np.repeat(
+        [template.crop_coefficient for template in templates],
+        [template.duration for template in templates]
+    )
+    coefficients.setflags(write=False)
+    return coefficients
+
+
+class LifecycleBatch:
+    """
+    Lifecycle calendars for many fields, sharing one forecast per grid cell.
+
+    Fields are grouped by the weather provider's snapped grid cell, each cell's
+    forecast is looked up once with at most ``concurrency`` lookups in flight,
+    and the calendars of a cell are built as soon as its forecast arrives, with
+    one soil water balance run covering all of the cell's fields.
+
+    ``upstream_calls`` in the summary is the change in the provider's upstream
+    call counter over the batch, so it includes background refreshes and
+    fetches that overran the latency budget or failed (and any calls other
+    requests started in the meantime).
+    """
+
+    def __init__(self, requests: Dict[int, CropLifecycleRequest], concurrency: int = 8):
+        self.provider = get_weather_provider()
+        self.concurrency = concurrency
+        self.cells: Dict[Tuple[float, float], List[Tuple[int, CropLifecycleRequest]]] = {}
+        for index, request in requests.items():
+            cell = self.provider.snap(request.latitude, request.longitude)
+            self.cells.setdefault(cell, []).append((index, request))
+        self.fields = len(requests)
+        self._upstream_before = self.provider.upstream_calls
+        self.cache_hits = 0
+        self.unavailable = 0
+
+    async def results(self) -> AsyncIterator[Tuple[int, Union[CropLifecycleResponse, str]]]:
+        """Yield ``(index, calendar or error message)`` in completion order"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def lookup(cell: Tuple[float, float]):
+            async with semaphore:
+                return cell, await self.provider.lookup(*cell)
+
+        for next_cell in asyncio.as_completed([lookup(cell) for cell in self.cells]):
+            cell, forecast = await next_cell
+            if forecast is None:
+                self.unavailable += 1
+            elif not forecast.upstream:
+                self.cache_hits += 1
+            fields = self.cells[cell]
+            schedules = await asyncio.to_thread(
+                CropLifecycleService.plan_irrigation,
+                [request for _, request in fields], [forecast] * len(fields)
+            )
+            for (index, request), schedule in zip(fields, schedules):
+                try:
+                    yield index, CropLifecycleService._build_lifecycle(request, forecast, schedule)
+                except ValueError as e:
+                    yield index, str(e)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "fields": self.fields,
+            "cells": len(self.cells),
+            "upstream_calls": self.provider.upstream_calls - self._upstream_before,
+            "cache_hits": self.cache_hits,
+            "forecast_unavailable": self.unavailable,
+        }
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable
+
+from ..core import settings
+from .weather_provider import WeatherProvider, get_weather_provider
+
+Key = tuple[float, float, int]
+
+
+class ForecastPrefetcher:
+  """
+  Background refresh of forecasts for the most recently requested grid cells.
+
+  Every lookup on the provider marks its cell as hot; at most ``hot_cells``
+  cells are tracked, least recently requested first out, and cells idle for
+  ``max_idle`` seconds are dropped. Every ``interval`` seconds the cells whose
+  forecast is missing or past its update boundary are refetched, with at most
+  ``concurrency`` requests in flight and no more than ``rate`` started per
+  second. A cell is due once its forecast is missing or within the provider's
+  ``refresh_lead`` of its update boundary, and the provider counts such early
+  fetches toward the next interval, so hot cells are refreshed at the
+  prefetcher's pace before they expire instead of all at once by lookups
+  right after the boundary. ``refresh_lead`` should cover ``hot_cells / rate``
+  seconds. A round stops early while the provider's circuit breaker is open. Every ``purge_interval``
+  seconds the loop also drops disk-cached forecasts too old to be served.
+  """
+
+  def __init__(
+      self,
+      provider: WeatherProvider,
+      hot_cells: int = 5000,
+      concurrency: int = 4,
+      rate: float = 5.0,
+      interval: float = 30.0,
+      max_idle: float = 2 * 86400.0,
+      purge_interval: float = 3600.0,
+      clock: Callable[[], float] = time.monotonic
+  ):
+    self.provider = provider
+    self.hot_cells = hot_cells
+    self.concurrency = concurrency
+    self.rate = rate
+    self.interval = interval
+    self.max_idle = max_idle
+    self.purge_interval = purge_interval
+    self._clock = clock
+    self._hot: OrderedDict[Key, float] = OrderedDict()
+    self._task: asyncio.Task | None = None
+    self._next_start = 0.0
+    self._next_purge = 0.0
+    self.rounds = 0
+    self.refreshed = 0
+    self.failed = 0
+    self.skipped = 0
+    provider.listeners.append(self.touch)
+
+  def touch(self, key: Key) -> None:
+    self._hot[key] = self._clock()
+    self._hot.move_to_end(key)
+    while len(self._hot) > self.hot_cells:
+      self._hot.popitem(last=False)
+
+  def due(self) -> list[Key]:
+    """Hot cells needing a refresh, most recently requested first."""
+    cutoff = self._clock() - self.max_idle
+    while self._hot and next(iter(self._hot.values())) < cutoff:
+      self._hot.popitem(last=False)
+    lead = self.provider.refresh_lead
+    return [key for key in reversed(self._hot) if self.provider.is_due(key, lead)]
+
+  async def run_once(self) -> int:
+    """Refresh every due cell once; returns how many were refreshed."""
+    self.rounds += 1
+    keys = self.due()
+    if not keys:
+      return 0
+    semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def refresh(key: Key) -> bool:
+      async with semaphore:
+        if self.provider.breaker.blocking():
+          self.skipped += 1
+          return False
+        await self._pace()
+        ok = await self.provider.refresh(key)
+        if ok:
+          self.refreshed += 1
+        else:
+          self.failed += 1
+        return ok
+
+    results = await asyncio.gather(*(refresh(key) for key in keys))
+    return sum(results)
+
+  async def _pace(self) -> None:
+    # Space request starts 1 / rate seconds apart across all workers.
+    now = self._clock()
+    start = max(now, self._next_start)
+    self._next_start = start + 1 / self.rate
+    if start > now:
+      await asyncio.sleep(start - now)
+
+  async def _run(self) -> None:
+    while True:
+      await asyncio.sleep(self.interval)
+      await self.run_once()
+      if self._clock() >= self._next_purge:
+        self._next_purge = self._clock() + self.purge_interval
+        await self.provider.purge_store()
+
+  def start(self) -> None:
+    if self._task is None or self._task.done():
+      self._task = asyncio.get_running_loop().create_task(self._run())
+
+  async def stop(self) -> None:
+    if self._task is not None:
+      self._task.cancel()
+      try:
+        await self._task
+      except asyncio.CancelledError:
+        pass
+      self._task = None
+
+  def stats(self) -> dict[str, int | float | bool]:
+    return {
+        "running": self._task is not None and not self._task.done(),
+        "hot_cells": len(self._hot),
+        "max_hot_cells": self.hot_cells,
+        "rounds": self.rounds,
+        "refreshed": self.refreshed,
+        "failed": self.failed,
+        "skipped": self.skipped,
+    }
+
+
+@lru_cache()
+def get_forecast_prefetcher() -> ForecastPrefetcher:
+  return ForecastPrefetcher(
+      get_weather_provider(),
+      hot_cells=settings.weather_prefetch_hot_cells,
+      concurrency=settings.weather_prefetch_concurrency,
+      rate=settings.weather_prefetch_rate_per_second,
+      interval=settings.weather_prefetch_interval_seconds,
+      max_idle=settings.weather_prefetch_max_idle_seconds,
+      purge_interval=settings.weather_store_purge_interval_seconds
+  )
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from threading import Lock
+
+FILENAME = "forecasts.sqlite3"
+
+
+class ForecastStore:
+  """
+  SQLite-backed forecast cache that survives restarts.
+
+  Rows are keyed by snapped grid cell and forecast length and hold the raw
+  Open-Meteo payload with its fetch time; freshness is decided by the caller.
+  One connection is shared across threads behind a lock, and the database runs
+  in WAL mode so several API processes can share the directory.
+  """
+
+  def __init__(self, directory: str | Path):
+    self.path = Path(directory) / FILENAME
+    self._lock = Lock()
+    self._connection: sqlite3.Connection | None = None
+
+  def _connect(self) -> sqlite3.Connection:
+    if self._connection is None:
+      self.path.parent.mkdir(parents=True, exist_ok=True)
+      connection = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+      connection.execute("PRAGMA journal_mode=WAL")
+      connection.execute("PRAGMA synchronous=NORMAL")
+      connection.execute(
+          "CREATE TABLE IF NOT EXISTS forecasts ("
+          " latitude REAL NOT NULL,"
+          " longitude REAL NOT NULL,"
+          " days INTEGER NOT NULL,"
+          " fetched_at REAL NOT NULL,"
+          " payload TEXT NOT NULL,"
+          " PRIMARY KEY (latitude, longitude, days))"
+      )
+      self._connection = connection
+    return self._connection
+
+  def get(self, key: tuple[float, float, int]) -> tuple[float, dict] | None:
+    with self._lock:
+      row = self._connect().execute(
+          "SELECT fetched_at, payload FROM forecasts"
+          " WHERE latitude = ? AND longitude = ? AND days = ?",
+          key
+      ).fetchone()
+    if row is None:
+      return None
+    return row[0], json.loads(row[1])
+
+  def put(self, key: tuple[float, float, int], fetched_at: float, data: dict) -> None:
+    payload = json.dumps(data, separators=(",", ":"))
+    with self._lock:
+      connection = self._connect()
+      connection.execute(
+          "INSERT OR REPLACE INTO forecasts"
+          " (latitude, longitude, days, fetched_at, payload) VALUES (?, ?, ?, ?, ?)",
+          (*key, fetched_at, payload)
+      )
+      connection.commit()
+
+  def purge(self, older_than: float) -> int:
+    """Delete entries fetched before ``older_than``; returns the row count."""
+    with self._lock:
+      connection = self._connect()
+      deleted = connection.execute(
+          "DELETE FROM forecasts WHERE fetched_at < ?", (older_than,)
+      ).rowcount
+      connection.commit()
+    return deleted
+
+  def close(self) -> None:
+    with self._lock:
+      if self._connection is not None:
+        self._connection.close()
+        self._connection = None
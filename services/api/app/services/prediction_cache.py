@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from datetime import date
+from threading import Lock
+from typing import Callable, Hashable
+
+from ..models import FarmerInput, YieldPredictionResponse
+
+
+class PredictionCache:
+  """
+  Bounded LRU cache of yield predictions keyed on quantized farmer input.
+
+  Coordinates, rainfall and fertilizer are quantized before keying so
+  payloads that differ only in insignificant digits share one entry, and the
+  prediction is computed from the quantized input, so an entry does not
+  depend on which payload filled it. Rainfall and fertilizer are floored
+  rather than rounded: the model's thresholds on them (``rainfall < 50``)
+  sit on whole numbers, so they never fall inside a bucket. The phenology
+  factor depends on today's date, so the whole cache is dropped when the date
+  rolls over.
+  """
+
+  def __init__(
+      self,
+      maxsize: int = 4096,
+      coordinate_decimals: int = 4,
+      rainfall_decimals: int = 0,
+      fertilizer_decimals: int = 0,
+      today: Callable[[], date] = date.today
+  ):
+    self.maxsize = maxsize
+    self.coordinate_decimals = coordinate_decimals
+    self.rainfall_decimals = rainfall_decimals
+    self.fertilizer_decimals = fertilizer_decimals
+    self._today = today
+    self._day = today()
+    self._entries: OrderedDict[Hashable, YieldPredictionResponse] = OrderedDict()
+    self._lock = Lock()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self.expirations = 0
+
+  def quantize(self, farmer: FarmerInput) -> FarmerInput:
+    """Return the input with every numeric field snapped to cache precision."""
+    return farmer.model_copy(update={
+        "latitude": round(farmer.latitude, self.coordinate_decimals),
+        "longitude": round(farmer.longitude, self.coordinate_decimals),
+        "rainfall": _floor(farmer.rainfall, self.rainfall_decimals),
+        "fertilizer_usage": _floor(
+            farmer.fertilizer_usage, self.fertilizer_decimals
+        ),
+    })
+
+  @staticmethod
+  def key(farmer: FarmerInput) -> Hashable:
+    # location_name and acreage do not influence the estimate.
+    return (
+        farmer.crop_type,
+        farmer.soil_type,
+        farmer.irrigation_type,
+        farmer.latitude,
+        farmer.longitude,
+        farmer.rainfall,
+        farmer.fertilizer_usage,
+        farmer.sowing_date,
+    )
+
+  def get_or_compute(
+      self,
+      farmer: FarmerInput,
+      compute: Callable[[FarmerInput], YieldPredictionResponse]
+  ) -> YieldPredictionResponse:
+    """
+    Return the cached prediction for `farmer`, computing it on a miss.
+
+    `compute` receives the quantized input, so the answer for a key is the
+    same whichever of the payloads sharing it arrives first.
+    """
+    quantized = self.quantize(farmer)
+    key = self.key(quantized)
+    with self._lock:
+      self._roll_day()
+      day = self._day
+      cached = self._entries.get(key)
+      if cached is not None:
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return cached
+      self.misses += 1
+
+    prediction = compute(quantized)
+
+    with self._lock:
+      self._roll_day()
+      if self._day != day:
+        # Computed against yesterday's phenology; do not cache it for today.
+        return prediction
+      self._entries[key] = prediction
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.maxsize:
+        self._entries.popitem(last=False)
+        self.evictions += 1
+    return prediction
+
+  def clear(self) -> None:
+    with self._lock:
+      self._entries.clear()
+
+  def stats(self) -> dict[str, int | float]:
+    with self._lock:
+      lookups = self.hits + self.misses
+      return {
+          "size": len(self._entries),
+          "maxsize": self.maxsize,
+          "hits": self.hits,
+          "misses": self.misses,
+          "evictions": self.evictions,
+          "expirations": self.expirations,
+          "hit_rate": self.hits / lookups if lookups else 0.0,
+      }
+
+  def _roll_day(self) -> None:
+    today = self._today()
+    if today != self._day:
+      self.expirations += len(self._entries)
+      self._entries.clear()
+      self._day = today
+
+
+def _floor(value: float, decimals: int) -> float:
+  scale = 10 ** decimals
+  # Round away float noise first so 1.15 stays in the 1.15 bucket, not 1.14.
+  return math.floor(round(value * scale, 6)) / scale
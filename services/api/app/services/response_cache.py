@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+
+from ..core import settings
+
+
+class ResponseCache:
+  """
+  LRU of serialized response bodies keyed by strong ETag, bounded in bytes.
+
+  A strong ETag names exactly one body, so entries never need invalidating:
+  anything that changes the body changes the ETag, and the old entry simply
+  ages out. Bodies larger than the whole budget are not stored.
+  """
+
+  def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+    self.max_bytes = max_bytes
+    self.size = 0
+    self._entries: OrderedDict[str, bytes] = OrderedDict()
+    self._lock = Lock()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  def get(self, etag: str) -> bytes | None:
+    with self._lock:
+      body = self._entries.get(etag)
+      if body is None:
+        self.misses += 1
+        return None
+      self._entries.move_to_end(etag)
+      self.hits += 1
+      return body
+
+  def put(self, etag: str, body: bytes) -> None:
+    if len(body) > self.max_bytes:
+      return
+    with self._lock:
+      previous = self._entries.pop(etag, None)
+      if previous is not None:
+        self.size -= len(previous)
+      self._entries[etag] = body
+      self.size += len(body)
+      while self.size > self.max_bytes:
+        _, evicted = self._entries.popitem(last=False)
+        self.size -= len(evicted)
+        self.evictions += 1
+
+  def clear(self) -> None:
+    with self._lock:
+      self._entries.clear()
+      self.size = 0
+
+  def stats(self) -> dict[str, int]:
+    return {
+        "entries": len(self._entries),
+        "bytes": self.size,
+        "max_bytes": self.max_bytes,
+        "hits": self.hits,
+        "misses": self.misses,
+        "evictions": self.evictions,
+    }
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+  """Weak comparison of an ``If-None-Match`` header against ``etag``."""
+  if not if_none_match:
+    return False
+  opaque = etag.removeprefix("W/")
+  for candidate in if_none_match.split(","):
+    candidate = candidate.strip()
+    if candidate == "*" or candidate.removeprefix("W/") == opaque:
+      return True
+  return False
+
+
+@lru_cache()
+def get_lifecycle_response_cache() -> ResponseCache:
+  return ResponseCache(settings.lifecycle_response_cache_bytes)
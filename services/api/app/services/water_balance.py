@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+
+from ..core import settings
+
+# Monthly normals (January first) used outside the forecast window: rainfall
+# and FAO-56 reference evapotranspiration in mm/day, averaged over the Indian
+# plains. Coarse, but it keeps a season-long projection honest about the dry
+# and monsoon months without a second upstream dependency.
+MONTHLY_PRECIPITATION = (0.6, 0.8, 0.8, 1.2, 2.0, 5.5, 9.0, 8.2, 5.6, 2.4, 0.9, 0.4)
+MONTHLY_ET0 = (2.5, 3.3, 4.6, 5.9, 6.8, 5.9, 4.4, 4.0, 4.0, 3.8, 2.9, 2.3)
+# Where those normals hold, as (south, west, north, east) in degrees. Elsewhere
+# (other hemispheres, deserts, highlands) they would invent a monsoon, so fields
+# outside it are only projected over their forecast window.
+NORMALS_REGION = (6.0, 68.0, 36.0, 98.0)
+
+
+def normals_cover(latitude: float, longitude: float) -> bool:
+  """Whether the monthly normals apply at a location."""
+  south, west, north, east = NORMALS_REGION
+  return south <= latitude <= north and west <= longitude <= east
+
+
+@dataclass(frozen=True)
+class FieldSeason:
+  """One field's season: its planting date, daily crop coefficients and forecast.
+
+  ``crop_coefficients`` holds Kc for every day from planting to harvest, and
+  ``daily`` is an Open-Meteo ``daily`` block (or None) whose precipitation and
+  reference evapotranspiration override the normals on the days it covers.
+  With ``normals`` False (see `normals_cover`) only the forecast days are
+  simulated, starting from field capacity on the first of them.
+  """
+
+  planting_date: date
+  crop_coefficients: np.ndarray
+  max_root_depth: float
+  daily: dict | None = None
+  normals: bool = True
+
+
+@dataclass(frozen=True)
+class WaterBalance:
+  """Daily root-zone water balance of many fields, as (fields, days) arrays.
+
+  Day ``d`` of field ``f`` is ``starts[f] + d``; days past a field's harvest,
+  and days outside the forecast for fields without ``normals``, are False in
+  ``valid`` and zero elsewhere. ``depletion`` is the root-zone
+  deficit below field capacity at the end of each day before irrigation,
+  ``irrigation`` the net depth applied that day to refill the root zone, and
+  ``forecast`` marks the days driven by the forecast rather than the normals.
+  """
+
+  starts: np.ndarray
+  valid: np.ndarray
+  forecast: np.ndarray
+  precipitation: np.ndarray
+  crop_evapotranspiration: np.ndarray
+  total_available: np.ndarray
+  readily_available: np.ndarray
+  depletion: np.ndarray
+  irrigation: np.ndarray
+  normals: np.ndarray
+
+  def day_of(self, field: int, day: date) -> int:
+    """Index of a calendar date in a field's season (may be out of range)."""
+    return int((np.datetime64(day, "D") - self.starts[field]).astype(int))
+
+
+class SoilWaterBalance:
+  """
+  FAO-56 style single-bucket soil water balance, vectorised across fields.
+
+  The root zone deepens linearly from ``initial_root_depth`` to the crop's
+  maximum over the first ``root_growth_fraction`` of the season and holds
+  ``available_water`` mm of plant-available water per metre. Each day crop
+  evapotranspiration (Kc × ET0, reduced by the FAO water-stress coefficient
+  once the deficit passes the readily available water) deepens the deficit,
+  rain smaller than a fifth of the day's ET0 is treated as lost to
+  interception and evaporation, and water beyond field capacity drains away.
+  Whenever the deficit passes the readily available water — ``depletion_fraction``
+  of the total — the field is irrigated back to field capacity, except in the
+  last ``cutoff_days`` before harvest when fields are dried down.
+
+  Every field starts at field capacity on its planting day. Days are stepped
+  in order, but each step updates all fields at once, so a cooperative of
+  thousands of fields costs one pass over the longest season.
+  """
+
+  def __init__(
+      self,
+      available_water: float = 140.0,
+      depletion_fraction: float = 0.5,
+      initial_root_depth: float = 0.15,
+      root_growth_fraction: float = 0.5,
+      cutoff_days: int = 10,
+      monthly_precipitation: Sequence[float] = MONTHLY_PRECIPITATION,
+      monthly_et0: Sequence[float] = MONTHLY_ET0
+  ):
+    self.available_water = available_water
+    self.depletion_fraction = depletion_fraction
+    self.initial_root_depth = initial_root_depth
+    self.root_growth_fraction = root_growth_fraction
+    self.cutoff_days = cutoff_days
+    self.monthly_precipitation = np.asarray(monthly_precipitation, dtype=float)
+    self.monthly_et0 = np.asarray(monthly_et0, dtype=float)
+
+  def simulate(self, fields: Sequence[FieldSeason]) -> WaterBalance:
+    if not fields:
+      raise ValueError("simulate needs at least one field")
+    count = len(fields)
+    lengths = np.array([len(field.crop_coefficients) for field in fields])
+    days = int(lengths.max())
+    day = np.arange(days)
+    valid = day < lengths[:, None]
+
+    kc = np.zeros((count, days))
+    for index, field in enumerate(fields):
+      kc[index, :lengths[index]] = field.crop_coefficients
+
+    starts = np.array([field.planting_date for field in fields], dtype="datetime64[D]")
+    months = (starts[:, None] + day).astype("datetime64[M]").astype(int) % 12
+    precipitation = self.monthly_precipitation[months]
+    et0 = self.monthly_et0[months]
+    forecast = np.zeros((count, days), dtype=bool)
+    for index, field in enumerate(fields):
+      if field.daily:
+        self._overlay(field.daily, starts[index], days, index, precipitation, et0, forecast)
+    forecast &= valid
+    normals = np.array([field.normals for field in fields])
+    valid &= normals[:, None] | forecast
+
+    max_roots = np.array([field.max_root_depth for field in fields])
+    growth_days = np.maximum(lengths * self.root_growth_fraction, 1.0)
+    growth = np.clip(day / growth_days[:, None], 0.0, 1.0)
+    roots = self.initial_root_depth + (max_roots[:, None] - self.initial_root_depth) * growth
+    total = np.where(valid, self.available_water * roots, 0.0)
+    readily = self.depletion_fraction * total
+    stressed_range = np.maximum(total - readily, 1e-9)
+
+    rain = np.where(valid & (precipitation >= 0.2 * et0), precipitation, 0.0)
+    potential = kc * et0
+    allowed = valid & (day < (lengths - self.cutoff_days)[:, None])
+
+    actual = np.zeros((count, days))
+    depletion = np.zeros((count, days))
+    irrigation = np.zeros((count, days))
+    deficit = np.zeros(count)
+    for d in range(days):
+      stress = np.clip((total[:, d] - deficit) / stressed_range[:, d], 0.0, 1.0)
+      actual[:, d] = potential[:, d] * stress
+      deficit = np.clip(deficit + actual[:, d] - rain[:, d], 0.0, total[:, d])
+      depletion[:, d] = deficit
+      refill = allowed[:, d] & (deficit > readily[:, d])
+      irrigation[refill, d] = deficit[refill]
+      deficit[refill] = 0.0
+
+    return WaterBalance(
+        starts=starts,
+        valid=valid,
+        forecast=forecast,
+        precipitation=np.where(valid, precipitation, 0.0),
+        crop_evapotranspiration=actual,
+        total_available=total,
+        readily_available=readily,
+        depletion=depletion,
+        irrigation=irrigation,
+        normals=normals
+    )
+
+  @staticmethod
+  def _overlay(
+      daily: dict,
+      start: np.datetime64,
+      days: int,
+      index: int,
+      precipitation: np.ndarray,
+      et0: np.ndarray,
+      forecast: np.ndarray
+  ) -> None:
+    dates = np.array(daily.get("time") or [], dtype="datetime64[D]")
+    offsets = (dates - start).astype(int)
+    in_season = (offsets >= 0) & (offsets < days)
+    for variable, target in (
+        ("precipitation_sum", precipitation),
+        ("et0_fao_evapotranspiration", et0),
+    ):
+      series = np.full(len(dates), np.nan)
+      values = np.array((daily.get(variable) or [])[:len(dates)], dtype=float)
+      series[:len(values)] = values
+      usable = in_season & ~np.isnan(series)
+      target[index, offsets[usable]] = series[usable]
+      if variable == "precipitation_sum":
+        forecast[index, offsets[usable]] = True
+
+
+@lru_cache()
+def get_soil_water_balance() -> SoilWaterBalance:
+  return SoilWaterBalance(
+      available_water=settings.soil_available_water_mm_per_m,
+      depletion_fraction=settings.soil_depletion_fraction,
+      cutoff_days=settings.irrigation_cutoff_days
+  )
@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Callable, Hashable
+
+import httpx
+
+from ..core import settings
+from .circuit_breaker import CircuitBreaker
+from .forecast_store import ForecastStore
+
+FORECAST_PATH = "/v1/forecast"
+FORECAST_URL = "https://api.open-meteo.com" + FORECAST_PATH
+DAILY_VARIABLES = (
+    "temperature_2m_max,temperature_2m_min,precipitation_sum,"
+    "precipitation_probability_max,windspeed_10m_max,et0_fao_evapotranspiration"
+)
+
+
+@dataclass(frozen=True)
+class Forecast:
+  """A forecast payload with when it was fetched and how old it was when served.
+
+  ``upstream`` is True when this lookup itself started the upstream call.
+  """
+
+  data: dict
+  fetched_at: float
+  age_seconds: int
+  stale: bool
+  upstream: bool = False
+
+
+class WeatherProvider:
+  """
+  Open-Meteo daily forecasts behind a shared client, single-flight and a TTL cache.
+
+  Coordinates are snapped to ``grid_degrees`` before keying and before the
+  upstream call, so nearby farms share one forecast. Open-Meteo publishes new
+  forecasts on a fixed cadence, so entries expire at the next
+  ``update_interval`` boundary (UTC) rather than a fixed time after fetching:
+  a forecast cached just before an update is not served for another full
+  interval. Concurrent misses for the same key wait on one upstream request.
+  A fetch made within ``refresh_lead`` seconds before a boundary counts toward
+  the following interval, which lets the prefetcher refresh hot cells ahead of
+  the boundary at its own pace; the price is serving a run at most
+  ``refresh_lead`` seconds older than the boundary.
+
+  With a `ForecastStore`, entries are also written to disk and read back on a
+  memory miss, so a restarted process starts warm. Expired entries younger
+  than ``max_stale`` past expiry are served immediately while a background
+  fetch replaces them (stale-while-revalidate); older ones are refetched
+  inline, and are still served if that fetch fails. Failures are not cached.
+
+  Upstream calls go through a `CircuitBreaker`. Transport errors, 5xx/429
+  responses and calls slower than ``latency_budget`` count as failures. A
+  caller waits at most ``latency_budget`` seconds for a fetch (which keeps
+  running and fills the cache), and while the breaker is open no fetch is
+  started at all; either way the caller gets the stale entry or ``None``.
+
+  ``transport`` replaces the network layer of the shared client, e.g. with the
+  local stand-in from `services.weather_stub` in tests and benchmarks.
+  """
+
+  def __init__(
+      self,
+      url: str = FORECAST_URL,
+      grid_degrees: float = 0.1,
+      update_interval: float = 3600.0,
+      maxsize: int = 10000,
+      timeout: float = 10.0,
+      max_connections: int = 20,
+      store: ForecastStore | None = None,
+      max_stale: float = 6 * 3600.0,
+      latency_budget: float | None = 2.0,
+      refresh_lead: float = 0.0,
+      breaker: CircuitBreaker | None = None,
+      transport: httpx.AsyncBaseTransport | None = None,
+      clock: Callable[[], float] = time.time
+  ):
+    self.url = url
+    self.grid_degrees = grid_degrees
+    self.update_interval = update_interval
+    self.maxsize = maxsize
+    self.timeout = timeout
+    self.max_connections = max_connections
+    self.store = store
+    self.max_stale = max_stale
+    self.latency_budget = latency_budget
+    self.refresh_lead = refresh_lead
+    self.breaker = breaker or CircuitBreaker()
+    self.transport = transport
+    self._clock = clock
+    self._entries: OrderedDict[Hashable, tuple[float, dict]] = OrderedDict()
+    self._inflight: dict[Hashable, asyncio.Task] = {}
+    self._client: httpx.AsyncClient | None = None
+    self._client_loop: asyncio.AbstractEventLoop | None = None
+    self.hits = 0
+    self.stale_hits = 0
+    self.disk_hits = 0
+    self.misses = 0
+    self.coalesced = 0
+    self.upstream_calls = 0
+    self.upstream_errors = 0
+    self.store_errors = 0
+    self.store_purged = 0
+    self.slow_calls = 0
+    self.budget_exceeded = 0
+    self.short_circuited = 0
+    # Called with the snapped key of every lookup, e.g. by the prefetcher.
+    self.listeners: list[Callable[[tuple[float, float, int]], None]] = []
+
+  def snap(self, latitude: float, longitude: float) -> tuple[float, float]:
+    step = self.grid_degrees
+    return (
+        round(round(latitude / step) * step, 6),
+        round(round(longitude / step) * step, 6),
+    )
+
+  def expires_at(self, fetched_at: float) -> float:
+    """Start of the next forecast update interval after ``fetched_at + refresh_lead``."""
+    return ((fetched_at + self.refresh_lead) // self.update_interval + 1) * self.update_interval
+
+  async def forecast(
+      self, latitude: float, longitude: float, days_ahead: int = 16
+  ) -> dict | None:
+    result = await self.lookup(latitude, longitude, days_ahead)
+    return result.data if result is not None else None
+
+  async def lookup(
+      self, latitude: float, longitude: float, days_ahead: int = 16
+  ) -> Forecast | None:
+    latitude, longitude = self.snap(latitude, longitude)
+    key = (latitude, longitude, days_ahead)
+    for listener in self.listeners:
+      listener(key)
+
+    entry = self._entries.get(key)
+    if entry is not None:
+      self._entries.move_to_end(key)
+    elif self.store is not None:
+      entry = await self._store_call(self.store.get, key)
+      if entry is not None:
+        self.disk_hits += 1
+        self._remember(key, *entry)
+    if entry is not None:
+      now = self._clock()
+      expires_at = self.expires_at(entry[0])
+      if now < expires_at:
+        self.hits += 1
+        return self._result(entry, stale=False)
+      if now - expires_at < self.max_stale:
+        self.stale_hits += 1
+        self._refresh(key)
+        return self._result(entry, stale=True)
+
+    self.misses += 1
+    joined = self._inflight.get(key)
+    task = self._refresh(key)
+    result = None
+    if task is not None:
+      try:
+        # A cancelled or impatient caller must not cancel the fetch other
+        # callers wait on; it finishes in the background and fills the cache.
+        result = await asyncio.wait_for(asyncio.shield(task), self.latency_budget)
+      except asyncio.TimeoutError:
+        self.budget_exceeded += 1
+    if result is None and entry is not None:
+      return self._result(entry, stale=True)
+    if result is not None and task is not joined:
+      result = replace(result, upstream=True)
+    return result
+
+  def is_due(self, key: tuple[float, float, int], lead: float = 0.0) -> bool:
+    """Whether the in-memory entry for ``key`` is missing or expires within ``lead`` seconds."""
+    entry = self._entries.get(key)
+    return entry is None or self._clock() >= self.expires_at(entry[0]) - lead
+
+  async def refresh(self, key: tuple[float, float, int]) -> bool:
+    """Fetch ``key`` now, joining any in-flight fetch; False if skipped or failed."""
+    task = self._refresh(key)
+    if task is None:
+      return False
+    return await asyncio.shield(task) is not None
+
+  def _result(self, entry: tuple[float, dict], stale: bool) -> Forecast:
+    fetched_at, data = entry
+    return Forecast(data, fetched_at, max(0, int(self._clock() - fetched_at)), stale)
+
+  def _refresh(self, key: tuple[float, float, int]) -> asyncio.Task | None:
+    """Join the in-flight fetch for ``key`` or start one if the breaker allows."""
+    task = self._inflight.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+      if not self.breaker.allow():
+        self.short_circuited += 1
+        return None
+      task = asyncio.ensure_future(self._fetch(key))
+      self._inflight[key] = task
+      task.add_done_callback(lambda done: self._forget(key, done))
+    else:
+      self.coalesced += 1
+    return task
+
+  def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+    if self._inflight.get(key) is task:
+      del self._inflight[key]
+
+  async def _fetch(self, key: tuple[float, float, int]) -> Forecast | None:
+    latitude, longitude, days_ahead = key
+    params = {
+        "latitude": latitude,
+        "longitude": longitude,
+        "daily": DAILY_VARIABLES,
+        "forecast_days": days_ahead,
+        "timezone": "auto"
+    }
+    self.upstream_calls += 1
+    began = time.perf_counter()
+    try:
+      response = await self._http().get(self.url, params=params)
+      response.raise_for_status()
+      data = response.json()
+    except Exception as error:
+      self.upstream_errors += 1
+      # A client error still proves upstream is answering, except rate limits.
+      if (
+          isinstance(error, httpx.HTTPStatusError)
+          and error.response.status_code < 500
+          and error.response.status_code != 429
+      ):
+        self.breaker.record_success()
+      else:
+        self.breaker.record_failure()
+      return None
+
+    if self.latency_budget is not None and time.perf_counter() - began > self.latency_budget:
+      self.slow_calls += 1
+      self.breaker.record_failure()
+    else:
+      self.breaker.record_success()
+
+    fetched_at = self._clock()
+    self._remember(key, fetched_at, data)
+    if self.store is not None:
+      await self._store_call(self.store.put, key, fetched_at, data)
+    return self._result((fetched_at, data), stale=False)
+
+  def _remember(self, key: Hashable, fetched_at: float, data: dict) -> None:
+    if self.maxsize <= 0:
+      return
+    self._entries[key] = (fetched_at, data)
+    self._entries.move_to_end(key)
+    while len(self._entries) > self.maxsize:
+      self._entries.popitem(last=False)
+
+  async def purge_store(self) -> int:
+    """Delete disk entries more than ``max_stale`` past expiry; returns the count."""
+    if self.store is None:
+      return 0
+    # fetched_at + update_interval bounds expires_at from above.
+    cutoff = self._clock() - self.update_interval - self.max_stale
+    deleted = await self._store_call(self.store.purge, cutoff) or 0
+    self.store_purged += deleted
+    return deleted
+
+  async def _store_call(self, method, *args):
+    # The disk cache is an optimisation; errors there fall back to upstream.
+    try:
+      return await asyncio.to_thread(method, *args)
+    except (sqlite3.Error, OSError, ValueError):
+      self.store_errors += 1
+      return None
+
+  def _http(self) -> httpx.AsyncClient:
+    # httpx connection pools belong to the event loop that created them.
+    loop = asyncio.get_running_loop()
+    if self._client is None or self._client.is_closed or self._client_loop is not loop:
+      self._client = httpx.AsyncClient(
+          transport=self.transport,
+          timeout=self.timeout,
+          limits=httpx.Limits(
+              max_connections=self.max_connections,
+              max_keepalive_connections=self.max_connections
+          )
+      )
+      self._client_loop = loop
+    return self._client
+
+  async def aclose(self) -> None:
+    if self._client is not None:
+      await self._client.aclose()
+      self._client = None
+      self._client_loop = None
+    if self.store is not None:
+      self.store.close()
+
+  def clear(self) -> None:
+    self._entries.clear()
+
+  def stats(self) -> dict[str, object]:
+    return {
+        "size": len(self._entries),
+        "maxsize": self.maxsize,
+        "hits": self.hits,
+        "stale_hits": self.stale_hits,
+        "disk_hits": self.disk_hits,
+        "misses": self.misses,
+        "coalesced": self.coalesced,
+        "upstream_calls": self.upstream_calls,
+        "upstream_errors": self.upstream_errors,
+        "store_errors": self.store_errors,
+        "store_purged": self.store_purged,
+        "slow_calls": self.slow_calls,
+        "budget_exceeded": self.budget_exceeded,
+        "short_circuited": self.short_circuited,
+        "inflight": len(self._inflight),
+        "breaker": self.breaker.stats(),
+    }
+
+
+@lru_cache()
+def get_weather_provider() -> WeatherProvider:
+  return WeatherProvider(
+      url=settings.weather_base_url.rstrip("/") + FORECAST_PATH,
+      grid_degrees=settings.weather_grid_degrees,
+      update_interval=settings.weather_update_interval_seconds,
+      maxsize=settings.weather_cache_size,
+      timeout=settings.weather_timeout_seconds,
+      max_connections=settings.weather_max_connections,
+      store=ForecastStore(settings.weather_cache_dir) if settings.weather_cache_dir else None,
+      max_stale=settings.weather_max_stale_seconds,
+      latency_budget=settings.weather_latency_budget_seconds,
+      refresh_lead=(
+          settings.weather_prefetch_lead_seconds if settings.weather_prefetch_enabled else 0.0
+      ),
+      breaker=CircuitBreaker(
+          failure_threshold=settings.weather_breaker_failure_threshold,
+          reset_timeout=settings.weather_breaker_reset_seconds
+      )
+  )
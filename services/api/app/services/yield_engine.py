@@ -1,20 +1,55 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from pathlib import Path
+from typing import Sequence
+
 from services.model_inference.app.heuristic_model import (
+    BATCH_COLUMNS,
     FarmerContext,
     HeuristicYieldModel,
+    YieldEstimate,
 )
+from services.model_inference.app.location_features import LocationFeatureStore
+from services.model_inference.app.remote_sensing import METADATA_FILENAME
+from services.model_inference.app.spatial_index import SpatialIndex
 
-from ..models import FarmerInput, YieldHistoryPoint, YieldPredictionResponse
+from ..core import settings
+from ..models import (
+    FarmerInput,
+    RemoteSensingSample,
+    YieldHistoryPoint,
+    YieldPredictionResponse,
+)
+from .prediction_cache import PredictionCache
 
 
 class YieldEngine:
-  """Yield estimator that wraps the shared heuristic model."""
+  """
+  Yield estimator that wraps the shared heuristic model.
 
-  def __init__(self, model: HeuristicYieldModel | None = None):
+  With a `sites` index, each prediction also names the nearest observed
+  remote-sensing sample within `sample_radius_km` of the farm.
+  """
+
+  def __init__(
+      self,
+      model: HeuristicYieldModel | None = None,
+      cache: PredictionCache | None = None,
+      sites: SpatialIndex | None = None,
+      sample_radius_km: float = 50.0
+  ):
     self.model = model or HeuristicYieldModel()
+    self.cache = cache
+    self.sites = sites
+    self.sample_radius_km = sample_radius_km
 
   def predict(self, farmer: FarmerInput) -> YieldPredictionResponse:
+    if self.cache is not None:
+      return self.cache.get_or_compute(farmer, self._predict)
+    return self._predict(farmer)
+
+  def _predict(self, farmer: FarmerInput) -> YieldPredictionResponse:
     context = FarmerContext(
         latitude=farmer.latitude,
         longitude=farmer.longitude,
@@ -28,8 +63,50 @@ class YieldEngine:
         sowing_date=farmer.sowing_date
     )
 
-    estimate = self.model.predict(context)
+    return self._to_response(
+        self.model.predict(context),
+        self.nearest_sample(farmer.latitude, farmer.longitude)
+    )
+
+  def predict_batch(
+      self, farmers: Sequence[FarmerInput]
+  ) -> list[YieldPredictionResponse]:
+    """Score several validated inputs through the vectorized model path."""
+    if not farmers:
+      return []
+    if self.cache is not None:
+      # Same answers as single predictions, which are scored at cache precision.
+      farmers = [self.cache.quantize(farmer) for farmer in farmers]
+    columns = {
+        name: [getattr(farmer, name) for farmer in farmers]
+        for name in BATCH_COLUMNS
+    }
+    batch = self.model.predict_batch(columns)
+    return [
+        self._to_response(
+            estimate, self.nearest_sample(farmer.latitude, farmer.longitude)
+        )
+        for estimate, farmer in zip(batch.estimates(), farmers)
+    ]
 
+  def nearest_sample(
+      self, latitude: float, longitude: float
+  ) -> RemoteSensingSample | None:
+    if self.sites is None:
+      return None
+    ids, distances = self.sites.query_radius(
+        latitude, longitude, self.sample_radius_km
+    )
+    if not len(ids):
+      return None
+    return RemoteSensingSample(
+        location_id=int(ids[0]), distance_km=round(float(distances[0]), 3)
+    )
+
+  @staticmethod
+  def _to_response(
+      estimate: YieldEstimate, sample: RemoteSensingSample | None = None
+  ) -> YieldPredictionResponse:
     history = [
         YieldHistoryPoint(season=season, yield_t_per_ha=value)
         for season, value in estimate.history
@@ -42,6 +119,44 @@ class YieldEngine:
         historical_yields=history,
         risk_alerts=set(estimate.risks),
         recommended_practices=estimate.practices,
-        weather_outlook=estimate.weather
+        weather_outlook=estimate.weather,
+        nearest_sample=sample
     )
 
+
+@lru_cache()
+def get_yield_engine() -> YieldEngine:
+  """Process-wide engine; built once at startup and shared by all requests."""
+  cache = None
+  if settings.prediction_cache_size > 0:
+    cache = PredictionCache(
+        maxsize=settings.prediction_cache_size,
+        coordinate_decimals=settings.prediction_cache_coordinate_decimals,
+        rainfall_decimals=settings.prediction_cache_rainfall_decimals,
+        fertilizer_decimals=settings.prediction_cache_fertilizer_decimals
+    )
+  model = HeuristicYieldModel(
+      features=LocationFeatureStore(settings.model_data_path)
+  )
+  return YieldEngine(
+      model=model,
+      cache=cache,
+      sites=get_spatial_index(),
+      sample_radius_km=settings.remote_sensing_sample_radius_km
+  )
+
+
+@lru_cache()
+def get_spatial_index() -> SpatialIndex | None:
+  """
+  Index over the remote-sensing sample sites under `model_data_path`.
+
+  Loaded from the saved index, rebuilt when the metadata is newer; None when
+  there is no sample archive to index.
+  """
+  data_path = Path(settings.model_data_path)
+  if not (data_path / METADATA_FILENAME).exists():
+    return None
+  return SpatialIndex.open_or_build(
+      data_path, METADATA_FILENAME, settings.spatial_index_cell_degrees
+  )
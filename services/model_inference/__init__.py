@@ -1,4 +1,3 @@
-from .app.heuristic_model import HeuristicYieldModel, FarmerContext, YieldEstimate
-
-__all__ = ["HeuristicYieldModel", "FarmerContext", "YieldEstimate"]
+from .app.heuristic_model import HeuristicYieldModel, FarmerContext, YieldBatch, YieldEstimate
 
+__all__ = ["HeuristicYieldModel", "FarmerContext", "YieldEstimate", "YieldBatch"]
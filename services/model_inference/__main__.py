@@ -0,0 +1,87 @@
+"""Offline tooling for the model inference package.
+
+    python -m services.model_inference build-features data/processed
+    python -m services.model_inference build-spatial-index data/processed
+    python -m services.model_inference convert-cubes data/processed data/processed/cube_store
+    python -m services.model_inference featurize data/processed data/processed/features.npy
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from .app.cube_store import ENCODINGS, ChunkedCubeStore
+from .app.featurize import DEFAULT_CHUNK_SAMPLES, SharedMemoryFeaturizer
+from .app.location_features import LocationFeatureStore
+from .app.remote_sensing import CUBE_FILENAME, METADATA_FILENAME, RemoteSensingDataset
+from .app.spatial_index import INDEX_FILENAME, SpatialIndex
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(prog="python -m services.model_inference")
+  commands = parser.add_subparsers(dest="command", required=True)
+
+  features = commands.add_parser(
+      "build-features", help="Build the memory-mapped location feature store."
+  )
+  features.add_argument("data_path", help="Directory to write location_features/ into")
+  features.add_argument("--cell-degrees", type=float, default=0.001)
+
+  spatial = commands.add_parser(
+      "build-spatial-index",
+      help=f"Build {INDEX_FILENAME} over the remote-sensing metadata coordinates."
+  )
+  spatial.add_argument("data_path", help="Directory holding the metadata parquet")
+  spatial.add_argument("--metadata", default=METADATA_FILENAME)
+  spatial.add_argument("--cell-degrees", type=float, default=0.5)
+
+  convert = commands.add_parser(
+      "convert-cubes", help="Rewrite the cube and metadata as a chunked store."
+  )
+  convert.add_argument("data_path", help="Directory holding the cube and metadata")
+  convert.add_argument("out_dir", help="Directory to write the chunked store into")
+  convert.add_argument("--samples-per-chunk", type=int, default=4096)
+  convert.add_argument("--timesteps-per-chunk", type=int, default=4)
+  convert.add_argument("--encoding", choices=ENCODINGS, default="float32")
+  convert.add_argument("--scale", type=float, default=1e-4)
+
+  featurize = commands.add_parser(
+      "featurize",
+      help="Compute per-sample vegetation-index statistics on every core."
+  )
+  featurize.add_argument("data_path", help="Directory holding the cube")
+  featurize.add_argument("out", help="(samples, features) float32 .npy to write, in cube order")
+  featurize.add_argument("--cube", default=CUBE_FILENAME)
+  featurize.add_argument("--workers", type=int, default=0, help="0 uses every CPU")
+  featurize.add_argument("--chunk-samples", type=int, default=DEFAULT_CHUNK_SAMPLES)
+
+  args = parser.parse_args()
+  if args.command == "build-features":
+    store = LocationFeatureStore.build(args.data_path, args.cell_degrees)
+    print(f"Wrote {store.path}")
+  elif args.command == "build-spatial-index":
+    index = SpatialIndex.open_or_build(
+        args.data_path, args.metadata, args.cell_degrees
+    )
+    print(f"Indexed {len(index)} samples into {args.data_path}/{INDEX_FILENAME}")
+  elif args.command == "convert-cubes":
+    store = ChunkedCubeStore.convert(
+        RemoteSensingDataset.open(args.data_path, block_samples=args.samples_per_chunk),
+        args.out_dir,
+        samples_per_chunk=args.samples_per_chunk,
+        timesteps_per_chunk=args.timesteps_per_chunk,
+        encoding=args.encoding,
+        scale=args.scale
+    )
+    print(f"Wrote {store.samples} samples to {store.path} ({store.encoding})")
+  elif args.command == "featurize":
+    cubes = np.load(Path(args.data_path) / args.cube, mmap_mode="r")
+    result = SharedMemoryFeaturizer(args.workers, args.chunk_samples).run(cubes, args.out)
+    print(result.report())
+    print(f"Columns: {', '.join(result.columns)}")
+
+
+if __name__ == "__main__":
+  main()
@@ -1,4 +1,45 @@
-from .heuristic_model import FarmerContext, HeuristicYieldModel, YieldEstimate
-
-__all__ = ["HeuristicYieldModel", "FarmerContext", "YieldEstimate"]
+from .cube_store import ChunkedCubeStore, CubeSelection
+from .executor import (
+    AnomalyScore,
+    ChunkedExecutor,
+    Extrema,
+    HistogramPercentiles,
+    MapKernel,
+    Moments,
+    Reduction,
+    RollingMean,
+)
+from .featurize import FeaturizationResult, SharedMemoryFeaturizer, WorkerTiming
+from .heuristic_model import (
+    CoefficientTables,
+    FarmerContext,
+    HeuristicYieldModel,
+    YieldBatch,
+    YieldEstimate,
+)
+from .remote_sensing import BandLayout, RemoteSensingDataset
+from .spatial_index import SpatialIndex
 
+__all__ = [
+    "HeuristicYieldModel",
+    "FarmerContext",
+    "YieldEstimate",
+    "YieldBatch",
+    "CoefficientTables",
+    "RemoteSensingDataset",
+    "BandLayout",
+    "SpatialIndex",
+    "ChunkedCubeStore",
+    "CubeSelection",
+    "ChunkedExecutor",
+    "MapKernel",
+    "Reduction",
+    "Moments",
+    "Extrema",
+    "HistogramPercentiles",
+    "RollingMean",
+    "AnomalyScore",
+    "SharedMemoryFeaturizer",
+    "FeaturizationResult",
+    "WorkerTiming",
+]
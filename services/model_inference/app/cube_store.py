@@ -0,0 +1,296 @@
+"""Chunked on-disk storage for remote-sensing cubes with pushdown queries.
+
+A store is a directory::
+
+    cube_store/
+      meta.json          layout, encoding and band count
+      index.parquet      one row per chunk: sample/time ranges, date and bbox bounds
+      samples.parquet    sample metadata in store order, one row group per sample block
+      chunks/s00000_t000.npy ...
+
+Samples are ordered along a Z-order curve of their coordinates before being
+cut into blocks of ``samples_per_chunk``, so each block covers a compact
+region. Each block is further cut into windows of ``timesteps_per_chunk``
+acquisitions. A chunk is stored band-major, ``(bands, samples, timesteps)``,
+so reading a subset of bands reads contiguous slabs.
+
+Queries on acquisition date and region are evaluated against the chunk
+index first; only the chunks whose bounds intersect the query are opened.
+
+Encodings:
+
+* ``float32``: values as stored in the source cube;
+* ``float16``: half precision, half the disk and page-cache footprint;
+* ``delta``: values quantized to ``scale`` and stored as int16 differences
+  along the time axis (first value absolute), decoded with a cumulative sum.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from .remote_sensing import RemoteSensingDataset
+
+STORE_VERSION = 1
+ENCODINGS = ("float32", "float16", "delta")
+DEFAULT_TIMESTEP_DAYS = 10
+
+
+def morton_order(latitude: np.ndarray, longitude: np.ndarray) -> np.ndarray:
+  """Positions that sort coordinates along a 16-bit-per-axis Z-order curve."""
+
+  def spread(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.uint64) & 0xFFFF
+    values = (values | (values << 8)) & 0x00FF00FF
+    values = (values | (values << 4)) & 0x0F0F0F0F
+    values = (values | (values << 2)) & 0x33333333
+    return (values | (values << 1)) & 0x55555555
+
+  lat = np.clip((np.asarray(latitude) + 90) / 180 * 0xFFFF, 0, 0xFFFF)
+  lon = np.clip((np.asarray(longitude) + 180) / 360 * 0xFFFF, 0, 0xFFFF)
+  codes = spread(lat) | (spread(lon) << np.uint64(1))
+  return np.argsort(codes, kind="stable")
+
+
+def encode_chunk(block: np.ndarray, encoding: str, scale: float) -> np.ndarray:
+  """Encode a ``(samples, timesteps, bands)`` block as ``(bands, samples, timesteps)``."""
+  values = np.ascontiguousarray(np.moveaxis(block, -1, 0))
+  if encoding == "float32":
+    return values.astype(np.float32, copy=False)
+  if encoding == "float16":
+    return values.astype(np.float16)
+  if encoding == "delta":
+    quantized = np.rint(values / scale).astype(np.int32)
+    deltas = np.diff(quantized, axis=-1, prepend=0)
+    if deltas.min() < np.iinfo(np.int16).min or deltas.max() > np.iinfo(np.int16).max:
+      raise ValueError("Values overflow int16 deltas; use a coarser scale")
+    return deltas.astype(np.int16)
+  raise ValueError(f"Unknown encoding: {encoding}")
+
+
+def decode_chunk(chunk: np.ndarray, encoding: str, scale: float) -> np.ndarray:
+  """Decode a ``(bands, samples, timesteps)`` chunk to float32, same layout."""
+  if encoding == "delta":
+    return (np.cumsum(chunk, axis=-1, dtype=np.int32) * scale).astype(np.float32)
+  return chunk.astype(np.float32, copy=False)
+
+
+@dataclass
+class CubeSelection:
+  """Samples and acquisitions matching a `ChunkedCubeStore.query`.
+
+  ``cubes`` is ``(samples, timesteps, bands)`` over the time range
+  ``[time_start, time_start + timesteps)``; timesteps whose chunk was not
+  selected for a sample's block are NaN.
+  """
+
+  metadata: object
+  cubes: np.ndarray
+  time_start: int
+  bands: tuple[int, ...]
+  timestep_days: int
+
+  def acquisition_dates(self) -> np.ndarray:
+    planting = self.metadata.column("planting_date").to_numpy().astype("datetime64[D]")
+    steps = np.arange(self.time_start, self.time_start + self.cubes.shape[1])
+    return planting[:, None] + (steps * self.timestep_days).astype("timedelta64[D]")
+
+
+class ChunkedCubeStore:
+  """Reader for a chunked cube directory written by `convert`."""
+
+  def __init__(self, path: str | Path):
+    self.path = Path(path)
+    meta = json.loads((self.path / "meta.json").read_text())
+    if meta.get("version") != STORE_VERSION:
+      raise ValueError(f"Unsupported cube store version: {meta.get('version')}")
+    self.encoding: str = meta["encoding"]
+    self.scale: float = meta["scale"]
+    self.samples: int = meta["samples"]
+    self.timesteps: int = meta["timesteps"]
+    self.bands: int = meta["bands"]
+    self.samples_per_chunk: int = meta["samples_per_chunk"]
+    self.timesteps_per_chunk: int = meta["timesteps_per_chunk"]
+    self.timestep_days: int = meta["timestep_days"]
+
+  @classmethod
+  def convert(
+      cls,
+      dataset: RemoteSensingDataset,
+      out_dir: str | Path,
+      samples_per_chunk: int = 4096,
+      timesteps_per_chunk: int = 4,
+      encoding: str = "float32",
+      scale: float = 1e-4,
+      timestep_days: int = DEFAULT_TIMESTEP_DAYS
+  ) -> ChunkedCubeStore:
+    """Write `dataset` as a chunked store, streaming one sample block at a time."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    if encoding not in ENCODINGS:
+      raise ValueError(f"Unknown encoding: {encoding}")
+    out_dir = Path(out_dir)
+    (out_dir / "chunks").mkdir(parents=True, exist_ok=True)
+
+    metadata = dataset.metadata
+    if metadata.schema.field("planting_date").type != pa.date32():
+      metadata = metadata.set_column(
+          metadata.schema.get_field_index("planting_date"),
+          "planting_date",
+          pc.cast(metadata.column("planting_date"), pa.date32())
+      )
+    order = morton_order(
+        metadata.column("latitude").to_numpy(), metadata.column("longitude").to_numpy()
+    )
+    metadata = metadata.take(pa.array(order))
+    metadata = metadata.append_column(
+        "sample_row", pa.array(np.arange(metadata.num_rows, dtype=np.int64))
+    )
+    ordered = RemoteSensingDataset(
+        dataset.cubes, metadata, block_samples=samples_per_chunk
+    )
+    _, timesteps, bands = dataset.shape
+
+    latitude = metadata.column("latitude").to_numpy()
+    longitude = metadata.column("longitude").to_numpy()
+    planting = metadata.column("planting_date").to_numpy().astype("datetime64[D]")
+
+    index_rows: list[dict] = []
+    for block_number, (rows, block) in enumerate(ordered.blocks()):
+      for time_start in range(0, timesteps, timesteps_per_chunk):
+        time_stop = min(time_start + timesteps_per_chunk, timesteps)
+        name = f"s{block_number:05d}_t{time_start:03d}.npy"
+        chunk = encode_chunk(block[:, time_start:time_stop], encoding, scale)
+        np.save(out_dir / "chunks" / name, chunk)
+        first = planting[rows] + np.timedelta64(time_start * timestep_days, "D")
+        last = planting[rows] + np.timedelta64((time_stop - 1) * timestep_days, "D")
+        index_rows.append({
+            "file": name,
+            "sample_start": rows.start,
+            "sample_stop": rows.stop,
+            "time_start": time_start,
+            "time_stop": time_stop,
+            "date_min": first.min().astype(object),
+            "date_max": last.max().astype(object),
+            "lat_min": float(latitude[rows].min()),
+            "lat_max": float(latitude[rows].max()),
+            "lon_min": float(longitude[rows].min()),
+            "lon_max": float(longitude[rows].max()),
+        })
+
+    pq.write_table(pa.Table.from_pylist(index_rows), out_dir / "index.parquet")
+    pq.write_table(metadata, out_dir / "samples.parquet", row_group_size=samples_per_chunk)
+    (out_dir / "meta.json").write_text(json.dumps({
+        "version": STORE_VERSION,
+        "encoding": encoding,
+        "scale": scale,
+        "samples": metadata.num_rows,
+        "timesteps": timesteps,
+        "bands": bands,
+        "samples_per_chunk": samples_per_chunk,
+        "timesteps_per_chunk": timesteps_per_chunk,
+        "timestep_days": timestep_days,
+    }))
+    return cls(out_dir)
+
+  def chunk_index(
+      self,
+      date_from: date | None = None,
+      date_to: date | None = None,
+      bbox: tuple[float, float, float, float] | None = None
+  ):
+    """Chunk rows whose date range and bounding box intersect the query.
+
+    ``bbox`` is ``(lat_min, lon_min, lat_max, lon_max)``.
+    """
+    import pyarrow.parquet as pq
+
+    filters = []
+    if date_from is not None:
+      filters.append(("date_max", ">=", date_from))
+    if date_to is not None:
+      filters.append(("date_min", "<=", date_to))
+    if bbox is not None:
+      lat_min, lon_min, lat_max, lon_max = bbox
+      filters += [
+          ("lat_max", ">=", lat_min), ("lat_min", "<=", lat_max),
+          ("lon_max", ">=", lon_min), ("lon_min", "<=", lon_max),
+      ]
+    return pq.read_table(self.path / "index.parquet", filters=filters or None)
+
+  def query(
+      self,
+      date_from: date | None = None,
+      date_to: date | None = None,
+      bbox: tuple[float, float, float, float] | None = None,
+      bands: Sequence[int] | None = None
+  ) -> CubeSelection:
+    """Load the samples and timesteps matching an acquisition-date range and region."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    bands = tuple(range(self.bands)) if bands is None else tuple(bands)
+    chunks = self.chunk_index(date_from, date_to, bbox).to_pylist()
+    if not chunks:
+      empty = pq.read_table(self.path / "samples.parquet").slice(0, 0)
+      return CubeSelection(
+          empty, np.empty((0, 0, len(bands)), np.float32), 0, bands, self.timestep_days
+      )
+
+    time_start = min(chunk["time_start"] for chunk in chunks)
+    time_stop = max(chunk["time_stop"] for chunk in chunks)
+    blocks = sorted({(chunk["sample_start"], chunk["sample_stop"]) for chunk in chunks})
+    block_offset = {}
+    total = 0
+    for start, stop in blocks:
+      block_offset[start] = total
+      total += stop - start
+
+    cubes = np.full((total, time_stop - time_start, len(bands)), np.nan, np.float32)
+    band_index = list(bands)
+    for chunk in chunks:
+      stored = np.load(self.path / "chunks" / chunk["file"], mmap_mode="r")
+      values = decode_chunk(stored[band_index], self.encoding, self.scale)
+      offset = block_offset[chunk["sample_start"]]
+      size = chunk["sample_stop"] - chunk["sample_start"]
+      cubes[offset:offset + size, chunk["time_start"] - time_start:
+            chunk["time_stop"] - time_start] = np.moveaxis(values, 0, -1)
+
+    filters = [[
+        ("sample_row", ">=", start), ("sample_row", "<", stop)
+    ] for start, stop in blocks]
+    metadata = pq.read_table(self.path / "samples.parquet", filters=filters)
+    rows = metadata.column("sample_row").to_numpy()
+    starts = np.array([start for start, _ in blocks])
+    offsets = np.array([block_offset[start] for start in starts])
+    block_of_row = np.searchsorted(starts, rows, side="right") - 1
+    cubes = cubes[rows - starts[block_of_row] + offsets[block_of_row]]
+
+    keep = np.ones(len(rows), dtype=bool)
+    if bbox is not None:
+      lat_min, lon_min, lat_max, lon_max = bbox
+      latitude = metadata.column("latitude").to_numpy()
+      longitude = metadata.column("longitude").to_numpy()
+      keep &= (latitude >= lat_min) & (latitude <= lat_max)
+      keep &= (longitude >= lon_min) & (longitude <= lon_max)
+    if date_from is not None or date_to is not None:
+      dates = CubeSelection(
+          metadata, cubes, time_start, bands, self.timestep_days
+      ).acquisition_dates()
+      in_range = ~np.isnan(cubes).all(axis=-1)
+      if date_from is not None:
+        in_range &= dates >= np.datetime64(date_from, "D")
+      if date_to is not None:
+        in_range &= dates <= np.datetime64(date_to, "D")
+      keep &= in_range.any(axis=1)
+    if not keep.all():
+      metadata = metadata.filter(pa.array(keep))
+      cubes = cubes[keep]
+    return CubeSelection(metadata, cubes, time_start, bands, self.timestep_days)
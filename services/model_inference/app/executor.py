@@ -0,0 +1,359 @@
+"""Out-of-core executor for NumPy kernels over memory-mapped cubes.
+
+The source array is split along its first (sample) axis into chunks sized so
+that the chunks in flight, times a per-chunk working-memory factor, stay
+within ``memory_limit_bytes``. Two kinds of kernel are supported:
+
+* map kernels turn each chunk into an output chunk with the same leading
+  axis (rolling windows, per-sample anomaly scores, ...); outputs are written
+  into a preallocated array or ``.npy`` memmap;
+* reductions turn each chunk into a small mergeable partial result that is
+  combined across chunks and finalized once (moments, extrema, percentiles).
+
+With ``workers > 1`` chunks run on a process pool. Workers reopen memmapped
+sources from their file, so only chunk bounds are sent to them.
+"""
+from __future__ import annotations
+
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+__all__ = [
+    "AnomalyScore",
+    "ChunkedExecutor",
+    "DEFAULT_MEMORY_LIMIT",
+    "Extrema",
+    "HistogramPercentiles",
+    "MapKernel",
+    "MemmapSource",
+    "Moments",
+    "Reduction",
+    "RollingMean",
+    "memmap_source",
+]
+
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+
+
+class MapKernel(ABC):
+  """Per-chunk transform; ``__call__`` must keep the leading axis length."""
+
+  def output_shape(self, shape: tuple[int, ...]) -> tuple[int, ...]:
+    return shape
+
+  def output_dtype(self, dtype: np.dtype) -> np.dtype:
+    return np.dtype(np.float32)
+
+  @abstractmethod
+  def __call__(self, block: np.ndarray) -> np.ndarray:
+    ...
+
+
+class Reduction(ABC):
+  """Mergeable reduction over the leading axis."""
+
+  @abstractmethod
+  def partial(self, block: np.ndarray) -> Any:
+    ...
+
+  @abstractmethod
+  def combine(self, left: Any, right: Any) -> Any:
+    ...
+
+  def finalize(self, state: Any) -> Any:
+    return state
+
+
+@dataclass(frozen=True)
+class Moments(Reduction):
+  """Count, mean, variance and std per element, ignoring NaN.
+
+  Partials are merged with Chan et al.'s pairwise update, so the result
+  does not depend on how the array was chunked beyond rounding.
+  """
+
+  ddof: int = 0
+
+  def partial(self, block: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    values = block.astype(np.float64)
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0)
+    total = np.where(valid, values, 0).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+      mean = np.where(count > 0, total / count, 0.0)
+    m2 = np.where(valid, (values - mean) ** 2, 0).sum(axis=0)
+    return count, mean, m2
+
+  def combine(self, left, right):
+    count_a, mean_a, m2_a = left
+    count_b, mean_b, m2_b = right
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    with np.errstate(invalid="ignore", divide="ignore"):
+      mean = np.where(count > 0, mean_a + delta * count_b / count, 0.0)
+      m2 = m2_a + m2_b + np.where(count > 0, delta ** 2 * count_a * count_b / count, 0.0)
+    return count, mean, m2
+
+  def finalize(self, state) -> dict[str, np.ndarray]:
+    count, mean, m2 = state
+    with np.errstate(invalid="ignore", divide="ignore"):
+      variance = np.where(count > self.ddof, m2 / (count - self.ddof), np.nan)
+    return {
+        "count": count,
+        "mean": np.where(count > 0, mean, np.nan),
+        "var": variance,
+        "std": np.sqrt(variance),
+    }
+
+
+@dataclass(frozen=True)
+class Extrema(Reduction):
+  """Element-wise min and max, ignoring NaN."""
+
+  def partial(self, block: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    values = block.astype(np.float64)
+    return (
+        np.where(np.isnan(values), np.inf, values).min(axis=0),
+        np.where(np.isnan(values), -np.inf, values).max(axis=0),
+    )
+
+  def combine(self, left, right):
+    return np.minimum(left[0], right[0]), np.maximum(left[1], right[1])
+
+  def finalize(self, state) -> dict[str, np.ndarray]:
+    low, high = state
+    return {
+        "min": np.where(np.isinf(low), np.nan, low),
+        "max": np.where(np.isinf(high), np.nan, high),
+    }
+
+
+@dataclass(frozen=True)
+class HistogramPercentiles(Reduction):
+  """Element-wise percentiles from fixed-bin histograms.
+
+  Exact percentiles would need every value in memory at once; histograms
+  merge by addition instead, and the answer is within one bin width
+  ``(high - low) / bins`` of the exact one for values inside the range.
+  """
+
+  q: tuple[float, ...] = (5.0, 50.0, 95.0)
+  low: float = 0.0
+  high: float = 1.0
+  bins: int = 1024
+
+  def partial(self, block: np.ndarray) -> np.ndarray:
+    values = block.astype(np.float64)
+    valid = ~np.isnan(values)
+    scaled = (np.where(valid, values, self.low) - self.low) / (self.high - self.low)
+    # Out-of-range values are clamped into the first or last bin.
+    bins = np.clip(np.floor(scaled * self.bins), 0, self.bins - 1).astype(np.int64)
+    element = np.arange(int(np.prod(values.shape[1:]))).reshape(values.shape[1:])
+    flat = (bins * element.size + element)[valid]
+    counts = np.bincount(flat, minlength=self.bins * element.size)
+    return counts.reshape((self.bins,) + values.shape[1:])
+
+  def combine(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    return left + right
+
+  def finalize(self, state: np.ndarray) -> dict[float, np.ndarray]:
+    cumulative = np.cumsum(state, axis=0)
+    total = cumulative[-1]
+    width = (self.high - self.low) / self.bins
+    result = {}
+    for q in self.q:
+      target = q / 100 * total
+      position = (cumulative < target[None]).sum(axis=0)
+      position = np.minimum(position, self.bins - 1)
+      below = np.where(
+          position > 0,
+          np.take_along_axis(cumulative, np.maximum(position - 1, 0)[None], 0)[0],
+          0
+      )
+      in_bin = np.take_along_axis(state, position[None], 0)[0]
+      with np.errstate(invalid="ignore", divide="ignore"):
+        fraction = np.where(in_bin > 0, (target - below) / in_bin, 0.5)
+      value = self.low + (position + fraction) * width
+      result[q] = np.where(total > 0, value, np.nan)
+    return result
+
+
+@dataclass(frozen=True)
+class RollingMean(MapKernel):
+  """Trailing mean over ``window`` steps along ``axis`` (NaN until full)."""
+
+  window: int = 3
+  axis: int = 1
+
+  def __call__(self, block: np.ndarray) -> np.ndarray:
+    values = np.moveaxis(block.astype(np.float64), self.axis, -1)
+    missing = np.isnan(values)
+    # Window sums from running totals; NaN is tracked separately so a gap only
+    # blanks the windows that contain it instead of everything after it.
+    sums = self._window_sums(np.where(missing, 0.0, values))
+    gaps = self._window_sums(missing.astype(np.float64))
+    result = np.where(gaps > 0, np.nan, sums / self.window)
+    return np.moveaxis(result, -1, self.axis).astype(np.float32)
+
+  def _window_sums(self, values: np.ndarray) -> np.ndarray:
+    cumulative = np.cumsum(values, axis=-1)
+    sums = np.full(values.shape, np.nan)
+    sums[..., self.window - 1:] = cumulative[..., self.window - 1:]
+    sums[..., self.window:] -= cumulative[..., :-self.window]
+    return sums
+
+
+@dataclass(frozen=True)
+class AnomalyScore(MapKernel):
+  """Z-score of every value against reference ``mean`` and ``std`` arrays.
+
+  The reference is usually the finalized output of a `Moments` pass over the
+  same source, which makes anomaly scoring a two-pass out-of-core job.
+  """
+
+  mean: np.ndarray
+  std: np.ndarray
+
+  def __call__(self, block: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+      score = (block - self.mean) / self.std
+    return np.where(self.std > 0, score, 0).astype(np.float32)
+
+
+@dataclass(frozen=True)
+class MemmapSource:
+  """Picklable description of a memmapped ``.npy`` array."""
+
+  filename: str
+  dtype: str
+  shape: tuple[int, ...]
+  offset: int
+  order: str
+
+  def open(self) -> np.ndarray:
+    return np.memmap(
+        self.filename, dtype=self.dtype, mode="r",
+        offset=self.offset, shape=self.shape, order=self.order
+    )
+
+
+def memmap_source(array: np.ndarray) -> MemmapSource | None:
+  """Describe a contiguous file-backed memmap so another process can reopen it."""
+  if isinstance(array, np.memmap) and array.filename and (
+      array.flags.c_contiguous or array.flags.f_contiguous
+  ):
+    return MemmapSource(
+        array.filename, array.dtype.str, array.shape, _file_offset(array),
+        "C" if array.flags.c_contiguous else "F"
+    )
+  return None
+
+
+def _file_offset(array: np.memmap) -> int:
+  # Views (``m[10:]``) inherit their parent's ``offset``; the position in the
+  # file is the mapped root's offset plus how far into it the view starts.
+  root = array
+  while isinstance(root.base, np.memmap):
+    root = root.base
+  return root.offset + (array.ctypes.data - root.ctypes.data)
+
+
+def _run_chunk(source: MemmapSource | np.ndarray, start: int, stop: int, kernel, reduce: bool):
+  array = source.open() if isinstance(source, MemmapSource) else source
+  block = np.asarray(array[start:stop])
+  return kernel.partial(block) if reduce else kernel(block)
+
+
+class ChunkedExecutor:
+  """Run map kernels and reductions over an array in bounded-memory chunks.
+
+  ``working_set_factor`` is how many chunk-sized buffers one kernel call is
+  assumed to need (input copy, float64 promotion, temporaries, output).
+  ``workers=0`` uses one process per CPU.
+  """
+
+  def __init__(
+      self,
+      memory_limit_bytes: int = DEFAULT_MEMORY_LIMIT,
+      workers: int = 1,
+      working_set_factor: float = 4.0,
+      chunk_rows: int | None = None
+  ):
+    self.memory_limit_bytes = memory_limit_bytes
+    self.workers = max(1, workers or os.cpu_count() or 1)
+    self.working_set_factor = working_set_factor
+    self.chunk_rows = chunk_rows
+
+  @property
+  def in_flight(self) -> int:
+    return 1 if self.workers == 1 else 2 * self.workers
+
+  def rows_per_chunk(self, array: np.ndarray) -> int:
+    if self.chunk_rows is not None:
+      return self.chunk_rows
+    row_bytes = int(np.prod(array.shape[1:], dtype=np.int64)) * 8
+    budget = self.memory_limit_bytes / (self.in_flight * self.working_set_factor)
+    return max(1, int(budget // max(row_bytes, 1)))
+
+  def chunks(self, array: np.ndarray) -> Iterator[tuple[int, int]]:
+    rows = self.rows_per_chunk(array)
+    for start in range(0, array.shape[0], rows):
+      yield start, min(start + rows, array.shape[0])
+
+  def map(
+      self,
+      array: np.ndarray,
+      kernel: MapKernel,
+      out: np.ndarray | str | Path | None = None
+  ) -> np.ndarray:
+    """Apply ``kernel`` chunk by chunk into ``out`` (array, ``.npy`` path or new)."""
+    shape = kernel.output_shape(array.shape)
+    dtype = kernel.output_dtype(array.dtype)
+    if out is None:
+      out = np.empty(shape, dtype=dtype)
+    elif isinstance(out, (str, Path)):
+      out = np.lib.format.open_memmap(out, mode="w+", dtype=dtype, shape=shape)
+    for (start, stop), result in self._execute(array, kernel, reduce=False):
+      out[start:stop] = result
+    if isinstance(out, np.memmap):
+      out.flush()
+    return out
+
+  def reduce(self, array: np.ndarray, reduction: Reduction) -> Any:
+    """Combine per-chunk partials of ``reduction`` in chunk order and finalize."""
+    state = None
+    for _, partial in self._execute(array, reduction, reduce=True):
+      state = partial if state is None else reduction.combine(state, partial)
+    if state is None:
+      raise ValueError("Cannot reduce an empty array")
+    return reduction.finalize(state)
+
+  def _execute(self, array: np.ndarray, kernel, reduce: bool):
+    bounds = list(self.chunks(array))
+    if self.workers == 1:
+      for start, stop in bounds:
+        yield (start, stop), _run_chunk(array, start, stop, kernel, reduce)
+      return
+
+    source = memmap_source(array)
+    if source is None:
+      raise ValueError("Process-pool execution needs a file-backed np.memmap source")
+    with ProcessPoolExecutor(max_workers=self.workers) as pool:
+      pending: list[tuple[tuple[int, int], Future]] = []
+      for start, stop in bounds:
+        pending.append(
+            ((start, stop), pool.submit(_run_chunk, source, start, stop, kernel, reduce))
+        )
+        # Results are consumed in submission order, which keeps reductions
+        # deterministic and caps the number of chunks alive at once.
+        if len(pending) >= self.in_flight:
+          chunk, future = pending.pop(0)
+          yield chunk, future.result()
+      for chunk, future in pending:
+        yield chunk, future.result()
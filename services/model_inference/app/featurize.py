@@ -0,0 +1,244 @@
+"""Multi-process featurization of remote-sensing cubes over shared memory.
+
+The cube is never pickled. A file-backed memmap is reopened by every worker
+from its ``.npy`` file, so all processes read the same page cache; any other
+array is copied once into a `multiprocessing.shared_memory` block that the
+workers attach to. The ``(samples, features)`` output is preallocated the
+same way, either as a ``.npy`` memmap or as a shared-memory block, and each
+worker writes its rows in place. Tasks are ``(start, stop)`` sample ranges.
+
+Each row holds the `temporal_statistics` of every requested vegetation index,
+in the column order given by `feature_columns`.
+"""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+
+from .executor import MemmapSource, memmap_source
+from .remote_sensing import (
+    VEGETATION_INDICES,
+    BandLayout,
+    temporal_statistics,
+    vegetation_indices,
+)
+
+STATISTICS = ("mean", "std", "min", "max", "amplitude", "peak_step", "slope")
+DEFAULT_CHUNK_SAMPLES = 2048
+
+
+def feature_columns(names: tuple[str, ...] | None = None) -> tuple[str, ...]:
+  return tuple(
+      f"{name}_{stat}"
+      for name in (names or tuple(VEGETATION_INDICES))
+      for stat in STATISTICS
+  )
+
+
+def featurize_block(
+    block: np.ndarray,
+    layout: BandLayout = BandLayout(),
+    names: tuple[str, ...] | None = None
+) -> np.ndarray:
+  """``(samples, features)`` float32 rows for a ``(samples, timesteps, bands)`` block."""
+  names = names or tuple(VEGETATION_INDICES)
+  series = vegetation_indices(block, layout, names)
+  columns = [
+      temporal_statistics(series[name])[stat]
+      for name in names
+      for stat in STATISTICS
+  ]
+  return np.stack(columns, axis=1).astype(np.float32)
+
+
+@dataclass(frozen=True)
+class _SharedArray:
+  """Picklable handle to an array in a named shared-memory block."""
+
+  name: str
+  dtype: str
+  shape: tuple[int, ...]
+
+  def attach(self) -> tuple[shared_memory.SharedMemory, np.ndarray]:
+    block = shared_memory.SharedMemory(name=self.name)
+    return block, np.ndarray(self.shape, dtype=self.dtype, buffer=block.buf)
+
+
+def _share(array: np.ndarray) -> tuple[shared_memory.SharedMemory, _SharedArray]:
+  block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+  handle = _SharedArray(block.name, array.dtype.str, array.shape)
+  np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+  return block, handle
+
+
+def _open(handle: MemmapSource | _SharedArray, writable: bool = False):
+  if isinstance(handle, _SharedArray):
+    return handle.attach()
+  if writable:
+    return None, np.memmap(
+        handle.filename, dtype=handle.dtype, mode="r+",
+        offset=handle.offset, shape=handle.shape, order=handle.order
+    )
+  return None, handle.open()
+
+
+# Per-process state set by `_init_worker`, so tasks only carry sample ranges.
+_worker: dict = {}
+
+
+def _init_worker(source, output, layout: BandLayout, names: tuple[str, ...]) -> None:
+  source_block, cubes = _open(source)
+  output_block, out = _open(output, writable=True)
+  _worker.update(
+      cubes=cubes, out=out, layout=layout, names=names,
+      # Keep the shared-memory objects alive as long as the views over them.
+      blocks=(source_block, output_block)
+  )
+
+
+def _featurize_range(start: int, stop: int) -> tuple[int, int, float]:
+  began = time.perf_counter()
+  block = np.asarray(_worker["cubes"][start:stop])
+  _worker["out"][start:stop] = featurize_block(block, _worker["layout"], _worker["names"])
+  return os.getpid(), stop - start, time.perf_counter() - began
+
+
+@dataclass
+class WorkerTiming:
+  pid: int
+  chunks: int = 0
+  samples: int = 0
+  seconds: float = 0.0
+
+  @property
+  def samples_per_second(self) -> float:
+    return self.samples / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class FeaturizationResult:
+  features: np.ndarray
+  columns: tuple[str, ...]
+  workers: list[WorkerTiming]
+  wall_seconds: float
+
+  def report(self) -> str:
+    lines = [
+        f"{len(self.features)} samples x {len(self.columns)} features "
+        f"in {self.wall_seconds:.3f} s on {len(self.workers)} worker(s)"
+    ]
+    for timing in sorted(self.workers, key=lambda t: t.pid):
+      lines.append(
+          f"  pid {timing.pid}: {timing.chunks} chunks, {timing.samples} samples, "
+          f"{timing.seconds:.3f} s busy ({timing.samples_per_second:,.0f} samples/s)"
+      )
+    return "\n".join(lines)
+
+
+class SharedMemoryFeaturizer:
+  """Featurize a cube on a process pool without pickling array data.
+
+  ``workers=0`` uses one process per CPU; ``workers=1`` runs in-process, which
+  is handy for profiling and gives identical output.
+  """
+
+  def __init__(
+      self,
+      workers: int = 0,
+      chunk_samples: int = DEFAULT_CHUNK_SAMPLES,
+      layout: BandLayout = BandLayout(),
+      names: tuple[str, ...] | None = None
+  ):
+    self.workers = max(1, workers or os.cpu_count() or 1)
+    self.chunk_samples = chunk_samples
+    self.layout = layout
+    self.names = names or tuple(VEGETATION_INDICES)
+    self.columns = feature_columns(self.names)
+
+  def run(
+      self, cubes: np.ndarray, out: str | Path | None = None
+  ) -> FeaturizationResult:
+    """Featurize every sample of ``cubes``; ``out`` is an optional ``.npy`` path.
+
+    Without ``out`` the rows are gathered in shared memory and copied into a
+    regular array once all workers are done.
+    """
+    if cubes.ndim != 3:
+      raise ValueError(f"Expected a (samples, timesteps, bands) cube, got {cubes.shape}")
+    shape = (cubes.shape[0], len(self.columns))
+    ranges = [
+        (start, min(start + self.chunk_samples, shape[0]))
+        for start in range(0, shape[0], self.chunk_samples)
+    ]
+    began = time.perf_counter()
+
+    if self.workers == 1:
+      features = (
+          np.empty(shape, dtype=np.float32) if out is None else
+          np.lib.format.open_memmap(out, mode="w+", dtype=np.float32, shape=shape)
+      )
+      timing = WorkerTiming(os.getpid())
+      for start, stop in ranges:
+        step = time.perf_counter()
+        features[start:stop] = featurize_block(
+            np.asarray(cubes[start:stop]), self.layout, self.names
+        )
+        timing.chunks += 1
+        timing.samples += stop - start
+        timing.seconds += time.perf_counter() - step
+      return FeaturizationResult(
+          features, self.columns, [timing], time.perf_counter() - began
+      )
+
+    owned: list[shared_memory.SharedMemory] = []
+    try:
+      source = memmap_source(cubes)
+      if source is None:
+        block, source = _share(np.ascontiguousarray(cubes))
+        owned.append(block)
+      if out is None:
+        output_block = shared_memory.SharedMemory(
+            create=True, size=max(shape[0] * shape[1] * 4, 1)
+        )
+        owned.append(output_block)
+        output = _SharedArray(output_block.name, np.dtype(np.float32).str, shape)
+      else:
+        features = np.lib.format.open_memmap(
+            out, mode="w+", dtype=np.float32, shape=shape
+        )
+        features.flush()
+        output = memmap_source(features)
+
+      timings: dict[int, WorkerTiming] = {}
+      with ProcessPoolExecutor(
+          max_workers=self.workers,
+          initializer=_init_worker,
+          initargs=(source, output, self.layout, self.names)
+      ) as pool:
+        futures = [pool.submit(_featurize_range, start, stop) for start, stop in ranges]
+        for future in futures:
+          pid, samples, seconds = future.result()
+          timing = timings.setdefault(pid, WorkerTiming(pid))
+          timing.chunks += 1
+          timing.samples += samples
+          timing.seconds += seconds
+
+      if out is None:
+        features = np.array(
+            np.ndarray(shape, dtype=np.float32, buffer=output_block.buf)
+        )
+      else:
+        features = np.load(out, mmap_mode="r")
+      return FeaturizationResult(
+          features, self.columns, list(timings.values()), time.perf_counter() - began
+      )
+    finally:
+      for block in owned:
+        block.close()
+        block.unlink()
@@ -1,12 +1,38 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
-from math import cos, sin
-from typing import Iterable
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence
 
 import numpy as np
 
+from .location_features import (
+    LocationFeatureStore,
+    format_outlook,
+    microclimate_terms,
+    outlook_draws,
+    outlook_seed,
+)
+
+RISK_MESSAGES = (
+    "Low rainfall detected; plan supplemental irrigation.",
+    "Rainfall outside optimal window; monitor moisture levels.",
+    "Nutrient application below target; review fertiliser plan.",
+    "Sandy soil under rainfed conditions increases drought risk.",
+)
+HISTORY_SEASONS = ("Kharif 22", "Rabi 22", "Kharif 23", "Rabi 23", "Current")
+BATCH_COLUMNS = (
+    "latitude",
+    "longitude",
+    "crop_type",
+    "soil_type",
+    "irrigation_type",
+    "rainfall",
+    "fertilizer_usage",
+    "sowing_date",
+)
+
 
 @dataclass
 class FarmerContext:
@@ -34,6 +60,123 @@ class YieldEstimate:
   weather: dict[str, str]
 
 
+@dataclass(frozen=True)
+class CoefficientTables:
+  """Immutable, index-addressed copy of the model's coefficient dicts.
+
+  Categories are resolved to integer codes once; every table is then a tuple
+  (scalar path) or read-only array (batch path) addressed by that code.
+  """
+
+  crops: tuple[str, ...]
+  soils: tuple[str, ...]
+  irrigations: tuple[str, ...]
+  crop_index: Mapping[str, int]
+  soil_index: Mapping[str, int]
+  irrigation_index: Mapping[str, int]
+  crop_base: tuple[float, ...]
+  soil_multiplier: tuple[float, ...]
+  irrigation_multiplier: tuple[float, ...]
+  rainfall_optimum: tuple[tuple[float, float], ...]
+  fertilizer_optimum: tuple[tuple[float, float], ...]
+  arrays: Mapping[str, np.ndarray]
+
+  @classmethod
+  def compile(cls, model: type[HeuristicYieldModel]) -> CoefficientTables:
+    crops = tuple(model.crop_base)
+    soils = tuple(model.soil_multiplier)
+    irrigations = tuple(model.irrigation_multiplier)
+    crop_base = tuple(model.crop_base[crop] for crop in crops)
+    soil_multiplier = tuple(model.soil_multiplier[soil] for soil in soils)
+    irrigation_multiplier = tuple(
+        model.irrigation_multiplier[irrigation] for irrigation in irrigations
+    )
+    rainfall_optimum = tuple(tuple(model.rainfall_optimum[crop]) for crop in crops)
+    fertilizer_optimum = tuple(
+        tuple(model.fertilizer_optimum[crop]) for crop in crops
+    )
+    arrays = {
+        "crop_base": crop_base,
+        "soil": soil_multiplier,
+        "irrigation": irrigation_multiplier,
+        "rainfall_lower": [lower for lower, _ in rainfall_optimum],
+        "rainfall_upper": [upper for _, upper in rainfall_optimum],
+        "fertilizer_lower": [lower for lower, _ in fertilizer_optimum],
+        "fertilizer_upper": [upper for _, upper in fertilizer_optimum],
+    }
+    frozen = {}
+    for name, values in arrays.items():
+      array = np.array(values, dtype=np.float64)
+      array.setflags(write=False)
+      frozen[name] = array
+    return cls(
+        crops=crops,
+        soils=soils,
+        irrigations=irrigations,
+        crop_index=MappingProxyType({name: i for i, name in enumerate(crops)}),
+        soil_index=MappingProxyType({name: i for i, name in enumerate(soils)}),
+        irrigation_index=MappingProxyType(
+            {name: i for i, name in enumerate(irrigations)}
+        ),
+        crop_base=crop_base,
+        soil_multiplier=soil_multiplier,
+        irrigation_multiplier=irrigation_multiplier,
+        rainfall_optimum=rainfall_optimum,
+        fertilizer_optimum=fertilizer_optimum,
+        arrays=MappingProxyType(frozen)
+    )
+
+
+@dataclass
+class YieldBatch:
+  """Columnar yield estimates produced by `HeuristicYieldModel.predict_batch`.
+
+  Numeric outputs stay as arrays; `estimate(i)` and `estimates()` materialise
+  row-level `YieldEstimate` objects identical to the scalar `predict` path.
+  """
+
+  value: np.ndarray
+  baseline: np.ndarray
+  confidence: np.ndarray
+  history: np.ndarray
+  risk_mask: np.ndarray
+  weather_seed: np.ndarray
+  irrigation_type: np.ndarray
+  soil_type: np.ndarray
+  outlook: Callable[[int], dict[str, str]] = field(repr=False)
+  _outlooks: dict[int, dict[str, str]] = field(default_factory=dict, repr=False)
+
+  def __len__(self) -> int:
+    return len(self.value)
+
+  def estimate(self, index: int) -> YieldEstimate:
+    risks = [
+        message
+        for message, flagged in zip(RISK_MESSAGES, self.risk_mask[index])
+        if flagged
+    ]
+    seed = int(self.weather_seed[index])
+    weather = self._outlooks.get(seed)
+    if weather is None:
+      weather = self._outlooks[seed] = self.outlook(seed)
+    return YieldEstimate(
+        value=float(self.value[index]),
+        unit="tons_per_hectare",
+        confidence=float(self.confidence[index]),
+        baseline=float(self.baseline[index]),
+        history=list(zip(HISTORY_SEASONS, self.history[index].tolist())),
+        risks=risks,
+        practices=HeuristicYieldModel._practices_for(
+            str(self.irrigation_type[index]), str(self.soil_type[index]), risks
+        ),
+        weather=dict(weather)
+    )
+
+  def estimates(self) -> Iterator[YieldEstimate]:
+    for index in range(len(self)):
+      yield self.estimate(index)
+
+
 class HeuristicYieldModel:
   """Reusable agronomic heuristic shared between API and offline tasks."""
 
@@ -76,20 +219,28 @@ class HeuristicYieldModel:
       "sugarcane": (220, 320)
   }
 
+  def __init__(self, features: LocationFeatureStore | None = None) -> None:
+    self.tables = CoefficientTables.compile(type(self))
+    self.features = features
+
   def predict(self, farmer: FarmerContext) -> YieldEstimate:
-    crop_base = self.crop_base[farmer.crop_type]
-    soil_factor = self.soil_multiplier[farmer.soil_type]
-    irrigation_factor = self.irrigation_multiplier[farmer.irrigation_type]
+    tables = self.tables
+    crop = tables.crop_index[farmer.crop_type]
+    crop_base = tables.crop_base[crop]
+    soil_factor = tables.soil_multiplier[tables.soil_index[farmer.soil_type]]
+    irrigation_factor = tables.irrigation_multiplier[
+        tables.irrigation_index[farmer.irrigation_type]
+    ]
     rainfall_factor = self._range_factor(
-        farmer.rainfall, self.rainfall_optimum[farmer.crop_type]
+        farmer.rainfall, tables.rainfall_optimum[crop]
     )
     fertilizer_factor = self._range_factor(
-        farmer.fertilizer_usage, self.fertilizer_optimum[farmer.crop_type]
+        farmer.fertilizer_usage, tables.fertilizer_optimum[crop]
     )
     phenology_factor = self._phenology_factor(farmer.sowing_date)
-    microclimate_factor = self._microclimate_factor(
+    microclimate_factor = float(self._location_microclimate(
         farmer.latitude, farmer.longitude
-    )
+    ))
 
     predicted = (
         crop_base
@@ -107,7 +258,9 @@ class HeuristicYieldModel:
     history = self._history(baseline, predicted)
     risks = self._risks(farmer, rainfall_factor, fertilizer_factor)
     practices = self._practices(farmer, risks)
-    weather = self._weather(farmer)
+    weather = self._location_outlook(
+        int(outlook_seed(farmer.latitude, farmer.longitude))
+    )
     confidence = self._confidence(risks)
 
     return YieldEstimate(
@@ -121,6 +274,154 @@ class HeuristicYieldModel:
         weather=weather
     )
 
+  def predict_batch(
+      self,
+      columns: Mapping[str, Sequence[Any] | np.ndarray] | Any,
+      today: date | None = None
+  ) -> YieldBatch:
+    """
+    Score many fields at once from columnar inputs.
+
+    `columns` is a mapping of column name to array-like, or a pyarrow table,
+    holding the `BATCH_COLUMNS` fields. Categorical columns are encoded into
+    integer codes against precomputed coefficient arrays and every factor is
+    evaluated as a NumPy expression over the whole batch, using the same
+    arithmetic order as `predict` so rounded outputs match it exactly.
+    """
+    tables = self.tables
+    data = self._batch_columns(columns)
+    crop_codes = self._encode("crop_type", data["crop_type"], tables.crop_index)
+    soil_codes = self._encode("soil_type", data["soil_type"], tables.soil_index)
+    irrigation_codes = self._encode(
+        "irrigation_type", data["irrigation_type"], tables.irrigation_index
+    )
+    latitude = np.asarray(data["latitude"], dtype=np.float64)
+    longitude = np.asarray(data["longitude"], dtype=np.float64)
+    rainfall = np.asarray(data["rainfall"], dtype=np.float64)
+    fertilizer = np.asarray(data["fertilizer_usage"], dtype=np.float64)
+    sowing = np.asarray(data["sowing_date"], dtype="datetime64[D]")
+
+    coefficients = tables.arrays
+    crop_base = coefficients["crop_base"][crop_codes]
+    soil_factor = coefficients["soil"][soil_codes]
+    irrigation_factor = coefficients["irrigation"][irrigation_codes]
+    rainfall_factor = self._range_factor_array(
+        rainfall,
+        coefficients["rainfall_lower"][crop_codes],
+        coefficients["rainfall_upper"][crop_codes]
+    )
+    fertilizer_factor = self._range_factor_array(
+        fertilizer,
+        coefficients["fertilizer_lower"][crop_codes],
+        coefficients["fertilizer_upper"][crop_codes]
+    )
+    phenology_factor = self._phenology_factor_array(sowing, today)
+    microclimate_factor = self._location_microclimate(latitude, longitude)
+
+    predicted = (
+        crop_base
+        * soil_factor
+        * irrigation_factor
+        * rainfall_factor
+        * fertilizer_factor
+        * phenology_factor
+        * microclimate_factor
+    )
+    predicted = np.where(
+        crop_codes == tables.crop_index["sugarcane"], predicted / 10, predicted
+    )
+    baseline = crop_base * soil_factor * 0.95
+
+    start = baseline * 0.95
+    step = (predicted - start) / (len(HISTORY_SEASONS) - 1)
+    history = np.arange(len(HISTORY_SEASONS))[None, :] * step[:, None] + start[:, None]
+    history[:, -1] = predicted
+
+    rainfed = irrigation_codes == tables.irrigation_index["rainfed"]
+    sandy = soil_codes == tables.soil_index["sandy"]
+    risk_mask = np.column_stack((
+        rainfall < 50,
+        rainfall_factor < 0.75,
+        fertilizer_factor < 0.75,
+        rainfed & sandy,
+    ))
+    confidence = np.maximum(0.55, 0.85 - risk_mask.sum(axis=1) * 0.08)
+    weather_seed = outlook_seed(latitude, longitude)
+
+    return YieldBatch(
+        value=self._round(predicted),
+        baseline=self._round(baseline),
+        confidence=confidence,
+        history=np.round(history, 2),
+        risk_mask=risk_mask,
+        weather_seed=weather_seed,
+        irrigation_type=np.asarray(tables.irrigations)[irrigation_codes],
+        soil_type=np.asarray(tables.soils)[soil_codes],
+        outlook=self._location_outlook
+    )
+
+  def _location_microclimate(self, latitude, longitude):
+    if self.features is not None and self.features.available:
+      return self.features.microclimate(latitude, longitude)
+    return self._microclimate_factor(latitude, longitude)
+
+  def _location_outlook(self, seed: int) -> dict[str, str]:
+    if self.features is not None and self.features.available:
+      return self.features.outlook(seed)
+    return self._outlook(seed)
+
+  @staticmethod
+  def _batch_columns(columns: Any) -> dict[str, np.ndarray]:
+    if hasattr(columns, "column_names"):
+      columns = {
+          name: columns.column(name).to_numpy()
+          for name in BATCH_COLUMNS
+          if name in columns.column_names
+      }
+    missing = [name for name in BATCH_COLUMNS if name not in columns]
+    if missing:
+      raise ValueError(f"Batch is missing columns: {', '.join(missing)}")
+    data = {name: np.asarray(columns[name]) for name in BATCH_COLUMNS}
+    lengths = {len(values) for values in data.values()}
+    if len(lengths) > 1:
+      raise ValueError("Batch columns must all have the same length")
+    return data
+
+  @staticmethod
+  def _encode(
+      column: str, values: np.ndarray, index: Mapping[str, int]
+  ) -> np.ndarray:
+    uniques, inverse = np.unique(values, return_inverse=True)
+    unknown = [str(value) for value in uniques if value not in index]
+    if unknown:
+      raise ValueError(f"Unknown {column}: {', '.join(unknown)}")
+    lookup = np.array([index[value] for value in uniques], dtype=np.intp)
+    return lookup[inverse.reshape(-1)]
+
+  @staticmethod
+  def _round(values: np.ndarray) -> np.ndarray:
+    # np.round scales by 100 and can land on the other side of a tie from the
+    # builtin round used for float values in `predict`.
+    flat = [round(value, 2) for value in values.ravel().tolist()]
+    return np.array(flat, dtype=np.float64).reshape(values.shape)
+
+  @staticmethod
+  def _range_factor_array(
+      values: np.ndarray, lower: np.ndarray, upper: np.ndarray
+  ) -> np.ndarray:
+    distance = np.minimum(np.abs(values - lower), np.abs(values - upper))
+    decay = np.maximum(0.6, 1 - (distance / (upper - lower + 1)) * 0.5)
+    return np.where((lower <= values) & (values <= upper), 1.05, decay)
+
+  @staticmethod
+  def _phenology_factor_array(
+      sowing_dates: np.ndarray, today: date | None = None
+  ) -> np.ndarray:
+    today_d = np.datetime64(today or date.today(), "D")
+    delta = (today_d - sowing_dates).astype(np.int64)
+    growth_stage = np.minimum(delta / 120, 1)
+    return np.where(delta < 0, 0.8, 0.85 + growth_stage * 0.2)
+
   @staticmethod
   def _range_factor(value: float, optimum: tuple[float, float]) -> float:
     lower, upper = optimum
@@ -140,36 +441,42 @@ class HeuristicYieldModel:
     return 0.85 + growth_stage * 0.2
 
   @staticmethod
-  def _microclimate_factor(latitude: float, longitude: float) -> float:
-    lat_rad = np.deg2rad(latitude)
-    lon_rad = np.deg2rad(longitude)
-    seasonal_wave = 0.05 * sin(lat_rad * 2) + 0.03 * cos(lon_rad)
-    return 1 + seasonal_wave
+  def _microclimate_factor(latitude, longitude):
+    # Works on scalars and arrays alike so the batch path shares the same ufuncs.
+    lat_term, lon_term = microclimate_terms(latitude, longitude)
+    return 1 + (lat_term + lon_term)
 
   @staticmethod
   def _history(baseline: float, predicted: float) -> list[tuple[str, float]]:
-    seasons = ["Kharif 22", "Rabi 22", "Kharif 23", "Rabi 23", "Current"]
-    progression = np.linspace(baseline * 0.95, predicted, num=len(seasons))
-    return [(season, round(value, 2)) for season, value in zip(seasons, progression)]
+    progression = np.linspace(baseline * 0.95, predicted, num=len(HISTORY_SEASONS))
+    return [
+        (season, round(value, 2))
+        for season, value in zip(HISTORY_SEASONS, progression)
+    ]
 
   @staticmethod
   def _risks(
       farmer: FarmerContext, rainfall_factor: float, fertilizer_factor: float
   ) -> list[str]:
-    risks: list[str] = []
-    if farmer.rainfall < 50:
-      risks.append("Low rainfall detected; plan supplemental irrigation.")
-    if rainfall_factor < 0.75:
-      risks.append("Rainfall outside optimal window; monitor moisture levels.")
-    if fertilizer_factor < 0.75:
-      risks.append("Nutrient application below target; review fertiliser plan.")
-    if farmer.irrigation_type == "rainfed" and farmer.soil_type == "sandy":
-      risks.append("Sandy soil under rainfed conditions increases drought risk.")
-    return risks
+    flags = (
+        farmer.rainfall < 50,
+        rainfall_factor < 0.75,
+        fertilizer_factor < 0.75,
+        farmer.irrigation_type == "rainfed" and farmer.soil_type == "sandy",
+    )
+    return [message for message, flagged in zip(RISK_MESSAGES, flags) if flagged]
 
   @staticmethod
   def _practices(
       farmer: FarmerContext, risks: Iterable[str]
+  ) -> list[str]:
+    return HeuristicYieldModel._practices_for(
+        farmer.irrigation_type, farmer.soil_type, risks
+    )
+
+  @staticmethod
+  def _practices_for(
+      irrigation_type: str, soil_type: str, risks: Iterable[str]
   ) -> list[str]:
     practices = [
         "Incorporate organic matter to improve soil structure.",
@@ -177,28 +484,17 @@ class HeuristicYieldModel:
     ]
     if any("rainfall" in risk.lower() for risk in risks):
       practices.append("Adopt mulching to conserve soil moisture.")
-    if farmer.irrigation_type in {"drip", "sprinkler"}:
+    if irrigation_type in {"drip", "sprinkler"}:
       practices.append("Calibrate irrigation equipment for uniform coverage.")
     else:
       practices.append("Explore micro-irrigation subsidy programmes in your area.")
-    if farmer.soil_type in {"red", "laterite"}:
+    if soil_type in {"red", "laterite"}:
       practices.append("Plan lime application to balance soil pH.")
     return practices[:4]
 
   @staticmethod
-  def _weather(farmer: FarmerContext) -> dict[str, str]:
-    seed = int((farmer.latitude + 90) * 1000 + (farmer.longitude + 180) * 1000)
-    rng = np.random.default_rng(seed)
-    rainfall_delta = rng.uniform(-20, 30)
-    temp_trend = rng.uniform(-1.5, 2.5)
-    conditions = ["stable", "favourable", "cautious"]
-    summary = conditions[int(rng.choice(len(conditions)))]
-
-    return {
-        "summary": summary.capitalize(),
-        "rainfallOutlook": f"{'+' if rainfall_delta >= 0 else ''}{rainfall_delta:.0f}% vs normal",
-        "temperatureTrend": f"{temp_trend:+.1f}°C anomaly"
-    }
+  def _outlook(seed: int) -> dict[str, str]:
+    return format_outlook(*outlook_draws(seed))
 
   @staticmethod
   def _confidence(risks: Iterable[str]) -> float:
@@ -0,0 +1,155 @@
+"""Precomputed, memory-mapped per-location features for the heuristic model.
+
+Two kinds of key address the store, both as plain array indices:
+
+* grid cells: latitude and longitude are snapped to ``cell_degrees`` and each
+  axis has its own table, which suits separable features such as the
+  microclimate wave (``lat_term[i] + lon_term[j]``);
+* outlook seeds: the integer seed the weather outlook has always been derived
+  from, ``int((lat + 90) * 1000 + (lon + 180) * 1000)``, so the stored outlook
+  is exactly what the RNG would have produced.
+
+Build the store offline, then point ``Settings.model_data_path`` at its
+parent directory:
+
+    python -m services.model_inference build-features data/processed
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+
+STORE_DIRNAME = "location_features"
+STORE_VERSION = 1
+OUTLOOK_SEEDS = 180 * 1000 + 360 * 1000 + 1
+OUTLOOK_SUMMARIES = ("stable", "favourable", "cautious")
+OUTLOOK_DTYPE = np.dtype([
+    ("summary", np.uint8),
+    ("rainfall_delta", np.float64),
+    ("temp_trend", np.float64),
+])
+
+
+def outlook_seed(latitude, longitude):
+  """Outlook seed for scalar or array coordinates."""
+  seed = (np.asarray(latitude) + 90) * 1000 + (np.asarray(longitude) + 180) * 1000
+  return seed.astype(np.int64)
+
+
+def outlook_draws(seed: int) -> tuple[int, float, float]:
+  """Draw (summary code, rainfall delta, temperature trend) for one seed."""
+  rng = np.random.default_rng(seed)
+  rainfall_delta = rng.uniform(-20, 30)
+  temp_trend = rng.uniform(-1.5, 2.5)
+  summary = int(rng.choice(len(OUTLOOK_SUMMARIES)))
+  return summary, rainfall_delta, temp_trend
+
+
+def format_outlook(
+    summary: int, rainfall_delta: float, temp_trend: float
+) -> dict[str, str]:
+  return {
+      "summary": OUTLOOK_SUMMARIES[summary].capitalize(),
+      "rainfallOutlook": f"{'+' if rainfall_delta >= 0 else ''}{rainfall_delta:.0f}% vs normal",
+      "temperatureTrend": f"{temp_trend:+.1f}°C anomaly"
+  }
+
+
+def microclimate_terms(latitude, longitude):
+  """Separable latitude and longitude parts of the microclimate wave."""
+  lat_term = 0.05 * np.sin(np.deg2rad(latitude) * 2)
+  lon_term = 0.03 * np.cos(np.deg2rad(longitude))
+  return lat_term, lon_term
+
+
+class LocationFeatureStore:
+  """
+  Lazily opened, read-only view over a built location feature directory.
+
+  Nothing is read until the first lookup; arrays are then memory-mapped so
+  every worker process shares the same page cache. When the directory has not
+  been built, `available` is False and callers fall back to computing
+  features on the fly.
+  """
+
+  def __init__(self, data_path: str | Path):
+    self.path = Path(data_path) / STORE_DIRNAME
+    self._lock = Lock()
+    self._loaded = False
+    self._available = False
+    self.cell_degrees = 0.0
+    self._lat_term: np.ndarray | None = None
+    self._lon_term: np.ndarray | None = None
+    self._outlook: np.ndarray | None = None
+
+  @property
+  def available(self) -> bool:
+    self._load()
+    return self._available
+
+  def microclimate(self, latitude, longitude):
+    """Microclimate factor at the grid cell holding each coordinate."""
+    self._load()
+    lat_cell = np.rint((np.asarray(latitude) + 90) / self.cell_degrees).astype(np.intp)
+    lon_cell = np.rint((np.asarray(longitude) + 180) / self.cell_degrees).astype(np.intp)
+    return 1 + (self._lat_term[lat_cell] + self._lon_term[lon_cell])
+
+  def outlook(self, seed: int) -> dict[str, str]:
+    self._load()
+    row = self._outlook[seed]
+    return format_outlook(
+        int(row["summary"]), float(row["rainfall_delta"]), float(row["temp_trend"])
+    )
+
+  def _load(self) -> None:
+    if self._loaded:
+      return
+    with self._lock:
+      if self._loaded:
+        return
+      meta_path = self.path / "meta.json"
+      if meta_path.exists():
+        meta = json.loads(meta_path.read_text())
+        if meta.get("version") == STORE_VERSION:
+          self.cell_degrees = float(meta["cell_degrees"])
+          self._lat_term = np.load(self.path / "microclimate_lat.npy", mmap_mode="r")
+          self._lon_term = np.load(self.path / "microclimate_lon.npy", mmap_mode="r")
+          self._outlook = np.load(self.path / "outlook.npy", mmap_mode="r")
+          self._available = True
+      self._loaded = True
+
+  @classmethod
+  def build(
+      cls, data_path: str | Path, cell_degrees: float = 0.001
+  ) -> LocationFeatureStore:
+    """Compute every feature table and write it under `data_path`."""
+    path = Path(data_path) / STORE_DIRNAME
+    path.mkdir(parents=True, exist_ok=True)
+
+    lat_cells = int(round(180 / cell_degrees)) + 1
+    lon_cells = int(round(360 / cell_degrees)) + 1
+    lat_term, lon_term = microclimate_terms(
+        np.arange(lat_cells) * cell_degrees - 90,
+        np.arange(lon_cells) * cell_degrees - 180
+    )
+    np.save(path / "microclimate_lat.npy", lat_term)
+    np.save(path / "microclimate_lon.npy", lon_term)
+
+    outlook = np.lib.format.open_memmap(
+        path / "outlook.npy", mode="w+", dtype=OUTLOOK_DTYPE, shape=(OUTLOOK_SEEDS,)
+    )
+    for seed in range(OUTLOOK_SEEDS):
+      outlook[seed] = outlook_draws(seed)
+    outlook.flush()
+    del outlook
+
+    (path / "meta.json").write_text(json.dumps({
+        "version": STORE_VERSION,
+        "cell_degrees": cell_degrees,
+        "outlook_seeds": OUTLOOK_SEEDS,
+    }))
+    return cls(data_path)
+
@@ -0,0 +1,241 @@
+"""Memory-mapped access and vectorized features for remote-sensing cubes.
+
+A cube file is a ``(samples, timesteps, bands)`` ``.npy`` array with a parquet
+sidecar describing each sample (``location_id``, coordinates, planting date,
+management levels). Cubes are opened with ``np.load(mmap_mode="r")`` and the
+sidecar through a memory-mapped pyarrow reader, so opening a dataset reads
+neither file. Every feature is computed over blocks of samples so peak memory
+is bounded by ``block_samples`` rather than by the size of the cube.
+"""
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Mapping
+
+import numpy as np
+
+CUBE_FILENAME = "synthetic_remote_sensing_cubes.npy"
+METADATA_FILENAME = "synthetic_remote_sensing_metadata.parquet"
+DEFAULT_BLOCK_SAMPLES = 4096
+
+
+@dataclass(frozen=True)
+class BandLayout:
+  """Positions of the spectral bands on the cube's last axis.
+
+  The default follows the ten 10m/20m Sentinel-2 bands in wavelength order:
+  B2, B3, B4, B5, B6, B7, B8, B8A, B11, B12.
+  """
+
+  blue: int = 0
+  green: int = 1
+  red: int = 2
+  red_edge: int = 3
+  nir: int = 6
+  swir1: int = 8
+  swir2: int = 9
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+  with np.errstate(divide="ignore", invalid="ignore"):
+    result = numerator / denominator
+  return np.where(denominator == 0, np.nan, result).astype(np.float32)
+
+
+def _ndvi(bands: Mapping[str, np.ndarray]) -> np.ndarray:
+  return _ratio(bands["nir"] - bands["red"], bands["nir"] + bands["red"])
+
+
+def _evi(bands: Mapping[str, np.ndarray]) -> np.ndarray:
+  return _ratio(
+      2.5 * (bands["nir"] - bands["red"]),
+      bands["nir"] + 6 * bands["red"] - 7.5 * bands["blue"] + 1
+  )
+
+
+def _ndwi(bands: Mapping[str, np.ndarray]) -> np.ndarray:
+  return _ratio(bands["green"] - bands["nir"], bands["green"] + bands["nir"])
+
+
+def _ndmi(bands: Mapping[str, np.ndarray]) -> np.ndarray:
+  return _ratio(bands["nir"] - bands["swir1"], bands["nir"] + bands["swir1"])
+
+
+def _ndre(bands: Mapping[str, np.ndarray]) -> np.ndarray:
+  return _ratio(bands["nir"] - bands["red_edge"], bands["nir"] + bands["red_edge"])
+
+
+VEGETATION_INDICES: Mapping[str, Callable[[Mapping[str, np.ndarray]], np.ndarray]] = {
+    "ndvi": _ndvi,
+    "evi": _evi,
+    "ndwi": _ndwi,
+    "ndmi": _ndmi,
+    "ndre": _ndre,
+}
+
+
+def vegetation_indices(
+    block: np.ndarray,
+    layout: BandLayout = BandLayout(),
+    names: tuple[str, ...] | None = None
+) -> dict[str, np.ndarray]:
+  """Per-sample, per-timestep indices for a ``(samples, timesteps, bands)`` block."""
+  bands = {
+      name: block[..., index].astype(np.float32, copy=False)
+      for name, index in vars(layout).items()
+  }
+  return {
+      name: VEGETATION_INDICES[name](bands)
+      for name in (names or tuple(VEGETATION_INDICES))
+  }
+
+
+def temporal_statistics(series: np.ndarray) -> dict[str, np.ndarray]:
+  """Reduce ``(samples, timesteps, ...)`` over the time axis.
+
+  Returns mean, std, min, max, amplitude, the timestep of the peak and the
+  least-squares slope per timestep, each shaped ``(samples, ...)``.
+  """
+  values = series.astype(np.float64, copy=False)
+  steps = values.shape[1]
+  time = np.arange(steps, dtype=np.float64) - (steps - 1) / 2
+  time = time.reshape((1, steps) + (1,) * (values.ndim - 2))
+  with warnings.catch_warnings():
+    # All-NaN series (zero-reflectance pixels) reduce to NaN rather than warn.
+    warnings.simplefilter("ignore", RuntimeWarning)
+    mean = np.nanmean(values, axis=1)
+    std = np.nanstd(values, axis=1)
+    minimum = np.nanmin(values, axis=1)
+    maximum = np.nanmax(values, axis=1)
+  centred = np.nan_to_num(values - mean[:, None])
+  return {
+      "mean": mean,
+      "std": std,
+      "min": minimum,
+      "max": maximum,
+      "amplitude": maximum - minimum,
+      "peak_step": np.argmax(np.where(np.isnan(values), -np.inf, values), axis=1),
+      "slope": (centred * time).sum(axis=1) / (time ** 2).sum(),
+  }
+
+
+class RemoteSensingDataset:
+  """
+  A memory-mapped cube joined to its parquet metadata.
+
+  ``sample_index[i]`` is the cube row of metadata row ``i``: the metadata is
+  joined on ``location_id`` when that column exists, otherwise by position.
+  """
+
+  def __init__(self, cubes: np.ndarray, metadata, block_samples: int = DEFAULT_BLOCK_SAMPLES):
+    if cubes.ndim != 3:
+      raise ValueError(f"Expected a (samples, timesteps, bands) cube, got {cubes.shape}")
+    self.cubes = cubes
+    self.metadata = metadata
+    self.block_samples = block_samples
+    if "location_id" in metadata.column_names:
+      self.sample_index = metadata.column("location_id").to_numpy()
+    else:
+      self.sample_index = np.arange(metadata.num_rows)
+    if len(self.sample_index) and (
+        self.sample_index.min() < 0 or self.sample_index.max() >= cubes.shape[0]
+    ):
+      raise ValueError("Metadata references samples outside the cube")
+
+  @classmethod
+  def open(
+      cls,
+      data_path: str | Path,
+      cube_filename: str = CUBE_FILENAME,
+      metadata_filename: str = METADATA_FILENAME,
+      block_samples: int = DEFAULT_BLOCK_SAMPLES
+  ) -> RemoteSensingDataset:
+    import pyarrow.parquet as pq
+
+    path = Path(data_path)
+    cubes = np.load(path / cube_filename, mmap_mode="r")
+    metadata = pq.read_table(path / metadata_filename, memory_map=True)
+    return cls(cubes, metadata, block_samples=block_samples)
+
+  @property
+  def shape(self) -> tuple[int, int, int]:
+    return self.cubes.shape
+
+  def blocks(self) -> Iterator[tuple[slice, np.ndarray]]:
+    """Yield ``(metadata rows, cube block)`` pairs in metadata order.
+
+    Only one block of at most ``block_samples`` samples is resident at a time;
+    contiguous sample ranges are sliced straight from the memmap.
+    """
+    rows = len(self.sample_index)
+    for start in range(0, rows, self.block_samples):
+      stop = min(start + self.block_samples, rows)
+      index = self.sample_index[start:stop]
+      first = int(index[0])
+      if np.array_equal(index, np.arange(first, first + len(index))):
+        block = self.cubes[first:first + len(index)]
+      else:
+        # Gather in ascending order so reads stay sequential, then restore order.
+        block = self.cubes[np.sort(index)][np.argsort(np.argsort(index))]
+      yield slice(start, stop), np.asarray(block)
+
+  def vegetation_indices(
+      self,
+      layout: BandLayout = BandLayout(),
+      names: tuple[str, ...] | None = None,
+      out_dir: str | Path | None = None
+  ) -> dict[str, np.ndarray]:
+    """``(samples, timesteps)`` float32 index series for every metadata row.
+
+    With ``out_dir`` each series is written to ``<out_dir>/<name>.npy`` through
+    a writable memmap, so the result does not have to fit in memory either.
+    """
+    names = names or tuple(VEGETATION_INDICES)
+    shape = (len(self.sample_index), self.cubes.shape[1])
+    outputs: dict[str, np.ndarray] = {}
+    for name in names:
+      if out_dir is None:
+        outputs[name] = np.empty(shape, dtype=np.float32)
+      else:
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+        outputs[name] = np.lib.format.open_memmap(
+            Path(out_dir) / f"{name}.npy", mode="w+", dtype=np.float32, shape=shape
+        )
+    for rows, block in self.blocks():
+      for name, values in vegetation_indices(block, layout, names).items():
+        outputs[name][rows] = values
+    return outputs
+
+  def feature_table(
+      self,
+      layout: BandLayout = BandLayout(),
+      names: tuple[str, ...] | None = None,
+      band_statistics: bool = True
+  ):
+    """
+    Metadata table extended with temporal statistics per sample.
+
+    Adds ``<index>_<stat>`` columns for each vegetation index and, with
+    ``band_statistics``, ``band<k>_<stat>`` columns for each raw band. The
+    original metadata columns are reused without copying.
+    """
+    import pyarrow as pa
+
+    names = names or tuple(VEGETATION_INDICES)
+    columns: dict[str, list[np.ndarray]] = {}
+    for _, block in self.blocks():
+      series = vegetation_indices(block, layout, names)
+      for name in names:
+        for stat, values in temporal_statistics(series[name]).items():
+          columns.setdefault(f"{name}_{stat}", []).append(values)
+      if band_statistics:
+        for stat, values in temporal_statistics(block).items():
+          for band in range(values.shape[1]):
+            columns.setdefault(f"band{band}_{stat}", []).append(values[:, band])
+
+    table = self.metadata
+    for column, parts in columns.items():
+      table = table.append_column(column, pa.array(np.concatenate(parts)))
+    return table
@@ -0,0 +1,206 @@
+"""Grid-bucket spatial index for nearest remote-sensing sample lookup.
+
+Points are bucketed into ``cell_degrees`` latitude/longitude cells and stored
+sorted by cell with a CSR-style offsets array, so a query only touches the
+cells its search circle overlaps. Everything lives in a handful of flat NumPy
+arrays that are saved to and loaded from a single ``.npz`` file.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180
+INDEX_FILENAME = "spatial_index.npz"
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+  """Great-circle distance in kilometres; broadcasts over arrays."""
+  lat1, lon1, lat2, lon2 = map(np.deg2rad, (lat1, lon1, lat2, lon2))
+  a = (
+      np.sin((lat2 - lat1) / 2) ** 2
+      + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+  )
+  return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class SpatialIndex:
+  """
+  k-nearest and radius queries over fixed point coordinates.
+
+  ``ids`` are returned from queries in place of positions, so an index built
+  from the remote-sensing metadata answers with ``location_id`` values.
+  """
+
+  def __init__(
+      self,
+      latitude: np.ndarray,
+      longitude: np.ndarray,
+      ids: np.ndarray,
+      offsets: np.ndarray,
+      cell_degrees: float
+  ):
+    self.latitude = latitude
+    self.longitude = longitude
+    self.ids = ids
+    self.offsets = offsets
+    self.cell_degrees = cell_degrees
+    self.rows = int(np.ceil(180 / cell_degrees))
+    self.cols = int(np.ceil(360 / cell_degrees))
+
+  def __len__(self) -> int:
+    return len(self.ids)
+
+  @classmethod
+  def build(
+      cls,
+      latitude,
+      longitude,
+      ids=None,
+      cell_degrees: float = 0.5
+  ) -> SpatialIndex:
+    latitude = np.asarray(latitude, dtype=np.float64)
+    longitude = np.asarray(longitude, dtype=np.float64)
+    ids = np.arange(len(latitude)) if ids is None else np.asarray(ids)
+    index = cls(latitude, longitude, ids, np.zeros(1, dtype=np.int64), cell_degrees)
+    cells = index._cell(latitude, longitude)
+    order = np.argsort(cells, kind="stable")
+    counts = np.bincount(cells, minlength=index.rows * index.cols)
+    index.latitude = latitude[order]
+    index.longitude = longitude[order]
+    index.ids = ids[order]
+    index.offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    return index
+
+  @classmethod
+  def from_metadata(cls, metadata, cell_degrees: float = 0.5) -> SpatialIndex:
+    """Index a pyarrow metadata table on its latitude/longitude columns."""
+    ids = (
+        metadata.column("location_id").to_numpy()
+        if "location_id" in metadata.column_names else None
+    )
+    return cls.build(
+        metadata.column("latitude").to_numpy(),
+        metadata.column("longitude").to_numpy(),
+        ids,
+        cell_degrees
+    )
+
+  def save(self, path: str | Path) -> None:
+    np.savez(
+        path,
+        latitude=self.latitude,
+        longitude=self.longitude,
+        ids=self.ids,
+        offsets=self.offsets,
+        cell_degrees=np.float64(self.cell_degrees)
+    )
+
+  @classmethod
+  def load(cls, path: str | Path) -> SpatialIndex:
+    with np.load(path) as data:
+      return cls(
+          data["latitude"],
+          data["longitude"],
+          data["ids"],
+          data["offsets"],
+          float(data["cell_degrees"])
+      )
+
+  @classmethod
+  def open_or_build(
+      cls, data_path: str | Path, metadata_filename: str, cell_degrees: float = 0.5
+  ) -> SpatialIndex:
+    """Load ``<data_path>/spatial_index.npz`` unless the metadata is newer."""
+    import pyarrow.parquet as pq
+
+    data_path = Path(data_path)
+    index_path = data_path / INDEX_FILENAME
+    metadata_path = data_path / metadata_filename
+    if (
+        index_path.exists()
+        and index_path.stat().st_mtime >= metadata_path.stat().st_mtime
+    ):
+      index = cls.load(index_path)
+      if index.cell_degrees == cell_degrees:
+        return index
+    metadata = pq.read_table(
+        metadata_path, columns=["location_id", "latitude", "longitude"],
+        memory_map=True
+    )
+    index = cls.from_metadata(metadata, cell_degrees)
+    index.save(index_path)
+    return index
+
+  def query_radius(
+      self, latitude: float, longitude: float, radius_km: float
+  ) -> tuple[np.ndarray, np.ndarray]:
+    """Ids and distances of every point within ``radius_km``, nearest first."""
+    candidates = self._candidates(latitude, longitude, radius_km)
+    distances = haversine_km(
+        latitude, longitude,
+        self.latitude[candidates], self.longitude[candidates]
+    )
+    inside = distances <= radius_km
+    candidates, distances = candidates[inside], distances[inside]
+    order = np.argsort(distances, kind="stable")
+    return self.ids[candidates[order]], distances[order]
+
+  def query(
+      self, latitude: float, longitude: float, k: int = 1
+  ) -> tuple[np.ndarray, np.ndarray]:
+    """Ids and distances of the ``k`` nearest points, nearest first."""
+    k = min(k, len(self))
+    if k <= 0:
+      return self.ids[:0], np.empty(0)
+    radius = self.cell_degrees * KM_PER_DEGREE
+    while True:
+      ids, distances = self.query_radius(latitude, longitude, radius)
+      # Every point within the radius is returned, so once k are found the
+      # k nearest overall are among them.
+      if len(ids) >= k or radius >= np.pi * EARTH_RADIUS_KM:
+        return ids[:k], distances[:k]
+      radius *= 2
+
+  def _cell(self, latitude, longitude) -> np.ndarray:
+    row = np.clip(
+        np.floor((latitude + 90) / self.cell_degrees).astype(np.int64),
+        0, self.rows - 1
+    )
+    col = np.floor((longitude + 180) / self.cell_degrees).astype(np.int64) % self.cols
+    return row * self.cols + col
+
+  def _candidates(
+      self, latitude: float, longitude: float, radius_km: float
+  ) -> np.ndarray:
+    radius_deg = radius_km / KM_PER_DEGREE
+    lat_low = max(-90.0, latitude - radius_deg)
+    lat_high = min(90.0, latitude + radius_deg)
+    rows = np.arange(
+        max(0, int(np.floor((lat_low + 90) / self.cell_degrees))),
+        min(self.rows - 1, int(np.floor((lat_high + 90) / self.cell_degrees))) + 1
+    )
+    # Widest longitude reach of a spherical cap that does not cover a pole.
+    reach = np.sin(np.deg2rad(min(radius_deg, 90.0))) / np.cos(np.deg2rad(latitude))
+    if max(abs(lat_low), abs(lat_high)) >= 90 or radius_deg >= 90 or reach >= 1:
+      cols = np.arange(self.cols)
+    else:
+      lon_span = np.rad2deg(np.arcsin(reach)) + 1e-9
+      first = int(np.floor((longitude - lon_span + 180) / self.cell_degrees))
+      last = int(np.floor((longitude + lon_span + 180) / self.cell_degrees))
+      if last - first + 1 >= self.cols:
+        cols = np.arange(self.cols)
+      else:
+        cols = np.arange(first, last + 1) % self.cols
+    cells = (rows[:, None] * self.cols + cols[None, :]).ravel()
+    starts = self.offsets[cells]
+    lengths = self.offsets[cells + 1] - starts
+    nonempty = lengths > 0
+    starts, lengths = starts[nonempty], lengths[nonempty]
+    if not len(starts):
+      return np.empty(0, dtype=np.int64)
+    # Concatenate the [start, start + length) ranges without a Python loop.
+    shifts = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return np.arange(lengths.sum()) + shifts
@@ -0,0 +1,3 @@
+from .stub import OpenMeteoStub, RecordingTransport, load_recordings, synthetic_forecast
+
+__all__ = ["OpenMeteoStub", "RecordingTransport", "load_recordings", "synthetic_forecast"]
@@ -0,0 +1,44 @@
+"""Serve the Open-Meteo stand-in over HTTP.
+
+    python -m services.weather_stub --port 8900 --latency 0.2 --error-rate 0.05
+"""
+from __future__ import annotations
+
+import argparse
+
+from .stub import OpenMeteoStub
+
+
+def main() -> None:
+  import uvicorn
+
+  parser = argparse.ArgumentParser(description="Serve a local Open-Meteo stand-in.")
+  parser.add_argument("--host", default="127.0.0.1")
+  parser.add_argument("--port", type=int, default=8900)
+  parser.add_argument("--latency", type=float, default=0.0, help="Seconds per response")
+  parser.add_argument("--jitter", type=float, default=0.0)
+  parser.add_argument("--error-rate", type=float, default=0.0)
+  parser.add_argument("--error-status", type=int, default=503)
+  parser.add_argument("--hang-rate", type=float, default=0.0)
+  parser.add_argument("--hang-seconds", type=float, default=30.0)
+  parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second")
+  parser.add_argument("--max-concurrency", type=int, default=None)
+  parser.add_argument("--recordings", default=None, help="JSONL of recorded responses")
+  args = parser.parse_args()
+
+  stub = OpenMeteoStub(
+      latency=args.latency,
+      jitter=args.jitter,
+      error_rate=args.error_rate,
+      error_status=args.error_status,
+      hang_rate=args.hang_rate,
+      hang_seconds=args.hang_seconds,
+      rate_limit=args.rate_limit,
+      max_concurrency=args.max_concurrency,
+      recordings=args.recordings
+  )
+  uvicorn.run(stub.asgi_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+  main()
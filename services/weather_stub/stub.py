@@ -0,0 +1,245 @@
+"""Local stand-in for the Open-Meteo forecast API, for load tests and CI.
+
+The stub answers ``/v1/forecast`` requests with ``daily`` payloads in the
+Open-Meteo shape. A payload comes from a recording when one exists for the
+requested grid cell, and is otherwise generated deterministically from the
+coordinates and date. Latency, jitter, error responses, hung requests, a
+request rate limit (answered with 429) and a concurrency cap are all
+configurable.
+
+Use it in-process as an httpx transport::
+
+    provider = WeatherProvider(transport=OpenMeteoStub(latency=0.2).transport())
+
+or as a server, pointing ``WEATHER_BASE_URL`` at it::
+
+    python -m services.weather_stub --port 8900 --latency 0.2
+    WEATHER_BASE_URL=http://127.0.0.1:8900 uvicorn services.api.app.main:app
+
+Record real responses for later replay by wrapping a transport in
+`RecordingTransport`; the stub reads the resulting JSONL file back with
+``recordings=``.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Mapping
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+DAILY_UNITS = {
+    "time": "iso8601",
+    "temperature_2m_max": "°C",
+    "temperature_2m_min": "°C",
+    "precipitation_sum": "mm",
+    "precipitation_probability_max": "%",
+    "windspeed_10m_max": "km/h",
+    "et0_fao_evapotranspiration": "mm",
+}
+
+
+def _cell(latitude: float, longitude: float) -> tuple[float, float]:
+  return round(latitude, 1), round(longitude, 1)
+
+
+def synthetic_forecast(
+    latitude: float, longitude: float, days: int = 16, start: date | None = None
+) -> dict:
+  """Deterministic daily forecast for a location, occasionally severe."""
+  start = start or date.today()
+  lat_cell, lon_cell = _cell(latitude, longitude)
+  seed = (
+      int((lat_cell + 90) * 10) * 10_000 + int((lon_cell + 180) * 10)
+  ) * 100_000 + start.toordinal()
+  rng = random.Random(seed)
+  base = 32 - abs(latitude) * 0.4
+  daily: dict[str, list] = {key: [] for key in DAILY_UNITS}
+  for offset in range(days):
+    high = base + rng.gauss(0, 3.5)
+    rainy = rng.random() < 0.3
+    low = high - rng.uniform(6, 12)
+    daily["time"].append((start + timedelta(days=offset)).isoformat())
+    daily["temperature_2m_max"].append(round(high, 1))
+    daily["temperature_2m_min"].append(round(low, 1))
+    daily["precipitation_sum"].append(round(rng.expovariate(1 / 18), 1) if rainy else 0.0)
+    daily["precipitation_probability_max"].append(
+        rng.randint(55, 100) if rainy else rng.randint(0, 30)
+    )
+    daily["windspeed_10m_max"].append(round(rng.uniform(5, 48), 1))
+    # Hargreaves with a mid-latitude extraterrestrial radiation of 15 mm/day.
+    et0 = 0.0023 * 15 * ((high + low) / 2 + 17.8) * (high - low) ** 0.5
+    daily["et0_fao_evapotranspiration"].append(round(et0 * (0.6 if rainy else 1.0), 1))
+  return {
+      "latitude": lat_cell,
+      "longitude": lon_cell,
+      "generationtime_ms": 0.1,
+      "utc_offset_seconds": 0,
+      "timezone": "GMT",
+      "timezone_abbreviation": "GMT",
+      "elevation": 0.0,
+      "daily_units": DAILY_UNITS,
+      "daily": daily,
+  }
+
+
+def load_recordings(path: str | Path) -> dict[tuple[float, float], dict]:
+  """Read recorded responses (one JSON object per line) keyed by 0.1° cell."""
+  recordings = {}
+  with open(path, encoding="utf-8") as handle:
+    for line in handle:
+      if line.strip():
+        payload = json.loads(line)
+        recordings[_cell(payload["latitude"], payload["longitude"])] = payload
+  return recordings
+
+
+class OpenMeteoStub:
+  """Configurable fake of the Open-Meteo ``/v1/forecast`` endpoint."""
+
+  def __init__(
+      self,
+      latency: float = 0.0,
+      jitter: float = 0.0,
+      error_rate: float = 0.0,
+      error_status: int = 503,
+      hang_rate: float = 0.0,
+      hang_seconds: float = 30.0,
+      rate_limit: float | None = None,
+      max_concurrency: int | None = None,
+      recordings: str | Path | Mapping[tuple[float, float], dict] | None = None,
+      seed: int = 0
+  ):
+    self.latency = latency
+    self.jitter = jitter
+    self.error_rate = error_rate
+    self.error_status = error_status
+    self.hang_rate = hang_rate
+    self.hang_seconds = hang_seconds
+    self.rate_limit = rate_limit
+    self.max_concurrency = max_concurrency
+    if isinstance(recordings, (str, Path)):
+      recordings = load_recordings(recordings)
+    self.recordings = dict(recordings or {})
+    self._random = random.Random(seed)
+    self._semaphore: asyncio.Semaphore | None = None
+    self._tokens = rate_limit or 0.0
+    self._refilled_at = time.monotonic()
+    self.requests = 0
+    self.errors = 0
+    self.hangs = 0
+    self.throttled = 0
+    self.active = 0
+    self.peak_active = 0
+
+  async def respond(self, params: Mapping[str, str]) -> tuple[int, dict]:
+    """Status code and JSON body for one forecast request."""
+    self.requests += 1
+    if not self._take_token():
+      self.throttled += 1
+      return 429, {"error": True, "reason": "Too many requests"}
+    if self.max_concurrency is not None:
+      if self._semaphore is None:
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+      async with self._semaphore:
+        return await self._serve(params)
+    return await self._serve(params)
+
+  async def _serve(self, params: Mapping[str, str]) -> tuple[int, dict]:
+    self.active += 1
+    self.peak_active = max(self.peak_active, self.active)
+    try:
+      delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+      roll = self._random.random()
+      if roll < self.hang_rate:
+        self.hangs += 1
+        await asyncio.sleep(self.hang_seconds)
+        return 504, {"error": True, "reason": "Gateway timeout"}
+      await asyncio.sleep(delay)
+      if roll < self.hang_rate + self.error_rate:
+        self.errors += 1
+        return self.error_status, {"error": True, "reason": "Injected failure"}
+      try:
+        latitude = float(params["latitude"])
+        longitude = float(params["longitude"])
+        days = int(params.get("forecast_days", 7))
+      except (KeyError, ValueError):
+        return 400, {"error": True, "reason": "Invalid latitude, longitude or forecast_days"}
+      payload = self.recordings.get(_cell(latitude, longitude))
+      return 200, payload or synthetic_forecast(latitude, longitude, days)
+    finally:
+      self.active -= 1
+
+  def _take_token(self) -> bool:
+    if self.rate_limit is None:
+      return True
+    now = time.monotonic()
+    self._tokens = min(
+        self.rate_limit, self._tokens + (now - self._refilled_at) * self.rate_limit
+    )
+    self._refilled_at = now
+    if self._tokens < 1:
+      return False
+    self._tokens -= 1
+    return True
+
+  async def handle(self, request: httpx.Request) -> httpx.Response:
+    status, body = await self.respond(dict(request.url.params))
+    return httpx.Response(status, json=body, request=request)
+
+  def transport(self) -> httpx.MockTransport:
+    """An in-process transport for ``httpx.AsyncClient``; the URL host is ignored."""
+    return httpx.MockTransport(self.handle)
+
+  def asgi_app(self) -> FastAPI:
+    app = FastAPI(title="Open-Meteo stand-in")
+
+    @app.get("/v1/forecast")
+    async def forecast(request: Request) -> JSONResponse:
+      status, body = await self.respond(dict(request.query_params))
+      return JSONResponse(body, status_code=status)
+
+    @app.get("/stats")
+    async def stats() -> dict[str, int]:
+      return self.stats()
+
+    return app
+
+  def stats(self) -> dict[str, int]:
+    return {
+        "requests": self.requests,
+        "errors": self.errors,
+        "hangs": self.hangs,
+        "throttled": self.throttled,
+        "active": self.active,
+        "peak_active": self.peak_active,
+    }
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+  """Wrap a transport and append every successful forecast body to a JSONL file."""
+
+  def __init__(self, path: str | Path, inner: httpx.AsyncBaseTransport | None = None):
+    self.path = Path(path)
+    self.inner = inner or httpx.AsyncHTTPTransport()
+
+  async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+    response = await self.inner.handle_async_request(request)
+    if response.status_code == 200:
+      body = await response.aread()
+      self.path.parent.mkdir(parents=True, exist_ok=True)
+      with open(self.path, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps(json.loads(body), separators=(",", ":")) + "\n")
+      response = httpx.Response(
+          response.status_code, headers=response.headers, content=body, request=request
+      )
+    return response
+
+  async def aclose(self) -> None:
+    await self.inner.aclose()